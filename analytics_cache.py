@@ -0,0 +1,103 @@
+import os
+import json
+import hashlib
+import logging
+import numpy as np
+import pandas as pd
+from file_metadata import file_metadata
+
+# Bump whenever get_analytics changes its output so old results are not reused
+ANALYTICS_VERSION = 1
+HASH_BLOCK_SIZE = 1024 * 1024
+
+class AnalyticsCache:
+    """On-disk JSON cache of get_analytics results keyed by dataset content.
+
+    Results are stored under the SHA-256 of the data file plus ANALYTICS_VERSION,
+    so they survive worker restarts and are shared by identical uploads.
+    """
+
+    def __init__(self, cache_dir=os.path.join('cache', 'analytics')):
+        self.logger = logging.getLogger(__name__)
+        self.cache_dir = cache_dir
+        self.hits = 0
+        self.misses = 0
+
+    def content_hash(self, filepath):
+        """SHA-256 of the file contents, remembered in the file's metadata"""
+        content_hash = file_metadata.load(filepath).get('content_hash')
+        if content_hash is not None:
+            return content_hash
+
+        digest = hashlib.sha256()
+        with open(filepath, 'rb') as f:
+            for block in iter(lambda: f.read(HASH_BLOCK_SIZE), b''):
+                digest.update(block)
+        content_hash = digest.hexdigest()
+        file_metadata.update(filepath, content_hash=content_hash)
+        return content_hash
+
+    def _result_path(self, filepath):
+        return os.path.join(self.cache_dir, f"{self.content_hash(filepath)}-v{ANALYTICS_VERSION}.json")
+
+    def get(self, filepath):
+        """Return the cached analytics for the current contents of filepath, or None"""
+        try:
+            with open(self._result_path(filepath), 'r', encoding='utf-8') as f:
+                analytics = json.load(f)
+            self.hits += 1
+            return analytics
+        except (OSError, ValueError):
+            self.misses += 1
+            return None
+
+    def put(self, filepath, analytics):
+        """Store analytics for the current contents of filepath"""
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            path = self._result_path(filepath)
+            tmp_path = path + '.tmp'
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(json_safe(analytics), f)
+            os.replace(tmp_path, path)
+        except Exception as e:
+            self.logger.warning(f"Could not cache analytics for {filepath}: {str(e)}")
+
+    def stats(self):
+        """Return hit/miss counters"""
+        lookups = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_ratio': round(self.hits / lookups, 4) if lookups else 0.0
+        }
+
+def json_safe(value):
+    """Convert numpy/pandas scalars and keys into plain JSON types"""
+    if isinstance(value, dict):
+        return {_json_key(key): json_safe(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [json_safe(item) for item in value]
+    if isinstance(value, (bool, np.bool_)):
+        return bool(value)
+    if isinstance(value, (int, np.integer)):
+        return int(value)
+    if isinstance(value, (float, np.floating)):
+        # NaN is kept (json writes it as NaN) so templates render it as before
+        return float(value)
+    if value is None or value is pd.NaT:
+        return None
+    if isinstance(value, str):
+        return value
+    return str(value)
+
+def _json_key(key):
+    if isinstance(key, (str, int, float, bool)) or key is None:
+        return key
+    if isinstance(key, np.integer):
+        return int(key)
+    if isinstance(key, np.floating):
+        return float(key)
+    return str(key)
+
+analytics_cache = AnalyticsCache()
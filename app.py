@@ -1,11 +1,18 @@
 import os
 import logging
 from flask import Flask
+from flask_sqlalchemy import SQLAlchemy
+from sqlalchemy.orm import DeclarativeBase
 from werkzeug.middleware.proxy_fix import ProxyFix
 
 # Set up logging
 logging.basicConfig(level=logging.DEBUG)
 
+class Base(DeclarativeBase):
+    pass
+
+db = SQLAlchemy(model_class=Base)
+
 # Create the app
 app = Flask(__name__)
 app.secret_key = os.environ.get("SESSION_SECRET") or "dev-secret-key-change-in-production"
@@ -16,9 +23,79 @@ app.config['MAX_CONTENT_LENGTH'] = 16 * 1024 * 1024  # 16MB max file size
 app.config['UPLOAD_FOLDER'] = 'uploads'
 app.config['EXPORT_FOLDER'] = 'exports'
 
+# Larger files go through the resumable upload API in chunks of UPLOAD_CHUNK_SIZE,
+# each its own request under MAX_CONTENT_LENGTH; parts are kept until finished
+app.config['MAX_UPLOAD_SIZE'] = int(os.environ.get('MAX_UPLOAD_SIZE', 1024 * 1024 * 1024))
+app.config['UPLOAD_CHUNK_SIZE'] = 8 * 1024 * 1024
+app.config['RESUMABLE_UPLOAD_FOLDER'] = os.path.join('cache', 'uploads')
+
+# Memory budget for the shared parsed-DataFrame cache
+app.config['DATAFRAME_CACHE_MAX_BYTES'] = int(os.environ.get('DATAFRAME_CACHE_MAX_BYTES', 256 * 1024 * 1024))
+
+# Most rows of one dataset held in memory for analysis; the full dataset stays on disk
+app.config['MAX_IN_MEMORY_ROWS'] = int(os.environ.get('MAX_IN_MEMORY_ROWS', 1000000))
+
+# On-disk cache of dashboard analytics results, keyed by dataset content
+app.config['ANALYTICS_CACHE_FOLDER'] = os.path.join('cache', 'analytics')
+
+# Fitted outlier models, reused while a dataset is unchanged
+app.config['MODEL_CACHE_FOLDER'] = os.path.join('cache', 'models')
+
+# Most points a line or scatter chart sends to the browser; larger data is downsampled
+app.config['CHART_POINT_BUDGET'] = int(os.environ.get('CHART_POINT_BUDGET', 2000))
+
+# Render the dashboard before its automatic charts, which the browser then fetches one by one
+app.config['LAZY_DASHBOARD_CHARTS'] = os.environ.get('LAZY_DASHBOARD_CHARTS', '1') != '0'
+
+# Memory budget for rendered chart payloads, reused while a dataset is unchanged
+app.config['CHART_CACHE_MAX_BYTES'] = int(os.environ.get('CHART_CACHE_MAX_BYTES', 64 * 1024 * 1024))
+
+# Smallest response body worth compressing
+app.config['COMPRESS_MIN_BYTES'] = 1024
+
+# Send CSV and NDJSON exports as they are produced instead of writing a file first
+app.config['STREAMING_EXPORTS'] = os.environ.get('STREAMING_EXPORTS', '1') != '0'
+
+# Default Parquet codec; /export/parquet?compression=<codec> picks another
+app.config['PARQUET_COMPRESSION'] = os.environ.get('PARQUET_COMPRESSION', 'snappy')
+
+# Background jobs: SQLite job table, worker processes, and how long a request
+# waits for its job before sending the browser to a progress page
+app.config['JOB_DATABASE'] = os.path.join('cache', 'jobs.sqlite3')
+app.config['JOB_WORKERS'] = int(os.environ.get('JOB_WORKERS', 2))
+app.config['JOB_INLINE_WAIT'] = float(os.environ.get('JOB_INLINE_WAIT', 2.0))
+
+# Seconds finished jobs stay in the job table
+app.config['JOB_RETENTION'] = int(os.environ.get('JOB_RETENTION', 24 * 3600))
+
+# Storage janitor: every STORAGE_JANITOR_INTERVAL seconds (0 disables it), files unused
+# for STORAGE_TTL are removed and the least recently used ones are evicted until uploads,
+# exports and on-disk caches fit in STORAGE_QUOTA_BYTES. Datasets a session used within
+# STORAGE_ACTIVE_WINDOW, the versions they came from, and files younger than
+# STORAGE_GRACE_PERIOD are kept; abandoned partial uploads expire after STORAGE_PARTIAL_UPLOAD_TTL
+app.config['STORAGE_QUOTA_BYTES'] = int(os.environ.get('STORAGE_QUOTA_BYTES', 5 * 1024 * 1024 * 1024))
+app.config['STORAGE_TTL'] = int(os.environ.get('STORAGE_TTL', 7 * 24 * 3600))
+app.config['STORAGE_ACTIVE_WINDOW'] = int(os.environ.get('STORAGE_ACTIVE_WINDOW', 24 * 3600))
+app.config['STORAGE_GRACE_PERIOD'] = 3600
+app.config['STORAGE_PARTIAL_UPLOAD_TTL'] = 24 * 3600
+app.config['STORAGE_JANITOR_INTERVAL'] = int(os.environ.get('STORAGE_JANITOR_INTERVAL', 600))
+
+# Dataset registry: one row per dataset version with its schema, size and lineage;
+# SQLite next to the job table unless DATABASE_URL points at another database
+app.config['SQLALCHEMY_DATABASE_URI'] = (os.environ.get('DATABASE_URL') or
+                                         'sqlite:///' + os.path.abspath(os.path.join('cache', 'registry.sqlite3')))
+app.config['SQLALCHEMY_ENGINE_OPTIONS'] = {'pool_recycle': 300, 'pool_pre_ping': True}
+
 # Ensure upload and export directories exist
 os.makedirs(app.config['UPLOAD_FOLDER'], exist_ok=True)
 os.makedirs(app.config['EXPORT_FOLDER'], exist_ok=True)
+os.makedirs('cache', exist_ok=True)
+
+db.init_app(app)
+
+with app.app_context():
+    import models
+    db.create_all()
 
 # Import routes after app creation to avoid circular imports
 from routes import *
@@ -0,0 +1,60 @@
+"""Compare raw CSV/Excel parsing against columnar (Feather) loads.
+
+Runs on the sample files in uploads/. Each file is copied to a temporary
+directory first so no columnar copies are left behind in uploads/.
+
+    python benchmarks/bench_columnar_load.py [--repeat N]
+"""
+import os
+import sys
+import glob
+import time
+import shutil
+import argparse
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from data_processor import DataProcessor
+from columnar_store import columnar_store
+
+def time_call(func, repeat):
+    """Return the best wall-clock time of repeat calls in milliseconds"""
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--repeat', type=int, default=20)
+    parser.add_argument('--uploads', default=os.path.join(os.path.dirname(__file__), '..', 'uploads'))
+    args = parser.parse_args()
+
+    if not columnar_store.is_available():
+        print('pyarrow is not installed; nothing to compare')
+        return
+
+    processor = DataProcessor()
+    samples = sorted(p for p in glob.glob(os.path.join(args.uploads, '*'))
+                     if p.endswith(('.csv', '.xlsx', '.xls')))
+
+    print(f"{'file':60} {'raw ms':>10} {'columnar ms':>12} {'speedup':>8}")
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        for sample in samples:
+            filepath = shutil.copy(sample, tmp_dir)
+            name = os.path.basename(sample)[-60:]
+
+            raw_ms = time_call(lambda: processor._parse_source(filepath), args.repeat)
+            processor.ingest(filepath)
+            if not columnar_store.has_fresh_copy(filepath):
+                print(f"{name:60} {raw_ms:10.2f} {'n/a':>12} {'-':>8}")
+                continue
+
+            columnar_ms = time_call(lambda: processor.load_data(filepath, use_cache=False), args.repeat)
+            print(f"{name:60} {raw_ms:10.2f} {columnar_ms:12.2f} {raw_ms / columnar_ms:7.1f}x")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,69 @@
+"""Compare the old stride/head() chart thinning against the downsampling module.
+
+Builds a random walk with a few isolated spikes (5M points by default), then
+reports how long each method takes and how much of the series' range and how
+many spikes survive. For scatter data it reports how much of the data's
+extent the plotted points cover.
+
+    python benchmarks/bench_downsampling.py [--rows N] [--budget N]
+"""
+import os
+import sys
+import time
+import argparse
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from downsampling import line_indices, grid_indices
+
+def timed(func):
+    """Return (result, wall-clock milliseconds) of one call"""
+    start = time.perf_counter()
+    result = func()
+    return result, (time.perf_counter() - start) * 1000
+
+def report_line(name, y, positions, spikes, elapsed):
+    kept = y[positions]
+    range_kept = (kept.max() - kept.min()) / (y.max() - y.min())
+    spikes_kept = np.isin(spikes, positions).sum()
+    print(f"{name:<8} {len(positions):>7} points {elapsed:>9.1f} ms  "
+          f"range kept {range_kept:6.1%}  spikes kept {spikes_kept}/{len(spikes)}")
+
+def report_scatter(name, x, y, positions, elapsed):
+    kept_x, kept_y = x[positions], y[positions]
+    coverage = ((kept_x.max() - kept_x.min()) * (kept_y.max() - kept_y.min())
+                / ((x.max() - x.min()) * (y.max() - y.min())))
+    print(f"{name:<8} {len(positions):>7} points {elapsed:>9.1f} ms  extent covered {coverage:6.1%}")
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--rows', type=int, default=5000000)
+    parser.add_argument('--budget', type=int, default=2000)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    x = np.arange(args.rows, dtype=float)
+    y = np.cumsum(rng.normal(size=args.rows))
+    spikes = rng.choice(args.rows, 5, replace=False)
+    y[spikes] += np.where(rng.random(5) < 0.5, -1, 1) * 50 * np.abs(y).max()
+
+    print(f"line chart, {args.rows} rows")
+    step = max(1, args.rows // args.budget)
+    positions, elapsed = timed(lambda: np.arange(0, args.rows, step))
+    report_line('stride', y, positions, spikes, elapsed)
+    positions, elapsed = timed(lambda: line_indices(x, y, args.budget))
+    report_line('lttb', y, positions, spikes, elapsed)
+
+    print(f"\nscatter chart, {args.rows} rows")
+    # Sorted by x like many exported files, so the top of the file is one corner of the data
+    sx = np.sort(rng.normal(size=args.rows))
+    sy = sx + rng.normal(size=args.rows)
+    positions, elapsed = timed(lambda: np.arange(min(args.budget, args.rows)))
+    report_scatter('head', sx, sy, positions, elapsed)
+    (positions, _), elapsed = timed(lambda: grid_indices(sx, sy, args.budget))
+    report_scatter('grid', sx, sy, positions, elapsed)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,100 @@
+"""Time dataset exports per format, old and new writers side by side.
+
+Builds a mixed-type frame (100k rows x 12 columns by default) and reports
+wall time and output size for each writer, including the write-only XLSX
+path against pandas' to_excel and a repeat export served from the artifact
+cache. With --memory, peak traced Python memory is reported instead of time
+(tracing slows every writer down several times).
+
+openpyxl writes XML much faster when lxml is installed; both XLSX writers
+benefit equally.
+
+    python benchmarks/bench_exports.py [--rows N] [--memory] [--skip-to-excel]
+"""
+import os
+import sys
+import time
+import shutil
+import argparse
+import tempfile
+import tracemalloc
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from export_handler import ExportHandler
+
+def make_frame(rows, seed=0):
+    """Floats, integers, text, dates and some missing values"""
+    rng = np.random.default_rng(seed)
+    df = pd.DataFrame({f'value_{i}': rng.normal(size=rows) for i in range(6)})
+    df['count'] = rng.integers(0, 1000, size=rows)
+    df['quantity'] = rng.integers(0, 50, size=rows)
+    df['region'] = rng.choice(['north', 'south', 'east', 'west'], size=rows)
+    df['product'] = rng.choice([f'product {i}' for i in range(200)], size=rows)
+    df['date'] = pd.Timestamp('2024-01-01') + pd.to_timedelta(rng.integers(0, 365, size=rows), unit='D')
+    df.loc[rng.random(rows) < 0.05, 'value_0'] = np.nan
+    df['note'] = np.where(rng.random(rows) < 0.1, 'check', None)
+    return df
+
+def measure(func, memory=False):
+    """Return wall-clock seconds, or peak traced MB with memory, of one call"""
+    if memory:
+        tracemalloc.start()
+    start = time.perf_counter()
+    func()
+    elapsed = time.perf_counter() - start
+    if not memory:
+        return elapsed
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return peak / (1024 * 1024)
+
+def report(name, value, memory=False, path=None):
+    size = f"{os.path.getsize(path) / (1024 * 1024):8.1f} MB" if path and os.path.exists(path) else ''
+    measured = f"peak {value:8.1f} MB" if memory else f"{value:8.2f} s"
+    print(f"{name:<28} {measured}  {size}")
+
+def drain(chunks):
+    for _ in chunks:
+        pass
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--rows', type=int, default=100000)
+    parser.add_argument('--memory', action='store_true', help='report peak traced memory instead of time')
+    parser.add_argument('--skip-to-excel', action='store_true', help="skip pandas to_excel, the slowest writer")
+    args = parser.parse_args()
+
+    df = make_frame(args.rows)
+    folder = tempfile.mkdtemp()
+    ExportHandler.export_folder = folder
+    handler = ExportHandler()
+    chunks = lambda: handler._frame_chunks(df)
+    print(f"{args.rows} rows x {len(df.columns)} columns\n")
+
+    def run(name, func, path=None):
+        report(name, measure(func, args.memory), args.memory, path)
+
+    try:
+        path = os.path.join(folder, 'old.csv')
+        run('csv to_csv', lambda: df.to_csv(path, index=False), path)
+        run('csv streamed', lambda: drain(handler.stream_export(chunks(), 'csv')))
+        run('csv streamed + gzip', lambda: drain(handler.stream_export(chunks(), 'csv', compress=True)))
+        run('ndjson streamed', lambda: drain(handler.stream_export(chunks(), 'ndjson')))
+        path = os.path.join(folder, 'old.json')
+        run('json to_json indent=2', lambda: df.to_json(path, orient='records', indent=2), path)
+
+        if not args.skip_to_excel:
+            path = os.path.join(folder, 'old.xlsx')
+            run('xlsx to_excel', lambda: df.to_excel(path, index=False, engine='openpyxl'), path)
+        path = handler.artifact_path('benchmark', 'xlsx')
+        run('xlsx write-only', lambda: handler.export_chunks(chunks(), 'xlsx', path), path)
+        run('xlsx cached artifact', lambda: handler.cached_artifact('benchmark', 'xlsx'), path)
+    finally:
+        shutil.rmtree(folder, ignore_errors=True)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,94 @@
+import json
+import hashlib
+import threading
+import logging
+from collections import OrderedDict
+
+# Bump when chart output changes so stale entries and ETags stop matching
+CHART_VERSION = 1
+
+class ChartCache:
+    """Process-wide LRU cache of rendered chart payloads bounded by total size.
+
+    Keys are digests of the dataset content hash and the chart parameters, so
+    they double as ETags: a new dataset version or different parameters never
+    match an old entry.
+    """
+
+    def __init__(self, max_bytes=64 * 1024 * 1024):
+        self.logger = logging.getLogger(__name__)
+        self.max_bytes = max_bytes
+        self.current_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries = OrderedDict()  # key -> (payload, size in bytes)
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def make_key(content_hash, *params):
+        """Digest identifying one chart of one dataset version"""
+        text = json.dumps([CHART_VERSION, content_hash, [str(p) if p is not None else None for p in params]])
+        return hashlib.sha256(text.encode('utf-8')).hexdigest()
+
+    def get(self, key):
+        """Return the cached payload for key, or None on a miss"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+
+    def put(self, key, payload):
+        """Store a str payload, evicting least recently used entries to stay within budget"""
+        # Charged by encoded size; non-ASCII labels take more bytes than characters
+        nbytes = len(payload.encode('utf-8'))
+        if nbytes > self.max_bytes:
+            self.logger.info(f"Chart payload of {nbytes} bytes exceeds cache budget, not cached")
+            return
+
+        with self._lock:
+            if key in self._entries:
+                self.current_bytes -= self._entries.pop(key)[1]
+            self._entries[key] = (payload, nbytes)
+            self.current_bytes += nbytes
+
+            while self.current_bytes > self.max_bytes and self._entries:
+                _, (_, oldest_bytes) = self._entries.popitem(last=False)
+                self.current_bytes -= oldest_bytes
+                self.evictions += 1
+
+    def get_or_create(self, key, build):
+        """Return the cached payload for key, calling build() on a miss; None results are not cached"""
+        payload = self.get(key)
+        if payload is None:
+            payload = build()
+            if payload is not None:
+                self.put(key, payload)
+        return payload
+
+    def clear(self):
+        """Drop all cached entries"""
+        with self._lock:
+            self._entries.clear()
+            self.current_bytes = 0
+
+    def stats(self):
+        """Return cache counters and memory usage"""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'entries': len(self._entries),
+                'current_bytes': self.current_bytes,
+                'max_bytes': self.max_bytes,
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'hit_ratio': round(self.hits / lookups, 4) if lookups else 0.0
+            }
+
+# Shared by every request in this worker process
+chart_cache = ChartCache()
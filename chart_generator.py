@@ -1,16 +1,37 @@
+import os
 import plotly.graph_objects as go
-import plotly.express as px
 import pandas as pd
+import numpy as np
 import logging
+from concurrent.futures import ThreadPoolExecutor
+from downsampling import DEFAULT_POINT_BUDGET, line_indices, grid_indices, even_indices
+
+BAR_BINS = 50
+HISTOGRAM_BINS = 50
 
 class ChartGenerator:
     """Generate interactive charts using Plotly"""
     
+    # Most points a line or scatter trace sends to the browser
+    point_budget = DEFAULT_POINT_BUDGET
+    # Threads rendering the automatic dashboard charts
+    max_workers = min(4, os.cpu_count() or 1)
+    
     def __init__(self):
         self.logger = logging.getLogger(__name__)
     
     def create_chart(self, df, chart_type, x_column, y_column, title="Chart"):
-        """Create a chart based on the specified parameters"""
+        """Create a chart as an HTML fragment"""
+        fig = self.create_figure(df, chart_type, x_column, y_column, title)
+        return fig.to_html(include_plotlyjs=False, div_id=f"chart_{chart_type}") if fig else None
+    
+    def create_chart_spec(self, df, chart_type, x_column, y_column, title="Chart"):
+        """Create a chart as a Plotly figure JSON spec with arrays encoded as base64 typed arrays"""
+        fig = self.create_figure(df, chart_type, x_column, y_column, title)
+        return fig.to_json() if fig else None
+    
+    def create_figure(self, df, chart_type, x_column, y_column, title="Chart"):
+        """Create a chart figure based on the specified parameters"""
         try:
             if df.empty:
                 return None
@@ -65,7 +86,7 @@ class ChartGenerator:
                     )
                 )
                 
-                return fig.to_html(include_plotlyjs=False, div_id=f"chart_{chart_type}")
+                return fig
             
             return None
             
@@ -87,8 +108,14 @@ class ChartGenerator:
                     chart_data = df.groupby(x_col)[y_col].sum().head(20)
                     fig = go.Figure(data=[go.Bar(x=chart_data.index, y=chart_data.values)])
                 else:
-                    # For numeric x, create bins
-                    fig = px.bar(df.head(50), x=x_col, y=y_col)
+                    # For numeric x, sum y per value or over equal-width bins
+                    if df[x_col].nunique() <= BAR_BINS:
+                        chart_data = df.groupby(x_col)[y_col].sum()
+                        x_values = chart_data.index
+                    else:
+                        chart_data = df.groupby(pd.cut(df[x_col], BAR_BINS), observed=True)[y_col].sum()
+                        x_values = pd.IntervalIndex(chart_data.index).mid
+                    fig = go.Figure(data=[go.Bar(x=x_values, y=chart_data.values)])
             
             fig.update_layout(title=title, xaxis_title=x_col, yaxis_title=y_col)
             return fig
@@ -103,9 +130,17 @@ class ChartGenerator:
             # Sort by x column for better line visualization
             df_sorted = df.sort_values(x_col)
             
-            # Limit data points for performance
-            if len(df_sorted) > 1000:
-                df_sorted = df_sorted.iloc[::len(df_sorted)//1000]
+            # Downsample to the point budget, keeping peaks and troughs
+            if len(df_sorted) > self.point_budget:
+                x_values = self._axis_values(df_sorted[x_col])
+                y_values = self._axis_values(df_sorted[y_col])
+                if y_values is None:
+                    positions = even_indices(len(df_sorted), self.point_budget)
+                else:
+                    if x_values is None:
+                        x_values = np.arange(len(df_sorted), dtype=float)
+                    positions = line_indices(x_values, y_values, self.point_budget)
+                df_sorted = df_sorted.iloc[positions]
             
             fig = go.Figure(data=[go.Scatter(
                 x=df_sorted[x_col], 
@@ -149,8 +184,14 @@ class ChartGenerator:
                 self.logger.error(f"Invalid columns for scatter plot: x_col='{x_col}', y_col='{y_col}'")
                 return None
             
-            # Limit data points for performance
-            plot_df = df.head(1000)
+            plot_df, counts = self._thin_scatter(df, x_col, y_col)
+            
+            if counts is not None:
+                # Each point stands for a grid cell; color by how many rows it represents
+                color, showscale, colorbar = counts, True, dict(title='Points')
+            else:
+                numeric_y = plot_df[y_col].dtype in ['int64', 'float64']
+                color, showscale, colorbar = (plot_df[y_col] if numeric_y else None), numeric_y, None
             
             fig = go.Figure(data=[go.Scatter(
                 x=plot_df[x_col],
@@ -159,9 +200,10 @@ class ChartGenerator:
                 marker=dict(
                     size=6,
                     opacity=0.7,
-                    color=plot_df[y_col] if plot_df[y_col].dtype in ['int64', 'float64'] else None,
+                    color=color,
                     colorscale='Viridis',
-                    showscale=True if plot_df[y_col].dtype in ['int64', 'float64'] else False
+                    showscale=showscale,
+                    colorbar=colorbar
                 )
             )])
             
@@ -172,15 +214,68 @@ class ChartGenerator:
             self.logger.error(f"Error creating scatter chart: {str(e)}")
             return None
     
+    def _thin_scatter(self, df, x_col, y_col):
+        """Return (rows to plot, rows each plotted point represents or None) within the point budget"""
+        if len(df) <= self.point_budget:
+            return df, None
+        
+        x_values = self._axis_values(df[x_col])
+        y_values = self._axis_values(df[y_col])
+        if x_values is None or y_values is None:
+            # Text axes cannot be binned; take an unbiased sample instead of the top rows
+            return df.sample(n=self.point_budget, random_state=0).sort_index(), None
+        
+        finite = np.isfinite(x_values) & np.isfinite(y_values)
+        if not finite.all():
+            df, x_values, y_values = df[finite], x_values[finite], y_values[finite]
+        positions, counts = grid_indices(x_values, y_values, self.point_budget)
+        return df.iloc[positions], counts
+    
+    @staticmethod
+    def _axis_values(series):
+        """Float values of a numeric or datetime column, or None for other types"""
+        if pd.api.types.is_datetime64_any_dtype(series.dtype) or pd.api.types.is_timedelta64_dtype(series.dtype):
+            return series.astype('int64').to_numpy(dtype=float)
+        if pd.api.types.is_numeric_dtype(series.dtype):
+            return series.to_numpy(dtype=float, na_value=np.nan)
+        return None
+    
+    @staticmethod
+    def _from_axis_values(values, series):
+        """Map float values from _axis_values back to timestamps, or durations to seconds"""
+        if pd.api.types.is_datetime64_any_dtype(series.dtype):
+            timestamps = pd.to_datetime(values.astype('int64'), unit=series.dt.unit, utc=series.dt.tz is not None)
+            return timestamps.tz_convert(series.dt.tz) if series.dt.tz is not None else timestamps
+        if pd.api.types.is_timedelta64_dtype(series.dtype):
+            return pd.to_timedelta(values.astype('int64'), unit=series.dt.unit).total_seconds()
+        return values
+    
     def _create_box_chart(self, df, x_col, y_col, title):
-        """Create a box plot"""
+        """Create a box plot from per-group quartiles and whiskers"""
         try:
-            if df[x_col].dtype in ['object', 'category']:
+            if not y_col:
+                # A single box of the x column itself
+                y_col = x_col
+                groups = pd.Series(y_col, index=df.index)
+            elif df[x_col].dtype in ['object', 'category'] or isinstance(df[x_col].dtype, pd.StringDtype):
                 # Box plot by category
-                fig = px.box(df, x=x_col, y=y_col)
+                groups = df[x_col]
             else:
                 # Single box plot for numeric data
-                fig = go.Figure(data=[go.Box(y=df[y_col], name=y_col)])
+                groups = pd.Series(y_col, index=df.index)
+            
+            box = self._box_statistics(df[y_col], groups)
+            fig = go.Figure(data=[go.Box(
+                x=box.index.astype(str),
+                q1=box['q1'],
+                median=box['median'],
+                q3=box['q3'],
+                lowerfence=box['lowerfence'],
+                upperfence=box['upperfence'],
+                mean=box['mean'],
+                name=y_col,
+                boxmean=True
+            )])
             
             fig.update_layout(title=title, xaxis_title=x_col, yaxis_title=y_col)
             return fig
@@ -189,13 +284,47 @@ class ChartGenerator:
             self.logger.error(f"Error creating box chart: {str(e)}")
             return None
     
+    @staticmethod
+    def _box_statistics(values, groups):
+        """Quartiles, mean and Tukey whiskers of values for each group, one row per group"""
+        values = pd.to_numeric(values, errors='raise').astype(float)
+        grouped = values.groupby(groups, observed=True, sort=True)
+        box = grouped.quantile([0.25, 0.5, 0.75]).unstack()
+        box.columns = ['q1', 'median', 'q3']
+        box['mean'] = grouped.mean()
+        
+        # Whiskers end at the most extreme values within 1.5 * IQR of the box
+        iqr = box['q3'] - box['q1']
+        codes = grouped.ngroup().to_numpy()
+        low = (box['q1'] - 1.5 * iqr).to_numpy()[codes]
+        high = (box['q3'] + 1.5 * iqr).to_numpy()[codes]
+        inside = ((values >= low) & (values <= high)).to_numpy()
+        whiskers = values[inside].groupby(codes[inside]).agg(['min', 'max'])
+        box['lowerfence'] = whiskers['min'].to_numpy()
+        box['upperfence'] = whiskers['max'].to_numpy()
+        return box
+    
     def _create_histogram(self, df, x_col, title):
-        """Create a histogram"""
+        """Create a histogram from pre-computed bin counts"""
         try:
-            fig = go.Figure(data=[go.Histogram(
-                x=df[x_col],
-                nbinsx=min(50, len(df[x_col].unique()))
-            )])
+            series = df[x_col]
+            values = self._axis_values(series)
+            if values is None:
+                # Text columns: counts of the most frequent values
+                counts = series.value_counts().head(HISTOGRAM_BINS)
+                fig = go.Figure(data=[go.Bar(x=counts.index.astype(str), y=counts.values)])
+            else:
+                finite = values[np.isfinite(values)]
+                low, high = finite.min(), finite.max()
+                if pd.api.types.is_integer_dtype(series.dtype) and high - low < HISTOGRAM_BINS:
+                    # Few distinct integers: one bin per value
+                    bins = np.arange(low, high + 2) - 0.5
+                else:
+                    bins = HISTOGRAM_BINS
+                counts, edges = np.histogram(finite, bins=bins)
+                centers = self._from_axis_values((edges[:-1] + edges[1:]) / 2, series)
+                fig = go.Figure(data=[go.Bar(x=centers, y=counts)])
+                fig.update_layout(bargap=0)
             
             fig.update_layout(title=title, xaxis_title=x_col, yaxis_title='Frequency')
             return fig
@@ -204,98 +333,81 @@ class ChartGenerator:
             self.logger.error(f"Error creating histogram: {str(e)}")
             return None
     
-    def generate_automatic_charts(self, df):
-        """Generate relevant charts automatically based on data characteristics"""
+    @staticmethod
+    def column_partition(df):
+        """Numeric and categorical column names, computed once and shared by all automatic charts"""
+        return {
+            'numeric': df.select_dtypes(include=['number']).columns.tolist(),
+            'categorical': df.select_dtypes(include=['object', 'category']).columns.tolist()
+        }
+    
+    @staticmethod
+    def automatic_chart_plan(partition):
+        """The automatic charts worth drawing for a dataset, as chart parameter dicts"""
+        numeric_cols = partition['numeric']
+        categorical_cols = partition['categorical']
+        plan = []
+        
+        # Chart 1: Distribution of first numeric column (histogram)
+        if numeric_cols:
+            plan.append({'type': 'histogram', 'x': numeric_cols[0], 'y': None,
+                         'title': f'Distribution of {numeric_cols[0]}',
+                         'error': f'Unable to generate histogram for {numeric_cols[0]}'})
+        
+        # Chart 2: Top categories if categorical data exists
+        if categorical_cols:
+            plan.append({'type': 'pie', 'x': categorical_cols[0], 'y': None,
+                         'title': f'Distribution of {categorical_cols[0]}',
+                         'error': f'Unable to generate pie chart for {categorical_cols[0]}'})
+        
+        # Chart 3: Correlation scatter plot (if we have 2+ numeric columns)
+        if len(numeric_cols) >= 2:
+            plan.append({'type': 'scatter', 'x': numeric_cols[0], 'y': numeric_cols[1],
+                         'title': f'{numeric_cols[0]} vs {numeric_cols[1]}',
+                         'error': f'Unable to generate scatter plot for {numeric_cols[0]} vs {numeric_cols[1]}'})
+        
+        # Chart 4: Bar chart of categorical vs numeric (if both exist)
+        if categorical_cols and numeric_cols:
+            plan.append({'type': 'bar', 'x': categorical_cols[0], 'y': numeric_cols[0],
+                         'title': f'{numeric_cols[0]} by {categorical_cols[0]}',
+                         'error': f'Unable to generate bar chart for {numeric_cols[0]} by {categorical_cols[0]}'})
+        
+        return plan
+    
+    def generate_automatic_charts(self, df, partition=None):
+        """Generate relevant charts automatically based on data characteristics.
+        
+        The charts are rendered concurrently; pass a precomputed column_partition
+        to skip recomputing the column types.
+        """
         try:
-            auto_charts = []
-            
-            # Get numeric and categorical columns
-            numeric_cols = df.select_dtypes(include=['number']).columns.tolist()
-            categorical_cols = df.select_dtypes(include=['object', 'category']).columns.tolist()
+            plan = self.automatic_chart_plan(partition or self.column_partition(df))
             
-            # Chart 1: Distribution of first numeric column (histogram)
-            if numeric_cols:
-                first_numeric = numeric_cols[0]
-                chart_html = self.create_chart(df, 'histogram', first_numeric, None, 
-                                               f'Distribution of {first_numeric}')
-                if chart_html:
-                    auto_charts.append({
-                        'title': f'Distribution of {first_numeric}',
-                        'type': 'histogram',
-                        'html': chart_html
-                    })
-                else:
-                    # Add error message if chart failed
-                    auto_charts.append({
-                        'title': f'Distribution of {first_numeric}',
-                        'type': 'error',
-                        'html': self._create_error_message(f'Unable to generate histogram for {first_numeric}')
-                    })
+            # If no charts can be generated, show a helpful message
+            if not plan:
+                return [self.no_charts_entry()]
             
-            # Chart 2: Top categories if categorical data exists
-            if categorical_cols:
-                first_categorical = categorical_cols[0]
-                chart_html = self.create_chart(df, 'pie', first_categorical, None, 
-                                               f'Distribution of {first_categorical}')
-                if chart_html:
-                    auto_charts.append({
-                        'title': f'Distribution of {first_categorical}',
-                        'type': 'pie',
-                        'html': chart_html
-                    })
-                else:
-                    # Add error message if chart failed
-                    auto_charts.append({
-                        'title': f'Distribution of {first_categorical}',
-                        'type': 'error',
-                        'html': self._create_error_message(f'Unable to generate pie chart for {first_categorical}')
-                    })
+            def render(chart):
+                return self.create_chart_spec(df, chart['type'], chart['x'], chart['y'], chart['title'])
             
-            # Chart 3: Correlation scatter plot (if we have 2+ numeric columns)
-            if len(numeric_cols) >= 2:
-                chart_html = self.create_chart(df, 'scatter', numeric_cols[0], numeric_cols[1], 
-                                               f'{numeric_cols[0]} vs {numeric_cols[1]}')
-                if chart_html:
-                    auto_charts.append({
-                        'title': f'{numeric_cols[0]} vs {numeric_cols[1]}',
-                        'type': 'scatter',
-                        'html': chart_html
-                    })
-                else:
-                    # Add error message if chart failed
-                    auto_charts.append({
-                        'title': f'{numeric_cols[0]} vs {numeric_cols[1]}',
-                        'type': 'error',
-                        'html': self._create_error_message(f'Unable to generate scatter plot for {numeric_cols[0]} vs {numeric_cols[1]}')
-                    })
+            workers = min(self.max_workers, len(plan))
+            if workers > 1:
+                with ThreadPoolExecutor(max_workers=workers) as pool:
+                    specs = list(pool.map(render, plan))
+            else:
+                specs = [render(chart) for chart in plan]
             
-            # Chart 4: Bar chart of categorical vs numeric (if both exist)
-            if categorical_cols and numeric_cols:
-                # Use first categorical and first numeric
-                chart_html = self.create_chart(df, 'bar', categorical_cols[0], numeric_cols[0], 
-                                               f'{numeric_cols[0]} by {categorical_cols[0]}')
-                if chart_html:
-                    auto_charts.append({
-                        'title': f'{numeric_cols[0]} by {categorical_cols[0]}',
-                        'type': 'bar',
-                        'html': chart_html
-                    })
+            auto_charts = []
+            for chart, spec in zip(plan, specs):
+                if spec:
+                    auto_charts.append({'title': chart['title'], 'type': chart['type'], 'spec': spec})
                 else:
                     # Add error message if chart failed
                     auto_charts.append({
-                        'title': f'{numeric_cols[0]} by {categorical_cols[0]}',
+                        'title': chart['title'],
                         'type': 'error',
-                        'html': self._create_error_message(f'Unable to generate bar chart for {numeric_cols[0]} by {categorical_cols[0]}')
+                        'html': self._create_error_message(chart['error'])
                     })
-            
-            # If no charts were generated, show a helpful message
-            if not auto_charts:
-                auto_charts.append({
-                    'title': 'No Charts Available',
-                    'type': 'info',
-                    'html': self._create_info_message('No suitable data found for automatic chart generation. Please ensure your data has numeric or categorical columns.')
-                })
-            
             return auto_charts
             
         except Exception as e:
@@ -306,6 +418,14 @@ class ChartGenerator:
                 'html': self._create_error_message(f'An error occurred while generating charts: {str(e)}')
             }]
     
+    def no_charts_entry(self):
+        """Dashboard entry shown when a dataset has nothing to chart automatically"""
+        return {
+            'title': 'No Charts Available',
+            'type': 'info',
+            'html': self._create_info_message('No suitable data found for automatic chart generation. Please ensure your data has numeric or categorical columns.')
+        }
+    
     def _create_error_message(self, message):
         """Create an error message HTML"""
         return f"""
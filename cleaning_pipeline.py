@@ -0,0 +1,90 @@
+import os
+import json
+import hashlib
+import logging
+from columnar_store import columnar_store
+from file_metadata import file_metadata
+from analytics_cache import analytics_cache
+from data_processor import DataProcessor
+
+class CleaningPipeline:
+    """Cleaning modeled as an append-only log of steps over an immutable base dataset.
+
+    Each step is one set of clean_data operations. The result of every log
+    prefix that has been computed is kept next to the base file under a digest
+    chained over the base contents and the steps, and its metadata records the
+    log. Undoing a step or re-applying the same steps reuses those files
+    instead of re-reading and re-writing the dataset.
+    """
+
+    def __init__(self):
+        self.logger = logging.getLogger(__name__)
+
+    def log_for(self, filepath):
+        """Return (base path, steps) that produced a dataset file"""
+        cleaning = file_metadata.load(filepath).get('cleaning')
+        if not cleaning:
+            return filepath, []
+        return os.path.join(os.path.dirname(filepath), cleaning['base']), cleaning['steps']
+
+    def _digest(self, base_path, steps):
+        digest = analytics_cache.content_hash(base_path)
+        for step in steps:
+            digest = hashlib.sha256((digest + json.dumps(step, sort_keys=True)).encode('utf-8')).hexdigest()
+        return digest
+
+    def materialized_path(self, base_path, steps):
+        """Path the result of applying steps to the base dataset is stored at"""
+        if not steps:
+            return base_path
+        stem, ext = os.path.splitext(base_path)
+        return f"{stem}.{self._digest(base_path, steps)[:16]}{ext}"
+
+    def find_materialized(self, base_path, steps):
+        """Existing file holding the result of steps, or None"""
+        path = self.materialized_path(base_path, steps)
+        if not steps:
+            return path if os.path.exists(path) else None
+        for candidate in (columnar_store.columnar_path(path), path):
+            if os.path.exists(candidate) and file_metadata.load(candidate).get('cleaning'):
+                return candidate
+        return None
+
+    def materialize(self, base_path, steps, report=None):
+        """Return (path, shape) of the dataset produced by applying steps to the base.
+
+        Starts from the longest prefix of steps already stored on disk, so only
+        new steps are computed.
+        """
+        processor = DataProcessor()
+        done = len(steps)
+        path = self.find_materialized(base_path, steps)
+        while path is None and done > 0:
+            done -= 1
+            path = self.find_materialized(base_path, steps[:done])
+        if path is None:
+            raise ValueError('Base dataset is no longer available.')
+
+        if done == len(steps):
+            return path, processor.get_profile(path).get('shape')
+
+        if report:
+            report(0.05, 'Loading data')
+        df = processor.load_all(path)
+        if df is None:
+            raise ValueError('Error loading data file.')
+
+        for index in range(done, len(steps)):
+            if report:
+                report(0.1 + 0.7 * (index - done) / (len(steps) - done), f'Applying cleaning step {index + 1}')
+            df = processor.clean_data(df, steps[index], path if index == done else None)
+            if df is None:
+                raise ValueError('Error cleaning data.')
+
+        if report:
+            report(0.8, 'Saving cleaned data')
+        path = processor.save_data(df, self.materialized_path(base_path, steps))
+        file_metadata.update(path, cleaning={'base': os.path.basename(base_path), 'steps': steps})
+        return path, [int(n) for n in df.shape]
+
+cleaning_pipeline = CleaningPipeline()
@@ -0,0 +1,226 @@
+import os
+import logging
+import pandas as pd
+
+try:
+    import pyarrow as pa
+    import pyarrow.feather as feather
+except ImportError:  # pyarrow is a dependency, but without it the raw file is parsed instead
+    pa = None
+    feather = None
+
+COLUMNAR_EXTENSION = '.feather'
+
+class ColumnarStore:
+    """Persist datasets as Arrow IPC (Feather v2) files for fast, memory-mapped reads"""
+
+    def __init__(self):
+        self.logger = logging.getLogger(__name__)
+
+    @staticmethod
+    def is_available():
+        """Whether pyarrow is installed so columnar files can be read and written"""
+        return pa is not None
+
+    @staticmethod
+    def is_columnar(filepath):
+        """Whether the path already points at a columnar file"""
+        return filepath.endswith(COLUMNAR_EXTENSION)
+
+    @staticmethod
+    def columnar_path(filepath):
+        """Path of the columnar copy stored next to a raw CSV/Excel file"""
+        return os.path.splitext(filepath)[0] + COLUMNAR_EXTENSION
+
+    def has_fresh_copy(self, filepath):
+        """Whether a columnar copy exists that is at least as new as the raw file"""
+        if not self.is_available():
+            return False
+        columnar_path = self.columnar_path(filepath)
+        try:
+            return os.path.getmtime(columnar_path) >= os.path.getmtime(filepath)
+        except OSError:
+            return False
+
+    def write(self, df, filepath):
+        """Write a DataFrame to a columnar file, returning the path or None on failure"""
+        if not self.is_available():
+            return None
+
+        columnar_path = filepath if self.is_columnar(filepath) else self.columnar_path(filepath)
+        tmp_path = columnar_path + '.tmp'
+        try:
+            table = self.to_arrow(df)
+            # Uncompressed so reads can memory-map the buffers instead of decompressing
+            feather.write_feather(table, tmp_path, compression='uncompressed')
+            os.replace(tmp_path, columnar_path)
+            self.logger.info(f"Wrote columnar copy {columnar_path}")
+            return columnar_path
+        except Exception as e:
+            self.logger.warning(f"Could not write columnar copy of {filepath}: {str(e)}")
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            return None
+
+    def open_writer(self, filepath):
+        """Open a writer that appends DataFrame chunks as record batches of one columnar file"""
+        if not self.is_available():
+            return None
+        columnar_path = filepath if self.is_columnar(filepath) else self.columnar_path(filepath)
+        return ColumnarWriter(self, columnar_path)
+
+    def to_arrow(self, df):
+        """Convert a DataFrame to an Arrow table, storing mixed-type columns as text"""
+        return pa.Table.from_pandas(self._arrow_compatible(df), preserve_index=False)
+
+    def _arrow_compatible(self, df):
+        """Store mixed-type object columns (common in Excel sheets) as strings.
+
+        Arrow columns must have a single type, so a column mixing e.g. text and
+        datetimes is written as text. Missing values are kept as nulls.
+        """
+        mixed_cols = []
+        for col in df.select_dtypes(include=['object']).columns:
+            try:
+                pa.array(df[col], from_pandas=True)
+            except (pa.ArrowInvalid, pa.ArrowTypeError):
+                mixed_cols.append(col)
+
+        if not mixed_cols:
+            return df
+
+        self.logger.info(f"Storing mixed-type columns as text: {mixed_cols}")
+        converted = df.copy(deep=False)
+        for col in mixed_cols:
+            converted[col] = df[col].where(df[col].isna(), df[col].astype(str))
+        return converted
+
+    def read(self, filepath, columns=None, rows=None):
+        """Read a columnar file into a DataFrame using a memory-mapped table.
+
+        columns selects a subset of columns and rows=(offset, limit) a row window;
+        only the record batches overlapping the window are touched.
+        """
+        columnar_path = filepath if self.is_columnar(filepath) else self.columnar_path(filepath)
+        if rows is None:
+            table = feather.read_table(columnar_path, columns=columns, memory_map=True)
+            return table.to_pandas()
+
+        offset, limit = rows
+        with pa.memory_map(columnar_path) as source:
+            reader = pa.ipc.open_file(source)
+            batches = []
+            batch_start = 0
+            window_start = None
+            for i in range(reader.num_record_batches):
+                batch = reader.get_batch(i)
+                batch_end = batch_start + batch.num_rows
+                if batch_end > offset and batch_start < offset + limit:
+                    if window_start is None:
+                        window_start = batch_start
+                    batches.append(batch)
+                elif batch_start >= offset + limit:
+                    break
+                batch_start = batch_end
+
+            if not batches:
+                table = reader.schema.empty_table()
+            else:
+                table = pa.Table.from_batches(batches).slice(offset - window_start, limit)
+            if columns is not None:
+                table = table.select(columns)
+            df = table.to_pandas()
+
+        df.index = pd.RangeIndex(offset, offset + len(df))
+        return df
+
+class ColumnarWriter:
+    """Append DataFrame chunks to an Arrow IPC file, widening column types as needed.
+
+    Each chunk becomes one record batch, so the file footer doubles as a row index.
+    When a later chunk does not fit the schema so far (e.g. an integer column that
+    turns out to contain text), the batches written so far are rewritten once with
+    the widened schema.
+    """
+
+    def __init__(self, store, path):
+        self.logger = logging.getLogger(__name__)
+        self.store = store
+        self.path = path
+        self.schema = None
+        self.rows = 0
+        self._writer = None
+        self._writing_path = path + '.tmp'
+
+    def write(self, df):
+        """Append a chunk"""
+        table = self.store.to_arrow(df)
+        if self._writer is None:
+            self.schema = table.schema
+            self._writer = pa.ipc.new_file(self._writing_path, self.schema)
+        elif not table.schema.equals(self.schema, check_metadata=False):
+            table = self._conform(table)
+
+        self._writer.write_table(table)
+        self.rows += table.num_rows
+
+    def close(self):
+        """Finish the file and move it into place, returning its path"""
+        if self._writer is None:
+            return None
+        self._writer.close()
+        self._writer = None
+        os.replace(self._writing_path, self.path)
+        self.logger.info(f"Wrote {self.rows} rows to columnar store {self.path}")
+        return self.path
+
+    def abort(self):
+        """Discard a partially written file"""
+        if self._writer is not None:
+            self._writer.close()
+            self._writer = None
+        if os.path.exists(self._writing_path):
+            os.remove(self._writing_path)
+
+    def _conform(self, table):
+        """Cast a chunk to the current schema, widening the schema first if it does not fit"""
+        try:
+            return table.cast(self.schema)
+        except (pa.ArrowInvalid, pa.ArrowTypeError, pa.ArrowNotImplementedError):
+            pass
+
+        widened = pa.schema(
+            [pa.field(field.name, self._widen(field.type, table.schema.field(field.name).type))
+             for field in self.schema]
+        )
+        self.logger.info(f"Widening columnar schema for {self.path}")
+
+        # Copy what has been written so far into a new file with the wider schema
+        self._writer.close()
+        previous_path = self._writing_path
+        self._writing_path = previous_path + '.w'
+        self.schema = widened
+        self._writer = pa.ipc.new_file(self._writing_path, self.schema)
+        with pa.memory_map(previous_path) as source:
+            reader = pa.ipc.open_file(source)
+            for i in range(reader.num_record_batches):
+                self._writer.write_table(pa.Table.from_batches([reader.get_batch(i)]).cast(self.schema))
+        os.remove(previous_path)
+
+        return table.cast(self.schema)
+
+    @staticmethod
+    def _widen(current, incoming):
+        """Smallest common type for two column types"""
+        if current.equals(incoming):
+            return current
+        if pa.types.is_null(current):
+            return incoming
+        if pa.types.is_null(incoming):
+            return current
+        numeric = (pa.types.is_integer, pa.types.is_floating)
+        if any(check(current) for check in numeric) and any(check(incoming) for check in numeric):
+            return pa.float64()
+        return pa.large_string()
+
+columnar_store = ColumnarStore()
@@ -0,0 +1,91 @@
+import logging
+import numpy as np
+
+INDEX_STEP = 1000
+SCAN_CHUNK_SIZE = 16 * 1024 * 1024
+
+class CsvRowIndex:
+    """Sparse byte-offset index of CSV rows for seeking straight to a row window.
+
+    Every INDEX_STEP-th data row gets its starting byte offset recorded. Newlines
+    inside quoted fields are skipped by tracking quote parity, so multi-line
+    values do not shift the index.
+    """
+
+    def __init__(self, step=INDEX_STEP):
+        self.logger = logging.getLogger(__name__)
+        self.step = step
+
+    def build(self, filepath, dialect):
+        """Scan the file once and return the index, or None if it cannot be used"""
+        encoding = dialect.get('encoding', 'utf-8')
+        if encoding.startswith('utf-16'):
+            # Newlines are two bytes wide; seeking by single-byte scan is not safe
+            return None
+
+        header_rows = 0 if dialect.get('header') is None else 1
+        quote = ord(dialect.get('quotechar') or '"')
+
+        offsets = [0] if header_rows == 0 else []
+        records_started = 1  # record 0 starts at byte 0
+        in_quotes = 0
+        base = 0
+        last_terminator = -1
+        previous_byte = None
+
+        with open(filepath, 'rb') as f:
+            while True:
+                chunk = f.read(SCAN_CHUNK_SIZE)
+                if not chunk:
+                    break
+                data = np.frombuffer(chunk, dtype=np.uint8)
+
+                parity = (np.cumsum(data == quote) + in_quotes) & 1
+                terminators = np.flatnonzero((data == 10) & (parity == 0)) + base
+
+                if len(terminators):
+                    # read_csv skips blank lines, which would shift every later offset
+                    gaps = np.diff(np.concatenate(([last_terminator], terminators)))
+                    if np.any(gaps == 1) or self._has_crlf_blank_line(chunk, base, terminators, gaps, previous_byte):
+                        self.logger.info(f"Blank lines in {filepath}, row index disabled")
+                        return None
+
+                    row_numbers = np.arange(records_started, records_started + len(terminators)) - header_rows
+                    selected = (row_numbers >= 0) & (row_numbers % self.step == 0)
+                    offsets.extend((terminators[selected] + 1).tolist())
+                    records_started += len(terminators)
+                    last_terminator = int(terminators[-1])
+
+                in_quotes = int(parity[-1])
+                previous_byte = chunk[-1]
+                base += len(chunk)
+
+        # A trailing newline starts an empty record at EOF rather than a data row
+        total_rows = records_started - header_rows
+        if last_terminator == base - 1:
+            total_rows -= 1
+            if offsets and offsets[-1] == base:
+                offsets.pop()
+
+        return {
+            'step': self.step,
+            'offsets': offsets,
+            'total_rows': max(total_rows, 0)
+        }
+
+    @staticmethod
+    def _has_crlf_blank_line(chunk, base, terminators, gaps, previous_byte):
+        """Detect \\r\\n\\r\\n sequences, which are blank lines in Windows files"""
+        candidates = terminators[gaps == 2] - base
+        for position in candidates:
+            cr = chunk[position - 1] if position >= 1 else previous_byte
+            if cr == 13:
+                return True
+        return False
+
+    def locate(self, index, row):
+        """Return (byte offset, rows to skip after it) for a data row"""
+        slot = min(row // index['step'], len(index['offsets']) - 1)
+        return index['offsets'][slot], row - slot * index['step']
+
+csv_row_index = CsvRowIndex()
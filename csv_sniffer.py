@@ -0,0 +1,121 @@
+import io
+import csv
+import itertools
+import codecs
+import logging
+
+SAMPLE_SIZE = 64 * 1024
+DELIMITERS = ',;\t|'
+HEADER_SAMPLE_ROWS = 20
+
+class CsvSniffer:
+    """Detect the encoding, delimiter and header of a CSV file from one byte sample"""
+
+    def __init__(self, sample_size=SAMPLE_SIZE):
+        self.logger = logging.getLogger(__name__)
+        self.sample_size = sample_size
+
+    def sniff(self, filepath):
+        """Return read_csv keyword arguments describing the file's dialect"""
+        with open(filepath, 'rb') as f:
+            sample = f.read(self.sample_size)
+            at_eof = not f.read(1)
+
+        encoding = self._detect_encoding(sample, at_eof)
+        text = self._decode_sample(sample, encoding, at_eof)
+
+        sep = ','
+        quotechar = '"'
+        try:
+            dialect = csv.Sniffer().sniff(text, delimiters=DELIMITERS)
+            sep = dialect.delimiter
+            quotechar = dialect.quotechar or '"'
+        except csv.Error:
+            pass
+
+        header = self._detect_header(text, sep, quotechar)
+
+        dialect = {
+            'encoding': encoding,
+            'sep': sep,
+            'quotechar': quotechar,
+            'header': header
+        }
+        self.logger.debug(f"Sniffed CSV dialect for {filepath}: {dialect}")
+        return dialect
+
+    def _detect_encoding(self, sample, at_eof):
+        """Pick an encoding for the sample, preferring UTF-8"""
+        if sample.startswith(codecs.BOM_UTF8):
+            return 'utf-8-sig'
+        if sample.startswith((codecs.BOM_UTF16_LE, codecs.BOM_UTF16_BE)):
+            return 'utf-16'
+
+        for encoding in ('utf-8', 'cp1252'):
+            try:
+                # A multi-byte character may be cut off at the end of the sample
+                codecs.getincrementaldecoder(encoding)().decode(sample, final=at_eof)
+                return encoding
+            except UnicodeDecodeError:
+                continue
+
+        # Latin-1 maps every byte, so it always decodes
+        return 'latin-1'
+
+    @staticmethod
+    def _decode_sample(sample, encoding, at_eof):
+        """Decode the sample, dropping a trailing partial line"""
+        text = codecs.getincrementaldecoder(encoding)(errors='replace').decode(sample, final=True)
+        if not at_eof and '\n' in text:
+            text = text[:text.rindex('\n') + 1]
+        return text
+
+    @staticmethod
+    def _detect_header(text, sep, quotechar):
+        """Return 0 if the first row is a header, None if it is already data.
+
+        Like csv.Sniffer.has_header, the first row is compared with the sampled
+        rows below it column by column. It is only read as data when every field
+        in it is numeric and of the same kind (integer, decimal) as the values
+        under it, so a header such as 2019,2020,2021 over decimal values is kept.
+        """
+        try:
+            rows = list(itertools.islice(csv.reader(io.StringIO(text), delimiter=sep, quotechar=quotechar),
+                                         HEADER_SAMPLE_ROWS + 1))
+        except csv.Error:
+            return 0
+        if len(rows) < 2:
+            return 0
+
+        first_row, data_rows = rows[0], rows[1:]
+        compared = 0
+        for i, field in enumerate(first_row):
+            kind = CsvSniffer._field_kind(field)
+            if kind is None:
+                continue
+            if kind == 'text':
+                return 0
+            column_kinds = {CsvSniffer._field_kind(row[i]) for row in data_rows if i < len(row)} - {None}
+            if len(column_kinds) != 1:
+                # Mixed or empty columns say nothing either way
+                continue
+            if column_kinds != {kind}:
+                return 0
+            compared += 1
+        return None if compared else 0
+
+    @staticmethod
+    def _field_kind(field):
+        """'int', 'float' or 'text' for a CSV field, None when it is empty"""
+        field = field.strip()
+        if not field:
+            return None
+        for kind, parse in (('int', int), ('float', float)):
+            try:
+                parse(field)
+                return kind
+            except ValueError:
+                continue
+        return 'text'
+
+csv_sniffer = CsvSniffer()
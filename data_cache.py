@@ -0,0 +1,135 @@
+import os
+import threading
+import logging
+from collections import OrderedDict
+
+class DataFrameCache:
+    """Process-wide LRU cache of parsed DataFrames bounded by total memory usage"""
+
+    def __init__(self, max_bytes=256 * 1024 * 1024):
+        self.logger = logging.getLogger(__name__)
+        self.max_bytes = max_bytes
+        self.current_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries = OrderedDict()  # key -> (df, nbytes)
+        self._lock = threading.Lock()
+        self._load_locks = {}
+
+    @staticmethod
+    def make_key(filepath):
+        """Build a cache key from the file path plus its mtime and size"""
+        stat = os.stat(filepath)
+        return (os.path.abspath(filepath), stat.st_mtime_ns, stat.st_size)
+
+    def get(self, key):
+        """Return the cached DataFrame for key, or None on a miss"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+
+    def peek(self, filepath):
+        """Return the cached DataFrame for the current version of a file without loading it"""
+        key = self.make_key(filepath)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+
+    def put(self, key, df):
+        """Store a DataFrame, evicting least recently used entries to stay within budget"""
+        nbytes = int(df.memory_usage(deep=True).sum())
+        if nbytes > self.max_bytes:
+            self.logger.info(f"DataFrame for {key[0]} ({nbytes} bytes) exceeds cache budget, not cached")
+            return
+
+        with self._lock:
+            # Older versions of the same file can never be hit again
+            for stale_key in [k for k in self._entries if k[0] == key[0] and k != key]:
+                self._remove(stale_key)
+
+            if key in self._entries:
+                self._remove(key)
+
+            self._entries[key] = (df, nbytes)
+            self.current_bytes += nbytes
+
+            while self.current_bytes > self.max_bytes and self._entries:
+                oldest_key = next(iter(self._entries))
+                self._remove(oldest_key)
+                self.evictions += 1
+
+    def get_or_load(self, filepath, loader):
+        """Return the cached DataFrame for filepath, calling loader(filepath) on a miss.
+
+        Concurrent misses for the same file version wait for a single load instead of
+        parsing the file several times. Cached frames are shared between requests, so
+        callers must not modify them in place.
+        """
+        key = self.make_key(filepath)
+        df = self.get(key)
+        if df is not None:
+            return df
+
+        with self._lock:
+            load_lock = self._load_locks.setdefault(key, threading.Lock())
+
+        with load_lock:
+            # Another request may have finished loading while we waited
+            with self._lock:
+                entry = self._entries.get(key)
+            if entry is not None:
+                return entry[0]
+
+            df = loader(filepath)
+            if df is not None:
+                self.put(key, df)
+
+        with self._lock:
+            self._load_locks.pop(key, None)
+
+        return df
+
+    def invalidate(self, filepath):
+        """Drop every cached version of a file"""
+        path = os.path.abspath(filepath)
+        with self._lock:
+            for key in [k for k in self._entries if k[0] == path]:
+                self._remove(key)
+
+    def clear(self):
+        """Drop all cached entries"""
+        with self._lock:
+            self._entries.clear()
+            self.current_bytes = 0
+
+    def stats(self):
+        """Return cache counters and memory usage"""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'entries': len(self._entries),
+                'current_bytes': self.current_bytes,
+                'max_bytes': self.max_bytes,
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'hit_ratio': round(self.hits / lookups, 4) if lookups else 0.0
+            }
+
+    def _remove(self, key):
+        """Remove an entry; caller must hold the lock"""
+        _, nbytes = self._entries.pop(key)
+        self.current_bytes -= nbytes
+
+# Shared by every DataProcessor in this worker process
+dataframe_cache = DataFrameCache()
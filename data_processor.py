@@ -1,41 +1,80 @@
 import pandas as pd
 import numpy as np
-from sklearn.ensemble import IsolationForest
 import logging
+from data_cache import dataframe_cache
+from columnar_store import columnar_store
+from csv_sniffer import csv_sniffer
+from file_metadata import file_metadata
+from csv_index import csv_row_index
+from ingestion import DataIngestor, CHUNK_ROWS
+from streaming_stats import DatasetStatistics
+from analytics_cache import analytics_cache
+from type_inference import type_inference
+from xlsx_writer import write_xlsx
+from outlier_engine import outlier_engine, iqr_bounds
 
 class DataProcessor:
     """Handle data loading, cleaning, and analysis operations"""
     
+    # Most rows held in memory for one dataset; larger datasets stay complete on disk
+    max_in_memory_rows = 1000000
+    
     def __init__(self):
         self.logger = logging.getLogger(__name__)
     
-    def load_data(self, filepath):
-        """Load data from CSV or Excel file"""
+    def load_data(self, filepath, columns=None, rows=None, use_cache=True):
+        """Load data from CSV or Excel file, reusing the shared parsed-DataFrame cache.
+        
+        columns restricts the load to a subset of columns and rows=(offset, limit)
+        to a window of rows. Both are pushed down to the reader, so a preview page
+        or a single chart only parses what it needs.
+        """
         try:
-            if filepath.endswith('.csv'):
-                # Try different encodings
-                encodings = ['utf-8', 'latin-1', 'iso-8859-1', 'cp1252']
-                for encoding in encodings:
-                    try:
-                        df = pd.read_csv(filepath, encoding=encoding)
-                        break
-                    except UnicodeDecodeError:
-                        continue
-                else:
-                    self.logger.error(f"Could not decode CSV file with any encoding")
-                    return None
+            if columns is None and rows is None:
+                if use_cache:
+                    return dataframe_cache.get_or_load(filepath, self._read_file)
+                return self._read_file(filepath)
+            
+            # A frame that is already in memory is cheaper to slice than re-reading,
+            # as long as the in-memory budget did not cut off the rows asked for
+            df = dataframe_cache.peek(filepath) if use_cache else None
+            complete = df is not None and len(df) < self.max_in_memory_rows
+            if df is not None and (complete or (rows is not None and sum(rows) <= len(df))):
+                if columns is not None:
+                    df = df[columns]
+                if rows is not None:
+                    offset, limit = rows
+                    df = df.iloc[offset:offset + limit]
+                return df
+            
+            return self._read_window(filepath, columns, rows)
+        except Exception as e:
+            self.logger.error(f"Error loading data: {str(e)}")
+            return None
+    
+    def _read_file(self, filepath):
+        """Load the in-memory view of a dataset, preferring its columnar copy.
+        
+        At most max_in_memory_rows rows are loaded. Larger datasets stay complete in
+        the columnar store and are reached through row windows, the stored profile
+        and load_all.
+        """
+        try:
+            max_rows = self.max_in_memory_rows
+            if columnar_store.is_columnar(filepath) or columnar_store.has_fresh_copy(filepath):
+                df = columnar_store.read(filepath, rows=(0, max_rows))
             else:
-                df = pd.read_excel(filepath)
+                df = self._parse_source(filepath, nrows=max_rows)
+                if df is None:
+                    return None
             
             # Basic validation
             if df.empty:
                 self.logger.error("Loaded dataframe is empty")
                 return None
             
-            # Limit to reasonable size for demo (adjust as needed)
-            if len(df) > 100000:
-                self.logger.warning(f"Large dataset ({len(df)} rows), taking first 100,000 rows")
-                df = df.head(100000)
+            if len(df) >= max_rows:
+                self.logger.warning(f"Dataset reaches the in-memory budget, holding the first {max_rows:,} rows in memory")
             
             return df
             
@@ -43,6 +82,269 @@ class DataProcessor:
             self.logger.error(f"Error loading data: {str(e)}")
             return None
     
+    def load_all(self, filepath):
+        """Load every row of a dataset, ignoring the in-memory budget.
+        
+        Used where dropping rows would lose data, such as saving cleaned data
+        or exporting.
+        """
+        profile = self.get_profile(filepath)
+        total_rows = profile.get('shape', [0])[0]
+        if total_rows > self.max_in_memory_rows:
+            return self.load_data(filepath, rows=(0, total_rows), use_cache=False)
+        return self.load_data(filepath)
+    
+    def iter_chunks(self, filepath, chunk_rows=CHUNK_ROWS):
+        """Yield every row of a dataset in consecutive chunks of at most chunk_rows rows.
+        
+        Each chunk is read as a row window, so memory use stays bounded by the
+        chunk size rather than the dataset.
+        """
+        total_rows = self.get_profile(filepath).get('shape', [0])[0]
+        for offset in range(0, total_rows, chunk_rows):
+            chunk = self.load_data(filepath, rows=(offset, chunk_rows))
+            if chunk is None:
+                raise ValueError('Error loading data file.')
+            yield chunk
+    
+    def _parse_source(self, filepath, nrows=None):
+        """Parse the raw CSV or Excel file"""
+        if filepath.endswith('.csv'):
+            dialect = self._get_csv_dialect(filepath)
+            options = self._get_csv_read_options(filepath)
+            try:
+                return pd.read_csv(filepath, nrows=nrows, **dialect, **options)
+            except UnicodeDecodeError:
+                dialect = self._fall_back_to_latin1(filepath, dialect)
+                return pd.read_csv(filepath, nrows=nrows, **dialect, **options)
+        return pd.read_excel(filepath, nrows=nrows)
+    
+    def _fall_back_to_latin1(self, filepath, dialect):
+        """Switch a CSV dialect to Latin-1 after a decoding failure past the sniffed sample.
+        
+        Latin-1 maps every byte, so the second parse cannot fail on decoding.
+        """
+        self.logger.warning(f"{dialect['encoding']} decoding failed past the sniffed sample, using latin-1")
+        dialect = dict(dialect, encoding='latin-1')
+        file_metadata.update(filepath, csv_dialect=dialect)
+        return dialect
+    
+    def _get_csv_read_options(self, filepath, columns=None):
+        """read_csv dtype/date options from the schema stored when the file was saved"""
+        schema = file_metadata.load(filepath).get('schema')
+        return type_inference.csv_read_options(schema, columns) if schema else {}
+    
+    def _get_csv_dialect(self, filepath):
+        """Return the CSV dialect cached in the file's metadata, sniffing it on first use"""
+        dialect = file_metadata.load(filepath).get('csv_dialect')
+        if dialect is None:
+            dialect = csv_sniffer.sniff(filepath)
+            file_metadata.update(filepath, csv_dialect=dialect)
+        return dict(dialect)
+    
+    def _read_window(self, filepath, columns, rows):
+        """Read a column subset and/or row window straight from disk"""
+        if columnar_store.is_columnar(filepath) or columnar_store.has_fresh_copy(filepath):
+            return columnar_store.read(filepath, columns=columns, rows=rows)
+        
+        if filepath.endswith('.csv'):
+            return self._read_csv_window(filepath, columns, rows)
+        
+        if rows is None:
+            return pd.read_excel(filepath, usecols=columns)
+        offset, limit = rows
+        df = pd.read_excel(filepath, usecols=columns, skiprows=range(1, offset + 1), nrows=limit)
+        df.index = pd.RangeIndex(offset, offset + len(df))
+        return df
+    
+    def _read_csv_window(self, filepath, columns, rows):
+        """Read a CSV row window by seeking to the nearest indexed byte offset"""
+        dialect = self._get_csv_dialect(filepath)
+        options = self._get_csv_read_options(filepath, columns)
+        if rows is None:
+            return pd.read_csv(filepath, usecols=columns, **dialect, **options)
+        
+        offset, limit = rows
+        index = self._get_csv_row_index(filepath, dialect)
+        if index:
+            names = pd.read_csv(filepath, nrows=0, **dialect).columns if dialect['header'] == 0 else None
+            start, skip = csv_row_index.locate(index, offset)
+            with open(filepath, 'rb') as f:
+                f.seek(start)
+                window_dialect = dict(dialect, header=None)
+                if window_dialect['encoding'] == 'utf-8-sig' and start > 0:
+                    window_dialect['encoding'] = 'utf-8'
+                df = pd.read_csv(f, names=names, usecols=columns, skiprows=skip, nrows=limit,
+                                 **window_dialect, **options)
+        else:
+            header_rows = 1 if dialect['header'] == 0 else 0
+            df = pd.read_csv(filepath, usecols=columns, skiprows=range(header_rows, header_rows + offset),
+                             nrows=limit, **dialect, **options)
+        
+        df.index = pd.RangeIndex(offset, offset + len(df))
+        return df
+    
+    def _get_csv_row_index(self, filepath, dialect):
+        """Return the CSV row offset index cached in the file's metadata, building it on first use"""
+        metadata = file_metadata.load(filepath)
+        if 'row_index' not in metadata:
+            index = csv_row_index.build(filepath, dialect)
+            if index is not None and not index['offsets']:
+                index = None
+            file_metadata.update(filepath, row_index=index)
+            return index
+        return metadata['row_index']
+    
+    def get_profile(self, filepath):
+        """Return a JSON-safe summary of the dataset, cached in the file's metadata.
+        
+        Routes that only need a page of rows use this instead of loading the whole
+        frame just to count rows and missing values.
+        """
+        try:
+            profile = file_metadata.load(filepath).get('profile')
+            if profile is not None:
+                return profile
+            
+            df = self.load_data(filepath)
+            if df is None:
+                return {}
+            
+            info = self.get_data_info(df)
+            profile = {
+                'shape': [int(n) for n in info['shape']],
+                'columns': [str(col) for col in info['columns']],
+                'dtypes': {str(col): str(dtype) for col, dtype in info['dtypes'].items()},
+                'memory_usage': int(info['memory_usage']),
+                'numeric_columns': [str(col) for col in info['numeric_columns']],
+                'categorical_columns': [str(col) for col in info['categorical_columns']],
+                'missing_values': {str(col): int(count) for col, count in info['missing_values'].items()}
+            }
+            file_metadata.update(filepath, profile=profile)
+            return profile
+        except Exception as e:
+            self.logger.error(f"Error getting data profile: {str(e)}")
+            return {}
+    
+    def get_quality_profile(self, filepath):
+        """Return the analyze_data_quality summary cached in the file's metadata"""
+        try:
+            quality = file_metadata.load(filepath).get('quality')
+            if quality is not None:
+                return quality
+            
+            df = self.load_data(filepath)
+            if df is None:
+                return {}
+            
+            analysis = self.analyze_data_quality(df)
+            if not analysis:
+                return {}
+            quality = dict(analysis,
+                           duplicates=int(analysis['duplicates']),
+                           data_types={str(col): str(dtype) for col, dtype in analysis['data_types'].items()},
+                           memory_usage=int(analysis['memory_usage']))
+            file_metadata.update(filepath, quality=quality)
+            return quality
+        except Exception as e:
+            self.logger.error(f"Error getting data quality profile: {str(e)}")
+            return {}
+    
+    def get_statistics(self, filepath):
+        """Return the streaming statistics summary of the whole dataset, cached in metadata.
+        
+        Uploads and cleaned datasets get this during ingestion, so it covers every
+        row even when only part of the dataset fits in memory.
+        """
+        try:
+            statistics = file_metadata.load(filepath).get('statistics')
+            if statistics is not None:
+                return statistics
+            
+            df = self.load_data(filepath)
+            if df is None:
+                return None
+            
+            statistics = DatasetStatistics.from_frame(df, CHUNK_ROWS).summary()
+            file_metadata.update(filepath, statistics=statistics)
+            return statistics
+        except Exception as e:
+            self.logger.error(f"Error getting dataset statistics: {str(e)}")
+            return None
+    
+    def get_ingested_profile(self, filepath):
+        """Profile stored by an earlier ingest of this file, or None if it must be ingested again"""
+        profile = file_metadata.load(filepath).get('profile')
+        if profile is None:
+            return None
+        if columnar_store.is_available() and not columnar_store.has_fresh_copy(filepath):
+            return None
+        return profile
+    
+    def ingest(self, filepath):
+        """Stream an uploaded file into the columnar store, profiling it along the way.
+        
+        CSV files are read in chunks of CHUNK_ROWS, so memory use does not grow with
+        the file size. Returns the dataset profile, or None if the file has no data.
+        """
+        try:
+            if filepath.endswith('.csv'):
+                dialect = self._get_csv_dialect(filepath)
+                options = self._get_csv_read_options(filepath)
+                try:
+                    with pd.read_csv(filepath, chunksize=CHUNK_ROWS, **dialect, **options) as reader:
+                        profile, quality, statistics = DataIngestor().ingest(filepath, reader)
+                except UnicodeDecodeError:
+                    dialect = self._fall_back_to_latin1(filepath, dialect)
+                    with pd.read_csv(filepath, chunksize=CHUNK_ROWS, **dialect, **options) as reader:
+                        profile, quality, statistics = DataIngestor().ingest(filepath, reader)
+            else:
+                # pandas has no chunked Excel reader; the store is still written in chunks
+                df = pd.read_excel(filepath)
+                profile, quality, statistics = DataIngestor().ingest(filepath, self._frame_chunks(df))
+            
+            if profile is None:
+                self.logger.error("Loaded dataframe is empty")
+                return None
+            
+            file_metadata.update(filepath, profile=profile, quality=quality, statistics=statistics)
+            return profile
+            
+        except Exception as e:
+            self.logger.error(f"Error ingesting {filepath}: {str(e)}")
+            return None
+    
+    @staticmethod
+    def _frame_chunks(df):
+        """Yield consecutive row chunks of an in-memory DataFrame"""
+        for start in range(0, len(df), CHUNK_ROWS):
+            yield df.iloc[start:start + CHUNK_ROWS]
+    
+    def save_data(self, df, filepath):
+        """Save a dataset, using the columnar format when available.
+        
+        Returns the path actually written, which has the columnar extension
+        unless pyarrow is missing or the frame cannot be represented in Arrow.
+        """
+        if columnar_store.is_available():
+            columnar_path = columnar_store.columnar_path(filepath)
+            try:
+                profile, quality, statistics = DataIngestor().ingest(columnar_path, self._frame_chunks(df))
+                if profile is not None:
+                    file_metadata.update(columnar_path, profile=profile, quality=quality,
+                                         statistics=statistics)
+                    return columnar_path
+            except Exception as e:
+                self.logger.warning(f"Could not write columnar copy of {filepath}: {str(e)}")
+        
+        if filepath.endswith('.csv'):
+            df.to_csv(filepath, index=False)
+            # CSV loses dtypes; later reads restore them from the stored schema
+            file_metadata.update(filepath, schema=type_inference.schema_from_frame(df))
+        else:
+            write_xlsx(self._frame_chunks(df), filepath)
+        return filepath
+    
     def get_data_info(self, df):
         """Get basic information about the dataset"""
         try:
@@ -60,43 +362,50 @@ class DataProcessor:
             self.logger.error(f"Error getting data info: {str(e)}")
             return {}
     
-    def analyze_data_quality(self, df):
-        """Analyze data quality issues"""
+    def analyze_data_quality(self, df, shared=None):
+        """Analyze data quality issues.
+        
+        shared takes the intermediates from _shared_intermediates so callers that
+        already computed them do not scan the frame again.
+        """
         try:
+            if shared is None:
+                shared = self._shared_intermediates(df)
+            
             analysis = {
                 'total_rows': len(df),
                 'total_columns': len(df.columns),
                 'missing_values': {},
-                'duplicates': df.duplicated().sum(),
+                'duplicates': shared['duplicate_mask'].sum(),
                 'data_types': df.dtypes.to_dict(),
                 'outliers': {},
+                'outlier_bounds': {},
                 'memory_usage': df.memory_usage(deep=True).sum()
             }
             
             # Analyze missing values
-            for col in df.columns:
-                missing_count = df[col].isnull().sum()
-                if missing_count > 0:
-                    analysis['missing_values'][col] = {
-                        'count': int(missing_count),
-                        'percentage': round((missing_count / len(df)) * 100, 2)
-                    }
+            missing = shared['null_counts']
+            missing = missing[missing > 0]
+            percentages = (missing / len(df) * 100).round(2)
+            for col, missing_count, percentage in zip(missing.index, missing, percentages):
+                analysis['missing_values'][col] = {
+                    'count': int(missing_count),
+                    'percentage': percentage
+                }
             
             # Analyze outliers for numeric columns
-            numeric_cols = df.select_dtypes(include=[np.number]).columns
-            for col in numeric_cols:
-                try:
-                    if df[col].notna().sum() > 10:  # Need at least 10 non-null values
-                        Q1 = df[col].quantile(0.25)
-                        Q3 = df[col].quantile(0.75)
-                        IQR = Q3 - Q1
-                        lower_bound = Q1 - 1.5 * IQR
-                        upper_bound = Q3 + 1.5 * IQR
-                        outliers = df[(df[col] < lower_bound) | (df[col] > upper_bound)][col]
-                        if len(outliers) > 0:
-                            analysis['outliers'][col] = int(len(outliers))
-                except Exception:
-                    continue
+            numeric_df = df[shared['numeric_columns']]
+            numeric_df = numeric_df.loc[:, numeric_df.notna().sum() > 10]  # Need at least 10 non-null values
+            if not numeric_df.empty:
+                lower_bounds, upper_bounds = iqr_bounds(numeric_df)
+                values = numeric_df.to_numpy(dtype=float, na_value=np.nan)
+                # Bounds broadcast across rows; NaN compares False on both sides
+                outlier_counts = np.count_nonzero((values < lower_bounds) | (values > upper_bounds), axis=0)
+                for col, count, lower, upper in zip(numeric_df.columns, outlier_counts, lower_bounds, upper_bounds):
+                    if count > 0:
+                        analysis['outliers'][col] = int(count)
+                    # Kept so IQR outlier removal uses the fences these counts came from
+                    analysis['outlier_bounds'][str(col)] = [float(lower), float(upper)]
             
             return analysis
             
@@ -104,10 +413,12 @@ class DataProcessor:
             self.logger.error(f"Error analyzing data quality: {str(e)}")
             return {}
     
-    def clean_data(self, df, operations):
-        """Apply data cleaning operations"""
+    def clean_data(self, df, operations, filepath=None):
+        """Apply data cleaning operations; filepath identifies the source dataset"""
         try:
-            cleaned_df = df.copy()
+            # Shallow copy: filled columns are replaced one by one and df itself,
+            # which may be shared through the DataFrame cache, is never modified
+            cleaned_df = df.copy(deep=False)
             
             # Remove duplicates
             if operations.get('remove_duplicates', False):
@@ -119,36 +430,51 @@ class DataProcessor:
             missing_strategy = operations.get('handle_missing', 'drop')
             if missing_strategy == 'drop':
                 cleaned_df = cleaned_df.dropna()
-            elif missing_strategy == 'fill_mean':
-                numeric_cols = cleaned_df.select_dtypes(include=[np.number]).columns
-                for col in numeric_cols:
-                    cleaned_df.loc[:, col] = cleaned_df[col].fillna(cleaned_df[col].mean())
-            elif missing_strategy == 'fill_median':
-                numeric_cols = cleaned_df.select_dtypes(include=[np.number]).columns
-                for col in numeric_cols:
-                    cleaned_df.loc[:, col] = cleaned_df[col].fillna(cleaned_df[col].median())
-            elif missing_strategy == 'fill_mode':
-                for col in cleaned_df.columns:
-                    if cleaned_df[col].mode().empty:
-                        continue
-                    mode_value = cleaned_df[col].mode()[0]
-                    cleaned_df.loc[:, col] = cleaned_df[col].fillna(mode_value)
-            
-            # Remove outliers using Isolation Forest
+            elif missing_strategy in ('fill_mean', 'fill_median', 'fill_mode'):
+                missing = cleaned_df.isna().sum()
+                if missing_strategy == 'fill_mode':
+                    fill_cols = missing[missing > 0].index
+                else:
+                    numeric_cols = cleaned_df.select_dtypes(include=[np.number]).columns
+                    fill_cols = [col for col in numeric_cols if missing[col] > 0]
+                
+                for col in fill_cols:
+                    if missing_strategy == 'fill_mean':
+                        fill_value = cleaned_df[col].mean()
+                    elif missing_strategy == 'fill_median':
+                        fill_value = cleaned_df[col].median()
+                    else:
+                        mode = cleaned_df[col].mode()
+                        if mode.empty:
+                            continue
+                        fill_value = mode.iloc[0]
+                    cleaned_df[col] = cleaned_df[col].fillna(fill_value)
+            
+            # Remove outliers (Isolation Forest by default, or IQR/MAD fences)
             if operations.get('remove_outliers', False):
-                numeric_cols = cleaned_df.select_dtypes(include=[np.number]).columns
+                numeric_cols = list(cleaned_df.select_dtypes(include=[np.number]).columns)
                 if len(numeric_cols) > 0 and len(cleaned_df) > 10:
                     try:
-                        isolation_forest = IsolationForest(contamination=0.1, random_state=42)
-                        outliers = isolation_forest.fit_predict(cleaned_df[numeric_cols].fillna(0))
-                        cleaned_df = cleaned_df[outliers == 1]
+                        # The model describes the source dataset, so it is reused across cleaning options
+                        fit_cols = [col for col in numeric_cols if col in df.columns]
+                        fit_df = df if fit_cols == numeric_cols else None
+                        method = operations.get('outlier_method', 'isolation_forest')
+                        bounds = None
+                        if method == 'iqr' and filepath is not None:
+                            # The fences behind the outlier counts shown for the source dataset
+                            bounds = self.get_quality_profile(filepath).get('outlier_bounds')
+                        inliers = outlier_engine.inlier_mask(cleaned_df, numeric_cols, method,
+                                                             fit_df=fit_df,
+                                                             filepath=filepath if fit_df is not None else None,
+                                                             bounds=bounds)
+                        cleaned_df = cleaned_df[inliers]
                         self.logger.info(f"Removed outliers, rows remaining: {len(cleaned_df)}")
                     except Exception as e:
                         self.logger.warning(f"Could not remove outliers: {str(e)}")
             
             # Correct data types
             if operations.get('correct_dtypes', False):
-                cleaned_df = self._correct_data_types(cleaned_df)
+                cleaned_df = self._correct_data_types(cleaned_df, filepath)
             
             # Check if cleaning resulted in empty dataframe
             if cleaned_df.empty:
@@ -161,72 +487,110 @@ class DataProcessor:
             self.logger.error(f"Error cleaning data: {str(e)}")
             return None
     
-    def _correct_data_types(self, df):
-        """Attempt to correct data types automatically"""
+    def _correct_data_types(self, df, filepath=None):
+        """Attempt to correct data types automatically.
+        
+        Types are decided on a sample and text columns are converted in parallel.
+        With filepath, the inferred schema is kept in the dataset's metadata so
+        cleaning the same dataset again skips inference.
+        """
         try:
-            corrected_df = df.copy()
-            
-            for col in corrected_df.columns:
-                # Try to convert to numeric if possible
-                if corrected_df[col].dtype == 'object':
-                    try:
-                        # Check if it's mostly numeric
-                        numeric_converted = pd.to_numeric(corrected_df[col], errors='coerce')
-                        if len(corrected_df[col]) > 0 and numeric_converted.notna().sum() / len(corrected_df[col]) > 0.8:
-                            corrected_df[col] = numeric_converted
-                            continue
-                    except Exception:
-                        pass
-                    
-                    # Try to convert to datetime
-                    try:
-                        datetime_converted = pd.to_datetime(corrected_df[col], errors='coerce')
-                        if len(corrected_df[col]) > 0 and datetime_converted.notna().sum() / len(corrected_df[col]) > 0.8:
-                            corrected_df[col] = datetime_converted
-                            continue
-                    except Exception:
-                        pass
-            
+            schema = file_metadata.load(filepath).get('type_schema') if filepath else None
+            corrected_df, schema = type_inference.correct(df, schema)
+            if filepath:
+                file_metadata.update(filepath, type_schema=schema)
             return corrected_df
             
         except Exception as e:
             self.logger.error(f"Error correcting data types: {str(e)}")
             return df
     
-    def get_analytics(self, df):
-        """Generate comprehensive analytics for the dataset"""
+    def get_analytics(self, df, statistics=None, filepath=None):
+        """Generate comprehensive analytics for the dataset.
+        
+        With filepath, results are read from and written to the on-disk analytics
+        cache for that file's contents, and statistics default to the file's
+        streaming summary (see get_statistics). Without either, statistics are
+        computed from df in a single pass.
+        """
         try:
+            if filepath is not None:
+                cached = analytics_cache.get(filepath)
+                if cached is not None:
+                    return cached
+                if statistics is None:
+                    statistics = self.get_statistics(filepath)
+            if statistics is None:
+                statistics = DatasetStatistics.from_frame(df, CHUNK_ROWS).summary()
+            
+            shared = self._shared_intermediates(df)
             analytics = {
-                'descriptive': self._get_descriptive_analytics(df),
-                'diagnostic': self._get_diagnostic_analytics(df),
-                'predictive': self._get_predictive_analytics(df),
-                'prescriptive': self._get_prescriptive_analytics(df)
+                'descriptive': self._get_descriptive_analytics(df, statistics, shared),
+                'diagnostic': self._get_diagnostic_analytics(df, statistics, shared),
+                'predictive': self._get_predictive_analytics(df, shared),
+                'prescriptive': self._get_prescriptive_analytics(df, shared)
             }
+            
+            if filepath is not None:
+                analytics_cache.put(filepath, analytics)
             return analytics
             
         except Exception as e:
             self.logger.error(f"Error generating analytics: {str(e)}")
             return {}
     
-    def _get_descriptive_analytics(self, df):
+    @staticmethod
+    def _shared_intermediates(df):
+        """Whole-frame scans reused by the quality report and every analytics section"""
+        return {
+            'duplicate_mask': df.duplicated(),
+            'null_counts': df.isna().sum(),
+            'numeric_columns': df.select_dtypes(include=[np.number]).columns,
+            'categorical_columns': df.select_dtypes(include=['object']).columns
+        }
+    
+    @staticmethod
+    def _stat_value(value):
+        """Turn a stored statistic back into a float, with None as NaN like pandas"""
+        return float('nan') if value is None else value
+    
+    def _get_descriptive_analytics(self, df, statistics, shared):
         """Get descriptive statistics"""
         try:
+            numeric_cols = shared['numeric_columns']
+            categorical_cols = shared['categorical_columns']
+            numeric_stats = statistics['numeric']
+            
+            basic_stats = {}
+            if not df.empty:
+                if len(numeric_cols) > 0:
+                    basic_stats = {
+                        col: {stat: self._stat_value(value) for stat, value in numeric_stats[str(col)].items()
+                              if stat != 'skewness'}
+                        for col in numeric_cols if str(col) in numeric_stats
+                    }
+                else:
+                    basic_stats = {col: {'count': int(df[col].count())} for col in df.columns}
+            
             desc = {
-                'basic_stats': df.describe().to_dict() if not df.empty else {},
+                'basic_stats': basic_stats,
                 'correlation_matrix': {},
                 'data_profile': {
-                    'total_rows': len(df),
+                    'total_rows': statistics['rows'],
                     'total_columns': len(df.columns),
-                    'numeric_columns': len(df.select_dtypes(include=[np.number]).columns),
-                    'categorical_columns': len(df.select_dtypes(include=['object']).columns),
-                    'missing_values_total': int(df.isnull().sum().sum())
+                    'numeric_columns': len(numeric_cols),
+                    'categorical_columns': len(categorical_cols),
+                    'missing_values_total': statistics['missing_total']
                 }
             }
             
             # Correlation matrix for numeric columns
-            numeric_df = df.select_dtypes(include=[np.number])
-            if len(numeric_df.columns) > 1:
-                desc['correlation_matrix'] = numeric_df.corr().to_dict()
+            correlation = statistics['correlation']
+            if len(numeric_cols) > 1 and correlation:
+                desc['correlation_matrix'] = {
+                    col_j: {col_i: self._stat_value(correlation[str(col_j)][str(col_i)]) for col_i in numeric_cols}
+                    for col_j in numeric_cols
+                }
             
             return desc
             
@@ -234,7 +598,7 @@ class DataProcessor:
             self.logger.error(f"Error in descriptive analytics: {str(e)}")
             return {}
     
-    def _get_diagnostic_analytics(self, df):
+    def _get_diagnostic_analytics(self, df, statistics, shared):
         """Get diagnostic analytics"""
         try:
             diag = {
@@ -244,20 +608,22 @@ class DataProcessor:
             }
             
             # Value counts for categorical columns (top 10)
-            categorical_cols = df.select_dtypes(include=['object']).columns
+            categorical_cols = shared['categorical_columns']
             for col in categorical_cols[:5]:  # Limit to first 5 categorical columns
-                if df[col].notna().sum() > 0:
-                    diag['value_counts'][col] = df[col].value_counts().head(10).to_dict()
+                counts = statistics['value_counts'].get(str(col))
+                if counts:
+                    diag['value_counts'][col] = counts
             
             # Distribution analysis for numeric columns
-            numeric_cols = df.select_dtypes(include=[np.number]).columns
+            numeric_cols = shared['numeric_columns']
             for col in numeric_cols[:5]:  # Limit to first 5 numeric columns
-                if df[col].notna().sum() > 0:
+                stats = statistics['numeric'].get(str(col))
+                if stats and stats['count'] > 0:
                     diag['distribution_analysis'][col] = {
-                        'mean': float(df[col].mean()),
-                        'median': float(df[col].median()),
-                        'std': float(df[col].std()),
-                        'skewness': float(df[col].skew()) if hasattr(df[col], 'skew') else 0
+                        'mean': self._stat_value(stats['mean']),
+                        'median': self._stat_value(stats['50%']),
+                        'std': self._stat_value(stats['std']),
+                        'skewness': self._stat_value(stats['skewness'])
                     }
             
             return diag
@@ -266,7 +632,7 @@ class DataProcessor:
             self.logger.error(f"Error in diagnostic analytics: {str(e)}")
             return {}
     
-    def _get_predictive_analytics(self, df):
+    def _get_predictive_analytics(self, df, shared):
         """Get predictive analytics (simplified)"""
         try:
             pred = {
@@ -276,7 +642,7 @@ class DataProcessor:
             }
             
             # Simple trend analysis for numeric columns
-            numeric_cols = df.select_dtypes(include=[np.number]).columns
+            numeric_cols = shared['numeric_columns']
             for col in numeric_cols[:3]:  # Limit to first 3 numeric columns
                 if df[col].notna().sum() > 5:
                     values = df[col].dropna().values
@@ -293,7 +659,7 @@ class DataProcessor:
             self.logger.error(f"Error in predictive analytics: {str(e)}")
             return {}
     
-    def _get_prescriptive_analytics(self, df):
+    def _get_prescriptive_analytics(self, df, shared):
         """Get prescriptive analytics recommendations"""
         try:
             presc = {
@@ -304,7 +670,7 @@ class DataProcessor:
             
             # Calculate data quality score
             total_cells = df.shape[0] * df.shape[1]
-            missing_cells = df.isnull().sum().sum()
+            missing_cells = shared['null_counts'].sum()
             quality_score = ((total_cells - missing_cells) / total_cells) * 100 if total_cells > 0 else 0
             presc['data_quality_score'] = round(quality_score, 2)
             
@@ -312,7 +678,7 @@ class DataProcessor:
             if missing_cells > 0:
                 presc['recommendations'].append(f"Consider handling {missing_cells} missing values")
             
-            duplicates = df.duplicated().sum()
+            duplicates = shared['duplicate_mask'].sum()
             if duplicates > 0:
                 presc['recommendations'].append(f"Remove {duplicates} duplicate rows")
             
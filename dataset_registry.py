@@ -0,0 +1,146 @@
+import os
+import uuid
+import logging
+from datetime import datetime, timezone, timedelta
+from app import db
+from models import Dataset
+from analytics_cache import analytics_cache
+from columnar_store import columnar_store
+
+# Last-access times are written at most this often per dataset
+TOUCH_INTERVAL = timedelta(seconds=60)
+
+def _as_utc(moment):
+    # SQLite returns naive datetimes; they are stored in UTC
+    if moment is not None and moment.tzinfo is None:
+        return moment.replace(tzinfo=timezone.utc)
+    return moment
+
+class DatasetRegistry:
+    """Server-side record of every dataset version and how it was derived.
+
+    Sessions only hold a dataset id; the file, original name, schema, row count
+    and content hash are one primary-key lookup away. The content hash doubles
+    as the version key of the analytics, chart and export caches.
+    """
+
+    # Directory dataset files live in; set from UPLOAD_FOLDER by the app
+    upload_folder = 'uploads'
+
+    def __init__(self):
+        self.logger = logging.getLogger(__name__)
+
+    def path(self, dataset):
+        """Path of the dataset's file"""
+        return os.path.join(self.upload_folder, dataset.filename)
+
+    def get(self, dataset_id):
+        """Return the dataset with this id, or None"""
+        if not dataset_id:
+            return None
+        return db.session.get(Dataset, dataset_id)
+
+    def register(self, filename, original_filename, parent=None, operation=None, profile=None):
+        """Record a dataset file, returning its entry.
+
+        A file already registered under the same original name (a re-upload, or
+        cleaning steps applied again or undone) keeps its existing entry.
+        """
+        path = os.path.join(self.upload_folder, filename)
+        existing = Dataset.query.filter_by(filename=filename, original_filename=original_filename).first()
+        if existing is not None:
+            content_hash = analytics_cache.content_hash(path)
+            if content_hash != existing.content_hash:
+                # The file was rebuilt with different bytes; caches key off the new hash
+                existing.content_hash = content_hash
+                existing.size_bytes = os.path.getsize(path)
+                existing.storage_format = self.storage_format(path)
+            if profile is not None:
+                self._apply_profile(existing, profile)
+            self.touch(existing, force=True)
+            return existing
+
+        dataset = Dataset(
+            id=uuid.uuid4().hex,
+            filename=filename,
+            original_filename=original_filename,
+            content_hash=analytics_cache.content_hash(path),
+            storage_format=self.storage_format(path),
+            size_bytes=os.path.getsize(path),
+            version=parent.version + 1 if parent is not None else 1,
+            parent_id=parent.id if parent is not None else None,
+            operation=operation
+        )
+        if profile is not None:
+            self._apply_profile(dataset, profile)
+        db.session.add(dataset)
+        db.session.commit()
+        self.logger.info(f"Registered dataset {dataset.id} ({filename}, version {dataset.version})")
+        return dataset
+
+    def update_profile(self, dataset, profile):
+        """Fill in the schema and row count once a dataset has been profiled"""
+        self._apply_profile(dataset, profile)
+        db.session.commit()
+
+    @staticmethod
+    def _apply_profile(dataset, profile):
+        rows, cols = profile['shape']
+        dataset.row_count = rows
+        dataset.column_count = cols
+        dataset.schema = {col: profile['dtypes'].get(col) for col in profile['columns']}
+
+    @staticmethod
+    def storage_format(path):
+        """Format the dataset is read from: its columnar copy when there is one"""
+        if columnar_store.is_columnar(path) or columnar_store.has_fresh_copy(path):
+            return 'feather'
+        return os.path.splitext(path)[1].lstrip('.').lower()
+
+    def touch(self, dataset, force=False):
+        """Record that the dataset was used, at most once per TOUCH_INTERVAL"""
+        now = datetime.now(timezone.utc)
+        last = _as_utc(dataset.last_accessed_at)
+        if force or last is None or now - last >= TOUCH_INTERVAL:
+            dataset.last_accessed_at = now
+            db.session.commit()
+
+    def lineage(self, dataset):
+        """The dataset's ancestors and itself, from the original upload to this version"""
+        chain = []
+        while dataset is not None:
+            chain.append(dataset)
+            dataset = dataset.parent
+        return chain[::-1]
+
+    def used_since(self, since):
+        """Datasets a session has used at or after the given UTC datetime"""
+        return [dataset for dataset in Dataset.query.all() if _as_utc(dataset.last_accessed_at) >= since]
+
+    def last_used(self):
+        """Latest use of each registered file, as {filename: UTC datetime}"""
+        used = {}
+        for filename, accessed in db.session.query(Dataset.filename, Dataset.last_accessed_at):
+            accessed = _as_utc(accessed)
+            if filename not in used or accessed > used[filename]:
+                used[filename] = accessed
+        return used
+
+    def prune(self):
+        """Drop entries whose file is gone and that no other version derives from; returns how many"""
+        removed = 0
+        while True:
+            parents = db.session.query(Dataset.parent_id).filter(Dataset.parent_id.isnot(None))
+            orphans = [dataset for dataset in Dataset.query.filter(Dataset.id.notin_(parents))
+                       if not os.path.exists(self.path(dataset))]
+            if not orphans:
+                break
+            for dataset in orphans:
+                db.session.delete(dataset)
+            db.session.commit()
+            removed += len(orphans)
+        if removed:
+            self.logger.info(f"Removed {removed} registry entries whose files were deleted")
+        return removed
+
+dataset_registry = DatasetRegistry()
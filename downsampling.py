@@ -0,0 +1,101 @@
+import numpy as np
+
+DEFAULT_POINT_BUDGET = 2000
+MINMAX_RATIO = 4  # Candidates per output point kept by the min-max pass ahead of LTTB
+
+def minmax_indices(y, n_buckets):
+    """Positions of the minimum and maximum of y in each of n_buckets equal slices.
+
+    Keeps every peak and trough, so it is a cheap, shape-preserving first pass
+    over very long series. Returns sorted positions including both ends.
+    """
+    n = len(y)
+    if n <= 2 * n_buckets:
+        return np.arange(n)
+
+    size = -(-n // n_buckets)
+    rows = -(-n // size)
+    # Padding with the last value never wins over it: argmin/argmax return the first match
+    grid = np.pad(y, (0, rows * size - n), mode='edge').reshape(rows, size)
+    offsets = np.arange(rows) * size
+    positions = np.concatenate((offsets + grid.argmin(axis=1), offsets + grid.argmax(axis=1), [0, n - 1]))
+    return np.unique(positions)
+
+def lttb_indices(x, y, n_out):
+    """Positions of n_out points chosen by Largest-Triangle-Three-Buckets.
+
+    x must be sorted. The first and last points are always kept; every bucket
+    in between contributes the point forming the largest triangle with the
+    previously chosen point and the average of the next bucket.
+    """
+    n = len(x)
+    if n_out >= n or n_out < 3:
+        return np.arange(n)
+
+    # n_out - 2 buckets over the interior points, each holding at least one point
+    edges = np.linspace(1, n - 1, n_out - 1).astype(np.int64)
+    counts = np.diff(edges)
+    mean_x = np.add.reduceat(x[:n - 1], edges[:-1]) / counts
+    mean_y = np.add.reduceat(y[:n - 1], edges[:-1]) / counts
+    # The last bucket looks ahead to the final point
+    next_x = np.append(mean_x[1:], x[n - 1])
+    next_y = np.append(mean_y[1:], y[n - 1])
+
+    selected = np.empty(n_out, dtype=np.int64)
+    selected[0] = 0
+    selected[-1] = n - 1
+    previous = 0
+    for bucket in range(n_out - 2):
+        start, stop = edges[bucket], edges[bucket + 1]
+        px, py = x[previous], y[previous]
+        area = np.abs((px - next_x[bucket]) * (y[start:stop] - py) - (px - x[start:stop]) * (next_y[bucket] - py))
+        previous = start + int(area.argmax())
+        selected[bucket + 1] = previous
+    return selected
+
+def line_indices(x, y, n_out=DEFAULT_POINT_BUDGET):
+    """Positions of at most n_out points that keep the visual shape of a line.
+
+    Very long series are first reduced to per-bucket minima and maxima, then
+    LTTB picks the final points from those candidates.
+    """
+    n = len(x)
+    if n <= n_out:
+        return np.arange(n)
+    if n > n_out * MINMAX_RATIO:
+        candidates = minmax_indices(y, n_out * MINMAX_RATIO // 2)
+        return candidates[lttb_indices(x[candidates], y[candidates], n_out)]
+    return lttb_indices(x, y, n_out)
+
+def _bin(values, bins):
+    low, high = values.min(), values.max()
+    if not high > low:
+        return np.zeros(len(values), dtype=np.int64)
+    return np.minimum(((values - low) * (bins / (high - low))).astype(np.int64), bins - 1)
+
+def grid_indices(x, y, n_out=DEFAULT_POINT_BUDGET):
+    """One point per occupied cell of a grid with at most n_out cells.
+
+    Returns (positions, counts) where counts is how many points each kept
+    point stands for, so sparse regions and outliers stay visible and density
+    can still be shown.
+    """
+    n = len(x)
+    if n <= n_out:
+        return np.arange(n), np.ones(n, dtype=np.int64)
+
+    side = max(1, int(np.sqrt(n_out)))
+    cells = _bin(x, side) * side + _bin(y, side)
+    counts = np.bincount(cells, minlength=side * side)
+    # Any member can represent its cell; a scatter assignment picks one without sorting
+    members = np.zeros(side * side, dtype=np.int64)
+    members[cells] = np.arange(n)
+    occupied = np.flatnonzero(counts)
+    order = np.argsort(members[occupied])
+    return members[occupied][order], counts[occupied][order]
+
+def even_indices(n, n_out=DEFAULT_POINT_BUDGET):
+    """At most n_out evenly spaced positions including both ends"""
+    if n <= n_out:
+        return np.arange(n)
+    return np.unique(np.linspace(0, n - 1, n_out).astype(np.int64))
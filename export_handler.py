@@ -1,31 +1,82 @@
 import os
+import json
+import zlib
 import pandas as pd
-from app import app
 import logging
+from ingestion import CHUNK_ROWS
+from xlsx_writer import write_xlsx
+from columnar_store import columnar_store, ColumnarWriter
+from analytics_cache import ANALYTICS_VERSION
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:  # pyarrow is optional; columnar exports are unavailable without it
+    pa = None
+    pq = None
+
+# Bump when export output changes so cached export files are rewritten
+EXPORT_VERSION = 1
+
+# Formats written chunk by chunk straight into the response, with their MIME types
+STREAMING_FORMATS = {
+    'csv': 'text/csv',
+    'ndjson': 'application/x-ndjson'
+}
+
+# Binary formats that keep column types, with their MIME types; they need pyarrow
+COLUMNAR_FORMATS = {
+    'parquet': 'application/vnd.apache.parquet',
+    'feather': 'application/vnd.apache.arrow.file',
+    'arrow': 'application/vnd.apache.arrow.file'
+}
+
+PARQUET_COMPRESSIONS = ('snappy', 'zstd', 'gzip', 'brotli', 'lz4', 'none')
+
+# Formats the summary report can be written in
+REPORT_FORMATS = ('csv', 'xlsx') + tuple(COLUMNAR_FORMATS)
+
+# Artifact variant of summary reports; they are built from the analytics, so a
+# new ANALYTICS_VERSION must not reuse reports written from the old results
+REPORT_VARIANT = f"report-a{ANALYTICS_VERSION}"
+
+# Every format /export/<format> accepts
+EXPORT_FORMATS = tuple(STREAMING_FORMATS) + ('xlsx', 'json') + tuple(COLUMNAR_FORMATS)
 
 class ExportHandler:
     """Handle data export in various formats"""
     
+    # Directory export files are written to; set from EXPORT_FOLDER by the app
+    export_folder = 'exports'
+    
+    # Codec used for Parquet exports unless another is requested; set from PARQUET_COMPRESSION
+    parquet_compression = 'snappy'
+    
     def __init__(self):
         self.logger = logging.getLogger(__name__)
     
-    def export_data(self, df, format_type, original_filename):
-        """Export dataframe in specified format"""
+    def export_data(self, df, format_type, original_filename, export_path=None, compression=None):
+        """Export dataframe in specified format, to export_path when given"""
         try:
             # Generate export filename
-            base_name = os.path.splitext(original_filename)[0]
-            export_filename = f"export_{base_name}_{format_type}.{format_type}"
-            export_path = os.path.join(app.config['EXPORT_FOLDER'], export_filename)
+            if export_path is None:
+                export_path = os.path.join(self.export_folder, self.export_filename(format_type, original_filename))
+            
+            if format_type == 'xlsx' or format_type in COLUMNAR_FORMATS:
+                return self.export_chunks(self._frame_chunks(df), format_type, export_path, compression)
             
+            # Written under a temporary name so a half-written file is never served
+            tmp_path = export_path + '.tmp'
             if format_type == 'csv':
-                df.to_csv(export_path, index=False)
-            elif format_type == 'xlsx':
-                df.to_excel(export_path, index=False, engine='openpyxl')
+                df.to_csv(tmp_path, index=False)
             elif format_type == 'json':
-                df.to_json(export_path, orient='records', indent=2)
+                df.to_json(tmp_path, orient='records', indent=2)
+            elif format_type == 'ndjson':
+                df.to_json(tmp_path, orient='records', lines=True)
             else:
                 self.logger.error(f"Unsupported export format: {format_type}")
                 return None
+            os.replace(tmp_path, export_path)
             
             self.logger.info(f"Data exported to {export_path}")
             return export_path
@@ -34,47 +85,162 @@ class ExportHandler:
             self.logger.error(f"Error exporting data: {str(e)}")
             return None
     
-    def export_summary_report(self, df, analytics, format_type, original_filename):
-        """Export a comprehensive summary report"""
+    def export_chunks(self, chunks, format_type, export_path, compression=None):
+        """Export a dataset given as row chunks; XLSX and the columnar formats are written this way"""
         try:
-            # Create summary dataframe
-            summary_data = {
-                'Metric': [
-                    'Total Rows',
-                    'Total Columns',
-                    'Missing Values',
-                    'Numeric Columns',
-                    'Categorical Columns',
-                    'Data Quality Score'
-                ],
-                'Value': [
-                    len(df),
-                    len(df.columns),
-                    int(df.isnull().sum().sum()),
-                    len(df.select_dtypes(include=['number']).columns),
-                    len(df.select_dtypes(include=['object']).columns),
-                    analytics.get('prescriptive', {}).get('data_quality_score', 'N/A')
-                ]
-            }
+            if format_type == 'xlsx':
+                write_xlsx(chunks, export_path)
+            elif format_type in COLUMNAR_FORMATS:
+                if not self.columnar_available():
+                    self.logger.error(f"Exporting {format_type} requires pyarrow")
+                    return None
+                if format_type == 'parquet':
+                    self._write_parquet(chunks, export_path, compression or self.parquet_compression)
+                else:
+                    self._write_arrow(chunks, export_path)
+            else:
+                self.logger.error(f"Unsupported chunked export format: {format_type}")
+                return None
+            self.logger.info(f"Data exported to {export_path}")
+            return export_path
+        except Exception as e:
+            self.logger.error(f"Error exporting data: {str(e)}")
+            return None
+    
+    @staticmethod
+    def columnar_available():
+        """Whether pyarrow is installed so Parquet, Feather and Arrow files can be written"""
+        return pq is not None
+    
+    def parquet_codec(self, requested=None):
+        """The Parquet codec to use: requested if it is a known one, else the default"""
+        requested = (requested or '').lower()
+        return requested if requested in PARQUET_COMPRESSIONS else self.parquet_compression
+    
+    def _write_parquet(self, chunks, path, compression):
+        """Write chunks as row groups of one Parquet file"""
+        tmp_path = path + '.tmp'
+        writer = None
+        try:
+            for chunk in chunks:
+                table = columnar_store.to_arrow(chunk)
+                if writer is None:
+                    writer = pq.ParquetWriter(tmp_path, table.schema, compression=compression)
+                elif not table.schema.equals(writer.schema, check_metadata=False):
+                    # Later chunks follow the first one's types (e.g. an all-null chunk)
+                    table = table.cast(writer.schema)
+                writer.write_table(table, row_group_size=CHUNK_ROWS)
+            if writer is None:
+                pq.write_table(pa.table({}), tmp_path, compression=compression)
+            else:
+                writer.close()
+                writer = None
+            os.replace(tmp_path, path)
+        finally:
+            if writer is not None:
+                writer.close()
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+    
+    @staticmethod
+    def _write_arrow(chunks, path):
+        """Write chunks as record batches of one Arrow IPC file, which is also Feather v2"""
+        writer = ColumnarWriter(columnar_store, path)
+        try:
+            for chunk in chunks:
+                writer.write(chunk)
+            if writer.close() is None:
+                # No rows: still leave a readable, empty file
+                pa.ipc.new_file(path, pa.schema([])).close()
+        except Exception:
+            writer.abort()
+            raise
+    
+    def artifact_path(self, content_hash, format_type, variant=None):
+        """Where the export of one version of a dataset in one format (and codec) is kept"""
+        suffix = f"-{variant}" if variant else ''
+        return os.path.join(self.export_folder, f"{content_hash}-v{EXPORT_VERSION}{suffix}.{format_type}")
+    
+    def cached_artifact(self, content_hash, format_type, variant=None):
+        """Path of an export already written for this dataset version and format, or None"""
+        path = self.artifact_path(content_hash, format_type, variant)
+        try:
+            # Mark the artifact as recently used so the storage janitor evicts it last
+            os.utime(path)
+        except OSError:
+            return None
+        return path
+    
+    @staticmethod
+    def _frame_chunks(df):
+        for start in range(0, len(df), CHUNK_ROWS):
+            yield df.iloc[start:start + CHUNK_ROWS]
+    
+    def export_filename(self, format_type, original_filename, compress=False):
+        """Download name for an export of the dataset"""
+        base_name = os.path.splitext(original_filename)[0]
+        return f"export_{base_name}_{format_type}.{format_type}" + ('.gz' if compress else '')
+    
+    def stream_export(self, chunks, format_type, compress=False):
+        """Yield the encoded bytes of an export one row chunk at a time.
+        
+        Only the current chunk is serialized in memory; with compress the output
+        is gzip-compressed as it is produced.
+        """
+        compressor = zlib.compressobj(6, zlib.DEFLATED, 31) if compress else None
+        first = True
+        for chunk in chunks:
+            if format_type == 'csv':
+                text = chunk.to_csv(index=False, header=first)
+            elif format_type == 'ndjson':
+                text = ''
+                if len(chunk):
+                    text = chunk.to_json(orient='records', lines=True, date_format='iso', double_precision=15)
+            else:
+                raise ValueError(f"Unsupported streaming export format: {format_type}")
+            first = False
             
-            summary_df = pd.DataFrame(summary_data)
+            data = text.encode('utf-8')
+            if compressor is not None:
+                data = compressor.compress(data)
+            if data:
+                yield data
+        
+        if compressor is not None:
+            yield compressor.flush()
+    
+    def export_summary_report(self, analytics, statistics, format_type, original_filename, export_path=None):
+        """Export a comprehensive summary report.
+        
+        Built from the cached dashboard analytics and the dataset's streaming
+        statistics, so the data itself is not read again; every sheet is a small
+        table with one row per column, category or statistic.
+        """
+        try:
+            tables = self.summary_tables(analytics, statistics)
             
             # Generate export filename
-            base_name = os.path.splitext(original_filename)[0]
-            export_filename = f"summary_report_{base_name}.{format_type}"
-            export_path = os.path.join(app.config['EXPORT_FOLDER'], export_filename)
+            if export_path is None:
+                export_path = os.path.join(self.export_folder, self.report_filename(format_type, original_filename))
             
+            # Written under a temporary name so a half-written file is never served;
+            # the extension is kept because ExcelWriter picks its engine from it
+            root, extension = os.path.splitext(export_path)
+            tmp_path = f"{root}.tmp{extension}"
             if format_type == 'csv':
-                summary_df.to_csv(export_path, index=False)
+                self._write_csv_report(tables, tmp_path)
             elif format_type == 'xlsx':
-                with pd.ExcelWriter(export_path, engine='openpyxl') as writer:
-                    summary_df.to_excel(writer, sheet_name='Summary', index=False)
-                    
-                    # Add descriptive statistics if available
-                    if not df.empty:
-                        desc_stats = df.describe()
-                        if not desc_stats.empty:
-                            desc_stats.to_excel(writer, sheet_name='Descriptive_Stats')
+                with pd.ExcelWriter(tmp_path, engine='openpyxl') as writer:
+                    for sheet_name, table in tables.items():
+                        # Statistics and the correlation matrix are labelled by their index
+                        keep_index = sheet_name in ('Descriptive_Stats', 'Correlation')
+                        table.to_excel(writer, sheet_name=sheet_name, index=keep_index)
+            elif format_type in COLUMNAR_FORMATS:
+                self._write_columnar_report(tables, format_type, tmp_path)
+            else:
+                self.logger.error(f"Unsupported summary report format: {format_type}")
+                return None
+            os.replace(tmp_path, export_path)
             
             self.logger.info(f"Summary report exported to {export_path}")
             return export_path
@@ -82,3 +248,108 @@ class ExportHandler:
         except Exception as e:
             self.logger.error(f"Error exporting summary report: {str(e)}")
             return None
+    
+    def report_filename(self, format_type, original_filename):
+        """Download name for a summary report of the dataset"""
+        base_name = os.path.splitext(original_filename)[0]
+        return f"summary_report_{base_name}.{format_type}"
+    
+    @staticmethod
+    def summary_tables(analytics, statistics):
+        """The report's sheets as DataFrames keyed by sheet name"""
+        descriptive = analytics.get('descriptive', {})
+        profile = descriptive.get('data_profile', {})
+        tables = {
+            'Summary': pd.DataFrame({
+                'Metric': [
+                    'Total Rows',
+                    'Total Columns',
+                    'Missing Values',
+                    'Numeric Columns',
+                    'Categorical Columns',
+                    'Data Quality Score'
+                ],
+                'Value': [
+                    profile.get('total_rows', statistics.get('rows', 0)),
+                    profile.get('total_columns', 0),
+                    profile.get('missing_values_total', statistics.get('missing_total', 0)),
+                    profile.get('numeric_columns', 0),
+                    profile.get('categorical_columns', 0),
+                    analytics.get('prescriptive', {}).get('data_quality_score', 'N/A')
+                ]
+            }, dtype=object)
+        }
+        
+        basic_stats = descriptive.get('basic_stats', {})
+        if basic_stats:
+            tables['Descriptive_Stats'] = pd.DataFrame(basic_stats)
+        
+        correlation = descriptive.get('correlation_matrix', {})
+        if correlation:
+            tables['Correlation'] = pd.DataFrame(correlation, dtype='float64')
+        
+        value_counts = [
+            (column, value, count)
+            for column, counts in statistics.get('value_counts', {}).items()
+            for value, count in counts.items()
+        ]
+        if value_counts:
+            tables['Value_Counts'] = pd.DataFrame(value_counts, columns=['Column', 'Value', 'Count'])
+        
+        rows = statistics.get('rows', 0)
+        # The fences IQR outlier removal applies, so the report matches cleaning
+        outlier_bounds = statistics.get('outlier_bounds', {})
+        outliers = []
+        for column, count in statistics.get('outliers', {}).items():
+            lower, upper = outlier_bounds.get(column, (None, None))
+            percentage = round(count / rows * 100, 2) if rows else 0.0
+            outliers.append((column, count, percentage, lower, upper))
+        if outliers:
+            tables['Outliers'] = pd.DataFrame(
+                outliers, columns=['Column', 'Outliers', 'Percentage', 'Lower Fence', 'Upper Fence'])
+        
+        return tables
+    
+    @staticmethod
+    def _write_csv_report(tables, path):
+        """Write every sheet to one CSV file, each under a title line and separated by a blank line"""
+        with open(path, 'w', newline='', encoding='utf-8') as f:
+            for i, (sheet_name, table) in enumerate(tables.items()):
+                if i:
+                    f.write('\n')
+                f.write(f"{sheet_name}\n")
+                keep_index = sheet_name in ('Descriptive_Stats', 'Correlation')
+                table.to_csv(f, index=keep_index)
+    
+    def _write_columnar_report(self, tables, format_type, path):
+        """Write the summary report as one typed table.
+        
+        A columnar file holds a single table, so the descriptive statistics
+        become the rows (one per column, float64 throughout) and the other
+        sheets are stored as JSON in the schema metadata, keyed by lower-case
+        sheet name (b'summary', b'correlation', b'value_counts', b'outliers').
+        """
+        if not self.columnar_available():
+            raise ValueError(f"Exporting {format_type} requires pyarrow")
+        
+        desc_stats = tables.get('Descriptive_Stats')
+        if desc_stats is not None:
+            stats_df = desc_stats.T.astype('float64').rename_axis('column').reset_index()
+            stats_df['column'] = stats_df['column'].astype(str)
+        else:
+            stats_df = pd.DataFrame({'column': pd.Series(dtype='str')})
+        
+        table = pa.Table.from_pandas(stats_df, preserve_index=False)
+        metadata = dict(table.schema.metadata or {})
+        summary = tables['Summary']
+        metadata[b'summary'] = json.dumps(dict(zip(summary['Metric'], summary['Value'])), default=str).encode('utf-8')
+        for sheet_name in ('Correlation', 'Value_Counts', 'Outliers'):
+            if sheet_name in tables:
+                metadata[sheet_name.lower().encode('utf-8')] = tables[sheet_name].to_json(orient='split').encode('utf-8')
+        table = table.replace_schema_metadata(metadata)
+        
+        if format_type == 'parquet':
+            pq.write_table(table, path, compression=self.parquet_compression)
+        else:
+            with pa.ipc.new_file(path, table.schema) as writer:
+                writer.write_table(table)
@@ -0,0 +1,53 @@
+import os
+import json
+import logging
+
+class FileMetadata:
+    """Small JSON metadata record stored next to a data file.
+
+    The record remembers the size and mtime of the file it describes and is
+    ignored once the file changes, so stale detection results are never reused.
+    """
+
+    def __init__(self):
+        self.logger = logging.getLogger(__name__)
+
+    @staticmethod
+    def metadata_path(filepath):
+        """Path of the metadata file for a data file"""
+        return filepath + '.meta.json'
+
+    @staticmethod
+    def _source_signature(filepath):
+        stat = os.stat(filepath)
+        return {'mtime_ns': stat.st_mtime_ns, 'size': stat.st_size}
+
+    def load(self, filepath):
+        """Return the stored metadata for a file, or an empty dict if missing or stale"""
+        try:
+            with open(self.metadata_path(filepath), 'r', encoding='utf-8') as f:
+                metadata = json.load(f)
+            if metadata.get('source') != self._source_signature(filepath):
+                return {}
+            return metadata
+        except (OSError, ValueError):
+            return {}
+
+    def update(self, filepath, **fields):
+        """Merge fields into the metadata for a file"""
+        try:
+            metadata = self.load(filepath)
+            metadata.update(fields)
+            metadata['source'] = self._source_signature(filepath)
+
+            path = self.metadata_path(filepath)
+            tmp_path = path + '.tmp'
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(metadata, f)
+            os.replace(tmp_path, path)
+            return metadata
+        except Exception as e:
+            self.logger.warning(f"Could not update metadata for {filepath}: {str(e)}")
+            return None
+
+file_metadata = FileMetadata()
@@ -0,0 +1,138 @@
+import logging
+import numpy as np
+import pandas as pd
+from columnar_store import columnar_store
+from streaming_stats import DatasetStatistics
+
+CHUNK_ROWS = 100000
+
+class ProfileAccumulator:
+    """Build the get_data_info and analyze_data_quality summaries one chunk at a time"""
+
+    def __init__(self):
+        self.rows = 0
+        self.columns = None
+        self.chunk_dtypes = {}
+        self.memory_usage = 0
+        self.missing = None
+        self._row_hashes = []
+        self.statistics = DatasetStatistics()
+
+    def update(self, chunk):
+        """Fold one chunk into the running totals"""
+        if self.columns is None:
+            self.columns = list(chunk.columns)
+            self.missing = pd.Series(0, index=chunk.columns, dtype='int64')
+
+        self.rows += len(chunk)
+        self.memory_usage += int(chunk.memory_usage(deep=True).sum())
+        self.missing = self.missing.add(chunk.isna().sum(), fill_value=0).astype('int64')
+        for col, dtype in chunk.dtypes.items():
+            self.chunk_dtypes.setdefault(col, set()).add(dtype)
+        # 8 bytes per row is enough to count duplicates across chunk boundaries
+        self._row_hashes.append(pd.util.hash_pandas_object(chunk, index=False).to_numpy())
+        self.statistics.update(chunk)
+
+    def final_dtypes(self, schema=None):
+        """Column dtypes of the whole dataset"""
+        if schema is not None:
+            dtypes = schema.empty_table().to_pandas().dtypes.to_dict()
+            # An empty table has no nulls; reading the file back turns integer
+            # columns with missing values into float64 and boolean ones into object
+            for col, dtype in dtypes.items():
+                if self.missing.get(col, 0) > 0:
+                    if pd.api.types.is_integer_dtype(dtype):
+                        dtypes[col] = np.dtype('float64')
+                    elif pd.api.types.is_bool_dtype(dtype):
+                        dtypes[col] = np.dtype('object')
+            return dtypes
+
+        dtypes = {}
+        for col in self.columns:
+            seen = list(self.chunk_dtypes[col])
+            if len(seen) == 1:
+                dtypes[col] = seen[0]
+            elif all(pd.api.types.is_numeric_dtype(dtype) for dtype in seen):
+                dtypes[col] = np.dtype('float64')
+            else:
+                dtypes[col] = np.dtype('object')
+        return dtypes
+
+    def duplicates(self):
+        """Number of rows that repeat an earlier row"""
+        if not self._row_hashes:
+            return 0
+        hashes = np.concatenate(self._row_hashes)
+        return int(len(hashes) - len(np.unique(hashes)))
+
+    def finish(self, dtypes):
+        """Return (profile, quality, statistics) dicts in the JSON-safe shape stored in file metadata"""
+        empty = pd.DataFrame({col: pd.Series(dtype=dtype) for col, dtype in dtypes.items()})
+        numeric_cols = list(empty.select_dtypes(include=[np.number]).columns)
+        categorical_cols = list(empty.select_dtypes(include=['object']).columns)
+        statistics = self.statistics.summary(numeric_columns=numeric_cols)
+
+        missing_values = {str(col): int(count) for col, count in self.missing.items()}
+        profile = {
+            'shape': [self.rows, len(self.columns)],
+            'columns': [str(col) for col in self.columns],
+            'dtypes': {str(col): str(dtype) for col, dtype in dtypes.items()},
+            'memory_usage': self.memory_usage,
+            'numeric_columns': [str(col) for col in numeric_cols],
+            'categorical_columns': [str(col) for col in categorical_cols],
+            'missing_values': missing_values
+        }
+        quality = {
+            'total_rows': self.rows,
+            'total_columns': len(self.columns),
+            'missing_values': {
+                col: {'count': count, 'percentage': round((count / self.rows) * 100, 2)}
+                for col, count in missing_values.items() if count > 0
+            },
+            'duplicates': self.duplicates(),
+            'data_types': profile['dtypes'],
+            'outliers': statistics['outliers'],
+            'outlier_bounds': statistics['outlier_bounds'],
+            'memory_usage': self.memory_usage
+        }
+        return profile, quality, statistics
+
+class DataIngestor:
+    """Stream a raw upload into the columnar store while profiling it chunk by chunk"""
+
+    def __init__(self, chunk_rows=CHUNK_ROWS):
+        self.logger = logging.getLogger(__name__)
+        self.chunk_rows = chunk_rows
+
+    def ingest(self, filepath, chunks):
+        """Consume DataFrame chunks of filepath and return (profile, quality, statistics).
+
+        The full dataset is written to the columnar store next to the file when
+        pyarrow is available; no more than one chunk is held in memory at a time.
+        Outlier counts come from the streaming quantile sketches, so the data is
+        only read once.
+        """
+        accumulator = ProfileAccumulator()
+        writer = columnar_store.open_writer(filepath)
+        try:
+            for chunk in chunks:
+                accumulator.update(chunk)
+                if writer is not None:
+                    writer.write(chunk)
+
+            if accumulator.columns is None or accumulator.rows == 0:
+                if writer is not None:
+                    writer.abort()
+                return None, None, None
+
+            schema = None
+            if writer is not None:
+                schema = writer.schema
+                writer.close()
+        except Exception:
+            if writer is not None:
+                writer.abort()
+            raise
+
+        dtypes = accumulator.final_dtypes(schema)
+        return accumulator.finish(dtypes)
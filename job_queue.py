@@ -0,0 +1,334 @@
+import os
+import json
+import time
+import uuid
+import sqlite3
+import logging
+import threading
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+
+TERMINAL_STATES = ('done', 'failed')
+
+# A running job records a heartbeat this often; one silent for STALE_AFTER is dead
+HEARTBEAT_INTERVAL = 15
+STALE_AFTER = 4 * HEARTBEAT_INTERVAL
+
+def _process_alive(pid):
+    """Whether a process with this id exists on this machine"""
+    if not pid:
+        return False
+    if os.name == 'nt':
+        # os.kill cannot probe a process on Windows
+        return True
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+class JobStore:
+    """SQLite table of background jobs shared by every web worker process"""
+
+    def __init__(self, db_path):
+        self.db_path = db_path
+        self._initialized = False
+
+    def _connect(self):
+        conn = sqlite3.connect(self.db_path, timeout=30)
+        conn.row_factory = sqlite3.Row
+        if not self._initialized:
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute('''
+                CREATE TABLE IF NOT EXISTS jobs (
+                    id TEXT PRIMARY KEY,
+                    kind TEXT NOT NULL,
+                    job_key TEXT,
+                    status TEXT NOT NULL,
+                    progress REAL NOT NULL DEFAULT 0,
+                    message TEXT,
+                    result TEXT,
+                    error TEXT,
+                    created_at REAL NOT NULL,
+                    updated_at REAL NOT NULL,
+                    owner_pid INTEGER
+                )
+            ''')
+            columns = [row['name'] for row in conn.execute('PRAGMA table_info(jobs)')]
+            if 'owner_pid' not in columns:
+                # Tables created before jobs recorded the process that submitted them
+                conn.execute('ALTER TABLE jobs ADD COLUMN owner_pid INTEGER')
+            conn.execute('CREATE INDEX IF NOT EXISTS jobs_kind_key ON jobs (kind, job_key, status)')
+            self._initialized = True
+        return conn
+
+    def create(self, kind, job_key=None):
+        """Insert a queued job and return its id"""
+        job_id = uuid.uuid4().hex
+        now = time.time()
+        conn = self._connect()
+        try:
+            with conn:
+                conn.execute(
+                    'INSERT INTO jobs (id, kind, job_key, status, progress, created_at, updated_at, owner_pid) '
+                    'VALUES (?, ?, ?, ?, 0, ?, ?, ?)',
+                    (job_id, kind, job_key, 'queued', now, now, os.getpid()))
+        finally:
+            conn.close()
+        return job_id
+
+    def find_active(self, kind, job_key):
+        """The newest queued or running job for the same work as a dict, if any"""
+        conn = self._connect()
+        try:
+            row = conn.execute(
+                "SELECT * FROM jobs WHERE kind = ? AND job_key = ? AND status IN ('queued', 'running') "
+                'ORDER BY created_at DESC LIMIT 1',
+                (kind, job_key)).fetchone()
+        finally:
+            conn.close()
+        return dict(row) if row else None
+
+    def unfinished(self):
+        """All queued and running jobs, as dicts"""
+        conn = self._connect()
+        try:
+            rows = conn.execute("SELECT * FROM jobs WHERE status IN ('queued', 'running')").fetchall()
+        finally:
+            conn.close()
+        return [dict(row) for row in rows]
+
+    def purge(self, older_than):
+        """Delete finished jobs last updated before the given timestamp; returns how many"""
+        conn = self._connect()
+        try:
+            with conn:
+                cursor = conn.execute(
+                    "DELETE FROM jobs WHERE status IN ('done', 'failed') AND updated_at < ?", (older_than,))
+        finally:
+            conn.close()
+        return cursor.rowcount
+
+    def update(self, job_id, **fields):
+        """Set status, progress, message, result or error on a job"""
+        if 'result' in fields:
+            fields['result'] = json.dumps(fields['result'])
+        fields['updated_at'] = time.time()
+        assignments = ', '.join(f'{name} = ?' for name in fields)
+        conn = self._connect()
+        try:
+            with conn:
+                conn.execute(f'UPDATE jobs SET {assignments} WHERE id = ?', (*fields.values(), job_id))
+        finally:
+            conn.close()
+
+    def get(self, job_id):
+        """Return the job as a dict, or None if it does not exist"""
+        conn = self._connect()
+        try:
+            row = conn.execute('SELECT * FROM jobs WHERE id = ?', (job_id,)).fetchone()
+        finally:
+            conn.close()
+        if row is None:
+            return None
+        job = dict(row)
+        job.pop('job_key')
+        job['result'] = json.loads(job['result']) if job['result'] else None
+        return job
+
+class JobReporter:
+    """Progress callback handed to a task running in a worker process"""
+
+    def __init__(self, store, job_id):
+        self.store = store
+        self.job_id = job_id
+
+    def __call__(self, progress, message=None):
+        self.store.update(self.job_id, progress=max(0.0, min(float(progress), 1.0)), message=message)
+
+def _heartbeat(store, job_id, stop):
+    while not stop.wait(HEARTBEAT_INTERVAL):
+        try:
+            store.update(job_id)
+        except sqlite3.Error:
+            pass
+
+def _run_job(db_path, job_id, func, args):
+    """Worker-process entry point: run func(report, *args) and record the outcome"""
+    store = JobStore(db_path)
+    store.update(job_id, status='running')
+    stop = threading.Event()
+    threading.Thread(target=_heartbeat, args=(store, job_id, stop), daemon=True).start()
+    try:
+        result = func(JobReporter(store, job_id), *args)
+        store.update(job_id, status='done', progress=1.0, result=result)
+    except Exception as e:
+        logging.getLogger(__name__).error(f"Job {job_id} failed: {str(e)}")
+        store.update(job_id, status='failed', error=str(e))
+    finally:
+        stop.set()
+
+class JobQueue:
+    """Run slow work (cleaning, analytics, exports) in a local process pool.
+
+    Job state lives in a SQLite table so any web worker can report on a job
+    that another one submitted. Tasks are module-level functions called as
+    task(report, *args) and return a JSON-serializable result.
+
+    A job whose submitting process has exited, or whose worker has stopped
+    sending heartbeats, is marked failed when it is next looked at, so a
+    restart never leaves work that can neither finish nor be submitted again.
+    Finished jobs are deleted after retention seconds.
+    """
+
+    # Seconds finished jobs are kept; set from JOB_RETENTION by the app
+    retention = 24 * 3600
+
+    def __init__(self, db_path=os.path.join('cache', 'jobs.sqlite3'), max_workers=2):
+        self.logger = logging.getLogger(__name__)
+        self.db_path = db_path
+        self.max_workers = max_workers
+        self.initializer = None
+        self.initargs = ()
+        self._store = None
+        self._pool = None
+        self._futures = {}
+        self._lock = threading.Lock()
+        self._last_purge = 0.0
+
+    @property
+    def store(self):
+        if self._store is None or self._store.db_path != self.db_path:
+            os.makedirs(os.path.dirname(self.db_path) or '.', exist_ok=True)
+            self._store = JobStore(self.db_path)
+        return self._store
+
+    def _get_pool(self):
+        if self._pool is None:
+            self._reap()
+        with self._lock:
+            if self._pool is None:
+                # Spawned workers do not inherit locks held by web server threads
+                self._pool = ProcessPoolExecutor(
+                    max_workers=self.max_workers,
+                    mp_context=multiprocessing.get_context('spawn'),
+                    initializer=self.initializer,
+                    initargs=self.initargs)
+            return self._pool
+
+    def submit(self, kind, func, *args, key=None):
+        """Queue func(report, *args) and return the job id.
+
+        When key is given and the same kind of job with that key is still queued
+        or running, its id is returned instead of starting duplicate work.
+        """
+        self._purge_finished()
+        if key is not None:
+            active = self.store.find_active(kind, key)
+            if active is not None and self._is_alive(active):
+                return active['id']
+
+        with self._lock:
+            # Registered at once so the new row is never mistaken for an orphan
+            job_id = self.store.create(kind, key)
+            self._futures[job_id] = None
+        try:
+            future = self._get_pool().submit(_run_job, self.db_path, job_id, func, args)
+        except Exception as e:
+            self.logger.error(f"Could not submit {kind} job: {str(e)}")
+            with self._lock:
+                self._futures.pop(job_id, None)
+            self.store.update(job_id, status='failed', error=str(e))
+            return job_id
+
+        with self._lock:
+            self._futures[job_id] = future
+        future.add_done_callback(lambda f: self._on_done(job_id, f))
+        return job_id
+
+    def _is_alive(self, job):
+        """Whether a queued or running job can still finish; a dead one is marked failed"""
+        if job['owner_pid'] == os.getpid():
+            # Submitted here: alive while this pool still holds its future
+            with self._lock:
+                alive = job['id'] in self._futures
+        else:
+            alive = _process_alive(job['owner_pid']) and not (
+                job['status'] == 'running' and time.time() - job['updated_at'] > STALE_AFTER)
+        if not alive:
+            self.logger.warning(f"Job {job['id']} stopped without finishing; marking it failed")
+            self.store.update(job['id'], status='failed', error='The job stopped before it finished. Please try again.')
+        return alive
+
+    def _reap(self):
+        # Jobs left unfinished by a previous run of this or another web worker
+        try:
+            for job in self.store.unfinished():
+                self._is_alive(job)
+        except sqlite3.Error as e:
+            self.logger.error(f"Error checking unfinished jobs: {str(e)}")
+
+    def _purge_finished(self):
+        now = time.time()
+        if now - self._last_purge < min(self.retention, 3600):
+            return
+        self._last_purge = now
+        try:
+            purged = self.store.purge(now - self.retention)
+            if purged:
+                self.logger.info(f"Deleted {purged} finished jobs")
+        except sqlite3.Error as e:
+            self.logger.error(f"Error deleting finished jobs: {str(e)}")
+
+    def _on_done(self, job_id, future):
+        with self._lock:
+            self._futures.pop(job_id, None)
+        error = future.exception()
+        if error is not None:
+            # The worker died before it could record the failure itself
+            self.store.update(job_id, status='failed', error=str(error) or type(error).__name__)
+
+    def get(self, job_id):
+        """Return the job's status, progress and result, or None if unknown"""
+        try:
+            job = self.store.get(job_id)
+            if job is not None and job['status'] not in TERMINAL_STATES and not self._is_alive(job):
+                job = self.store.get(job_id)
+            if job is not None:
+                job.pop('owner_pid')
+            return job
+        except sqlite3.Error as e:
+            self.logger.error(f"Error reading job {job_id}: {str(e)}")
+            return None
+
+    def wait(self, job_id, timeout):
+        """Wait up to timeout seconds for a job to finish and return its final state"""
+        deadline = time.monotonic() + timeout
+        while True:
+            job = self.get(job_id)
+            if job is None or job['status'] in TERMINAL_STATES:
+                return job
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return job
+            with self._lock:
+                future = self._futures.get(job_id)
+            if future is not None:
+                try:
+                    future.result(timeout=remaining)
+                except Exception:
+                    pass
+            else:
+                # Submitted by another web worker; poll the table
+                time.sleep(min(0.1, remaining))
+
+    def shutdown(self):
+        """Stop the worker processes"""
+        with self._lock:
+            if self._pool is not None:
+                self._pool.shutdown(wait=False, cancel_futures=True)
+                self._pool = None
+
+job_queue = JobQueue()
@@ -0,0 +1,45 @@
+from datetime import datetime, timezone
+from app import db
+
+def _now():
+    return datetime.now(timezone.utc)
+
+class Dataset(db.Model):
+    """One version of a dataset: an upload, or the result of cleaning its parent"""
+
+    __tablename__ = 'datasets'
+
+    id = db.Column(db.String(32), primary_key=True)
+    filename = db.Column(db.String(255), nullable=False, index=True)  # file under UPLOAD_FOLDER
+    original_filename = db.Column(db.String(255), nullable=False)
+    content_hash = db.Column(db.String(64), nullable=False, index=True)
+    storage_format = db.Column(db.String(16), nullable=False)  # format reads come from: feather, csv, xlsx, xls
+    size_bytes = db.Column(db.BigInteger)
+    row_count = db.Column(db.BigInteger)
+    column_count = db.Column(db.Integer)
+    schema = db.Column(db.JSON)  # column name -> dtype, in column order
+    version = db.Column(db.Integer, nullable=False, default=1)
+    parent_id = db.Column(db.String(32), db.ForeignKey('datasets.id'), index=True)
+    operation = db.Column(db.JSON)  # cleaning step that produced this version from its parent
+    created_at = db.Column(db.DateTime(timezone=True), nullable=False, default=_now)
+    last_accessed_at = db.Column(db.DateTime(timezone=True), nullable=False, default=_now)
+
+    parent = db.relationship('Dataset', remote_side=[id], backref='children')
+
+    def to_dict(self):
+        return {
+            'id': self.id,
+            'filename': self.filename,
+            'original_filename': self.original_filename,
+            'content_hash': self.content_hash,
+            'storage_format': self.storage_format,
+            'size_bytes': self.size_bytes,
+            'row_count': self.row_count,
+            'column_count': self.column_count,
+            'schema': self.schema,
+            'version': self.version,
+            'parent_id': self.parent_id,
+            'operation': self.operation,
+            'created_at': self.created_at.isoformat() if self.created_at else None,
+            'last_accessed_at': self.last_accessed_at.isoformat() if self.last_accessed_at else None
+        }
@@ -0,0 +1,175 @@
+import os
+import json
+import hashlib
+import logging
+import threading
+from collections import OrderedDict
+import joblib
+import numpy as np
+from sklearn.ensemble import IsolationForest
+from analytics_cache import analytics_cache
+
+OUTLIER_METHODS = ('isolation_forest', 'iqr', 'mad')
+FIT_SAMPLE_ROWS = 100000
+SCORE_CHUNK_ROWS = 100000
+CONTAMINATION = 0.1
+MAD_THRESHOLD = 3.5
+# Bump when the model settings change so cached models are refitted
+MODEL_VERSION = 1
+
+def iqr_bounds(numeric_df):
+    """Lower and upper 1.5 * IQR fences for every column of a numeric frame"""
+    quartiles = numeric_df.quantile([0.25, 0.75]).to_numpy(dtype=float)
+    iqr = quartiles[1] - quartiles[0]
+    return quartiles[0] - 1.5 * iqr, quartiles[1] + 1.5 * iqr
+
+class OutlierEngine:
+    """Row-level outlier detection for cleaning.
+
+    isolation_forest fits on a bounded row sample with all cores, scores the
+    data in chunks and reuses fitted models per dataset version. iqr and mad
+    are vectorized fences that need no model.
+    """
+
+    def __init__(self, cache_dir=os.path.join('cache', 'models'), fit_sample_rows=FIT_SAMPLE_ROWS,
+                 chunk_rows=SCORE_CHUNK_ROWS, n_jobs=-1, max_models=8):
+        self.logger = logging.getLogger(__name__)
+        self.cache_dir = cache_dir
+        self.fit_sample_rows = fit_sample_rows
+        self.chunk_rows = chunk_rows
+        self.n_jobs = n_jobs
+        self.max_models = max_models
+        self._models = OrderedDict()
+        self._lock = threading.Lock()
+
+    def inlier_mask(self, df, columns, method='isolation_forest', fit_df=None, filepath=None, bounds=None):
+        """Boolean array, True for rows of df to keep.
+
+        fit_df is the dataset the model describes (defaults to df); with filepath
+        the model fitted on it is cached for that file's contents. bounds maps
+        column names to stored [lower, upper] IQR fences; columns without one
+        get fences computed from df.
+        """
+        if method == 'iqr':
+            return self._iqr_mask(df, columns, bounds)
+        if method == 'mad':
+            return self._mad_mask(df, columns)
+        if method != 'isolation_forest':
+            raise ValueError(f"Unknown outlier method: {method}")
+
+        model = self._get_model(df if fit_df is None else fit_df, columns, filepath)
+        mask = np.empty(len(df), dtype=bool)
+        for start in range(0, len(df), self.chunk_rows):
+            stop = min(start + self.chunk_rows, len(df))
+            mask[start:stop] = model.predict(self._matrix(df, columns, start, stop)) == 1
+        return mask
+
+    @staticmethod
+    def _matrix(df, columns, start, stop):
+        """Float matrix for a row range with missing values as 0, copying one chunk at a time"""
+        values = df[columns].iloc[start:stop].to_numpy(dtype=float, na_value=np.nan)
+        return np.nan_to_num(values, nan=0.0, posinf=0.0, neginf=0.0)
+
+    def _get_model(self, fit_df, columns, filepath):
+        """Fitted IsolationForest from memory, disk, or a new fit"""
+        key = self._model_key(columns, filepath)
+        if key is not None:
+            with self._lock:
+                model = self._models.get(key)
+                if model is not None:
+                    self._models.move_to_end(key)
+                    return model
+            model = self._load_model(key)
+            if model is not None:
+                self._remember(key, model)
+                return model
+
+        model = self._fit(fit_df, columns)
+        if key is not None:
+            self._remember(key, model)
+            self._save_model(key, model)
+        return model
+
+    def _fit(self, fit_df, columns):
+        """Fit on at most fit_sample_rows rows drawn with a fixed seed"""
+        rows = len(fit_df)
+        if rows > self.fit_sample_rows:
+            positions = np.sort(np.random.default_rng(42).choice(rows, self.fit_sample_rows, replace=False))
+            sample = fit_df.iloc[positions]
+        else:
+            sample = fit_df
+        model = IsolationForest(contamination=CONTAMINATION, random_state=42, n_jobs=self.n_jobs)
+        model.fit(self._matrix(sample, columns, 0, len(sample)))
+        self.logger.info(f"Fitted outlier model on {len(sample)} of {rows} rows")
+        return model
+
+    def _model_key(self, columns, filepath):
+        if filepath is None:
+            return None
+        try:
+            content_hash = analytics_cache.content_hash(filepath)
+        except OSError:
+            return None
+        columns_hash = hashlib.sha256(json.dumps([str(col) for col in columns]).encode('utf-8')).hexdigest()[:16]
+        return f"{content_hash}-{columns_hash}-v{MODEL_VERSION}"
+
+    def _remember(self, key, model):
+        with self._lock:
+            self._models[key] = model
+            self._models.move_to_end(key)
+            while len(self._models) > self.max_models:
+                self._models.popitem(last=False)
+
+    def _model_path(self, key):
+        return os.path.join(self.cache_dir, f"{key}.joblib")
+
+    def _load_model(self, key):
+        try:
+            return joblib.load(self._model_path(key))
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            self.logger.warning(f"Could not load cached outlier model {key}: {str(e)}")
+            return None
+
+    def _save_model(self, key, model):
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            path = self._model_path(key)
+            tmp_path = path + '.tmp'
+            joblib.dump(model, tmp_path)
+            os.replace(tmp_path, path)
+        except Exception as e:
+            self.logger.warning(f"Could not cache outlier model {key}: {str(e)}")
+
+    @staticmethod
+    def _iqr_mask(df, columns, bounds=None):
+        """Keep rows inside the 1.5 * IQR fences of every column"""
+        numeric_df = df[columns]
+        # Fences stored as None (non-finite) are recomputed like absent ones
+        bounds = {col: fence for col, fence in (bounds or {}).items() if None not in fence}
+        missing = [col for col in columns if str(col) not in bounds]
+        if missing:
+            computed = dict(zip(missing, zip(*iqr_bounds(numeric_df[missing]))))
+        fences = [bounds[str(col)] if str(col) in bounds else computed[col] for col in columns]
+        lower_bounds = np.array([fence[0] for fence in fences], dtype=float)
+        upper_bounds = np.array([fence[1] for fence in fences], dtype=float)
+        values = numeric_df.to_numpy(dtype=float, na_value=np.nan)
+        # NaN compares False on both sides, so missing values never mark a row
+        return ~((values < lower_bounds) | (values > upper_bounds)).any(axis=1)
+
+    @staticmethod
+    def _mad_mask(df, columns):
+        """Keep rows whose modified z-score is at most MAD_THRESHOLD in every column"""
+        values = df[columns].to_numpy(dtype=float, na_value=np.nan)
+        values = values[:, ~np.isnan(values).all(axis=0)]
+        if values.shape[1] == 0:
+            return np.ones(len(df), dtype=bool)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            median = np.nanmedian(values, axis=0)
+            mad = np.nanmedian(np.abs(values - median), axis=0)
+            # Columns with no spread (MAD of 0) cannot flag anything
+            scores = np.where(mad > 0, 0.6745 * np.abs(values - median) / mad, 0.0)
+        return ~(scores > MAD_THRESHOLD).any(axis=1)
+
+outlier_engine = OutlierEngine()
@@ -0,0 +1,160 @@
+import os
+import json
+import time
+import uuid
+import hashlib
+import logging
+import threading
+from upload_store import upload_store, UPLOAD_BLOCK_SIZE
+
+class ResumableUploads:
+    """Large uploads sent as a sequence of chunks that can resume after a failure.
+
+    An upload is created with its file name and total size, then receives
+    chunks at increasing offsets; the bytes received so far live in
+    <id>.part, whose length is the offset the next chunk must start at. Each
+    chunk is streamed to disk as it arrives, so no request is held in memory,
+    and can carry a SHA-256 that is checked before it is accepted. Finishing
+    the upload moves the file into the content-addressed upload store.
+    """
+
+    # Directory partial uploads are kept in; set from RESUMABLE_UPLOAD_FOLDER by the app
+    folder = os.path.join('cache', 'uploads')
+
+    # Largest file accepted; set from MAX_UPLOAD_SIZE by the app
+    max_size = 1024 * 1024 * 1024
+
+    def __init__(self):
+        self.logger = logging.getLogger(__name__)
+        self._lock = threading.Lock()
+        self._busy = set()  # ids of uploads currently receiving a chunk
+
+    def _part_path(self, upload_id):
+        return os.path.join(self.folder, f"{upload_id}.part")
+
+    def _record_path(self, upload_id):
+        return os.path.join(self.folder, f"{upload_id}.json")
+
+    def create(self, filename, size):
+        """Start an upload of size bytes and return its status"""
+        if size <= 0:
+            raise ValueError('Upload size must be positive')
+        if size > self.max_size:
+            raise ValueError(f"File too large. Maximum size is {self.max_size // (1024 * 1024)}MB.")
+
+        os.makedirs(self.folder, exist_ok=True)
+        upload_id = uuid.uuid4().hex
+        record = {'upload_id': upload_id, 'filename': filename, 'size': size, 'created': time.time()}
+        with open(self._record_path(upload_id), 'w', encoding='utf-8') as f:
+            json.dump(record, f)
+        open(self._part_path(upload_id), 'wb').close()
+        self.logger.info(f"Started upload {upload_id} of {filename} ({size} bytes)")
+        return dict(record, offset=0)
+
+    def status(self, upload_id):
+        """Return the upload's record with the offset received so far, or None if unknown"""
+        if not upload_id.isalnum():
+            return None
+        try:
+            with open(self._record_path(upload_id), 'r', encoding='utf-8') as f:
+                record = json.load(f)
+            record['offset'] = os.path.getsize(self._part_path(upload_id))
+            return record
+        except (OSError, ValueError):
+            return None
+
+    def write_chunk(self, upload_id, offset, stream, checksum=None):
+        """Append the bytes of stream at offset, returning the new offset.
+
+        The chunk must start where the previous one ended and must not run past
+        the declared size. With checksum (hex SHA-256) a chunk that does not
+        match is discarded.
+        """
+        with self._lock:
+            if upload_id in self._busy:
+                raise ValueError('Another chunk of this upload is being received')
+            self._busy.add(upload_id)
+        try:
+            record = self.status(upload_id)
+            if record is None:
+                raise ValueError('Unknown upload')
+            if offset != record['offset']:
+                raise ValueError(f"Chunk must start at offset {record['offset']}")
+
+            digest = hashlib.sha256()
+            end = offset
+            with open(self._part_path(upload_id), 'r+b') as f:
+                f.seek(offset)
+                try:
+                    for block in iter(lambda: stream.read(UPLOAD_BLOCK_SIZE), b''):
+                        end += len(block)
+                        if end > record['size']:
+                            raise ValueError('Chunk runs past the declared upload size')
+                        digest.update(block)
+                        f.write(block)
+                    if checksum is not None and digest.hexdigest() != checksum.lower():
+                        raise ValueError('Chunk checksum mismatch')
+                except Exception:
+                    # Drop the partial chunk so the client can send it again from offset
+                    f.truncate(offset)
+                    raise
+            return end
+        finally:
+            with self._lock:
+                self._busy.discard(upload_id)
+
+    def finish(self, upload_id, checksum=None):
+        """Move a complete upload into the upload store; returns (stored filename, already stored, original name)"""
+        record = self.status(upload_id)
+        if record is None:
+            raise ValueError('Unknown upload')
+        if record['offset'] != record['size']:
+            raise ValueError(f"Upload incomplete: {record['offset']} of {record['size']} bytes received")
+
+        part_path = self._part_path(upload_id)
+        digest = hashlib.sha256()
+        with open(part_path, 'rb') as f:
+            for block in iter(lambda: f.read(UPLOAD_BLOCK_SIZE), b''):
+                digest.update(block)
+        content_hash = digest.hexdigest()
+        if checksum is not None and content_hash != checksum.lower():
+            raise ValueError('File checksum mismatch')
+
+        filename, existing = upload_store.store_file(part_path, record['filename'], content_hash)
+        self.abort(upload_id)
+        return filename, existing, record['filename']
+
+    def expire(self, older_than):
+        """Abort uploads that have received nothing since the given timestamp; returns (uploads, bytes) removed"""
+        expired, freed = 0, 0
+        try:
+            names = os.listdir(self.folder)
+        except FileNotFoundError:
+            return expired, freed
+
+        for name in names:
+            upload_id, ext = os.path.splitext(name)
+            if ext != '.json':
+                continue
+            part_path = self._part_path(upload_id)
+            try:
+                last_write = os.path.getmtime(part_path if os.path.exists(part_path) else os.path.join(self.folder, name))
+                size = os.path.getsize(part_path) if os.path.exists(part_path) else 0
+            except OSError:
+                continue
+            with self._lock:
+                if last_write >= older_than or upload_id in self._busy:
+                    continue
+                self.abort(upload_id)
+            expired += 1
+            freed += size
+            self.logger.info(f"Expired abandoned upload {upload_id}")
+        return expired, freed
+
+    def abort(self, upload_id):
+        """Discard an upload and whatever was received of it"""
+        for path in (self._part_path(upload_id), self._record_path(upload_id)):
+            if os.path.exists(path):
+                os.remove(path)
+
+resumable_uploads = ResumableUploads()
@@ -1,12 +1,73 @@
 import os
-import uuid
-from flask import render_template, request, redirect, url_for, flash, session, send_file, jsonify
-from werkzeug.utils import secure_filename
+import gzip
+import json
+import unicodedata
+from urllib.parse import quote
+from flask import render_template, request, redirect, url_for, flash, session, send_file, jsonify, Response
 import pandas as pd
 from app import app
 from data_processor import DataProcessor
 from chart_generator import ChartGenerator
-from export_handler import ExportHandler
+from export_handler import ExportHandler, STREAMING_FORMATS, COLUMNAR_FORMATS, REPORT_FORMATS, EXPORT_FORMATS, REPORT_VARIANT
+from data_cache import dataframe_cache
+from analytics_cache import analytics_cache
+from chart_cache import chart_cache
+from job_queue import job_queue, TERMINAL_STATES
+from outlier_engine import outlier_engine, OUTLIER_METHODS
+from cleaning_pipeline import cleaning_pipeline
+from upload_store import upload_store
+from dataset_registry import dataset_registry
+from resumable_upload import resumable_uploads
+from storage_janitor import storage_janitor
+import tasks
+
+try:
+    import brotli
+except ImportError:  # brotli is optional; responses fall back to gzip
+    brotli = None
+
+dataframe_cache.max_bytes = app.config['DATAFRAME_CACHE_MAX_BYTES']
+analytics_cache.cache_dir = app.config['ANALYTICS_CACHE_FOLDER']
+outlier_engine.cache_dir = app.config['MODEL_CACHE_FOLDER']
+DataProcessor.max_in_memory_rows = app.config['MAX_IN_MEMORY_ROWS']
+ExportHandler.export_folder = app.config['EXPORT_FOLDER']
+upload_store.upload_folder = app.config['UPLOAD_FOLDER']
+dataset_registry.upload_folder = app.config['UPLOAD_FOLDER']
+resumable_uploads.folder = app.config['RESUMABLE_UPLOAD_FOLDER']
+resumable_uploads.max_size = app.config['MAX_UPLOAD_SIZE']
+ExportHandler.parquet_compression = app.config['PARQUET_COMPRESSION']
+ChartGenerator.point_budget = app.config['CHART_POINT_BUDGET']
+chart_cache.max_bytes = app.config['CHART_CACHE_MAX_BYTES']
+
+storage_janitor.upload_folder = app.config['UPLOAD_FOLDER']
+storage_janitor.cache_folders = {
+    'exports': app.config['EXPORT_FOLDER'],
+    'analytics': app.config['ANALYTICS_CACHE_FOLDER'],
+    'models': app.config['MODEL_CACHE_FOLDER']
+}
+storage_janitor.quota_bytes = app.config['STORAGE_QUOTA_BYTES']
+storage_janitor.ttl = app.config['STORAGE_TTL']
+storage_janitor.active_window = app.config['STORAGE_ACTIVE_WINDOW']
+storage_janitor.grace_period = app.config['STORAGE_GRACE_PERIOD']
+storage_janitor.partial_upload_ttl = app.config['STORAGE_PARTIAL_UPLOAD_TTL']
+storage_janitor.interval = app.config['STORAGE_JANITOR_INTERVAL']
+storage_janitor.start(app)
+
+job_queue.db_path = app.config['JOB_DATABASE']
+job_queue.max_workers = app.config['JOB_WORKERS']
+job_queue.retention = app.config['JOB_RETENTION']
+job_queue.initializer = tasks.configure_worker
+job_queue.initargs = ({
+    'dataframe_cache_max_bytes': app.config['DATAFRAME_CACHE_MAX_BYTES'],
+    'analytics_cache_folder': app.config['ANALYTICS_CACHE_FOLDER'],
+    'model_cache_folder': app.config['MODEL_CACHE_FOLDER'],
+    'max_in_memory_rows': app.config['MAX_IN_MEMORY_ROWS'],
+    'export_folder': app.config['EXPORT_FOLDER'],
+    'parquet_compression': app.config['PARQUET_COMPRESSION']
+},)
+
+# Page to open once a job of each kind has finished
+JOB_NEXT_PAGES = {'clean': 'data_cleaning', 'analytics': 'dashboard', 'ingest': 'preview_data'}
 
 # Allowed file extensions
 ALLOWED_EXTENSIONS = {'csv', 'xlsx', 'xls'}
@@ -15,6 +76,119 @@ def allowed_file(filename):
     return '.' in filename and \
            filename.rsplit('.', 1)[1].lower() in ALLOWED_EXTENSIONS
 
+def wants_json():
+    """True when the client asked for JSON rather than a page"""
+    return request.accept_mimetypes.best_match(['text/html', 'application/json']) == 'application/json'
+
+def current_dataset():
+    """The session's dataset from the registry, or None when there is none or its file is gone"""
+    dataset = dataset_registry.get(session.get('dataset_id'))
+    if dataset is None and session.get('current_file'):
+        # Sessions from before the registry name the file directly
+        filename = os.path.basename(session.pop('current_file'))
+        if os.path.exists(os.path.join(app.config['UPLOAD_FOLDER'], filename)):
+            dataset = use_dataset(register_file(filename, session.pop('original_filename', filename)))
+    if dataset is None or not os.path.exists(dataset_registry.path(dataset)):
+        return None
+    if dataset.row_count is None:
+        # Registered before its ingestion job finished
+        profile = DataProcessor().get_ingested_profile(dataset_registry.path(dataset))
+        if profile is not None:
+            dataset_registry.update_profile(dataset, profile)
+    dataset_registry.touch(dataset)
+    return dataset
+
+def use_dataset(dataset):
+    """Make a registered dataset the session's current one"""
+    session['dataset_id'] = dataset.id
+    return dataset
+
+def register_file(filename, original_filename, parent=None):
+    """Register a dataset file with its profile and the cleaning step that produced it from parent"""
+    path = os.path.join(app.config['UPLOAD_FOLDER'], filename)
+    steps = cleaning_pipeline.log_for(path)[1]
+    profile = DataProcessor().get_profile(path) or None
+    return dataset_registry.register(filename, original_filename, parent=parent,
+                                     operation=steps[-1] if parent is not None and steps else None,
+                                     profile=profile)
+
+def dataset_key(filepath):
+    """Identify the current version of a dataset file for job de-duplication"""
+    return ':'.join(str(part) for part in dataframe_cache.make_key(filepath))
+
+def job_next_url(job):
+    """Where the browser goes once a job has finished"""
+    if job['kind'] == 'export':
+        return url_for('job_download', job_id=job['id'])
+    return url_for(JOB_NEXT_PAGES[job['kind']])
+
+def compressed_response(body, mimetype, status=200):
+    """Response compressed with brotli or gzip when the client accepts it"""
+    if isinstance(body, str):
+        body = body.encode('utf-8')
+    response = Response(body, status=status, mimetype=mimetype)
+    response.vary.add('Accept-Encoding')
+    if len(body) < app.config['COMPRESS_MIN_BYTES']:
+        return response
+    
+    if brotli is not None and 'br' in request.accept_encodings:
+        response.set_data(brotli.compress(body, quality=5))
+        response.content_encoding = 'br'
+    elif 'gzip' in request.accept_encodings:
+        response.set_data(gzip.compress(body, compresslevel=6))
+        response.content_encoding = 'gzip'
+    return response
+
+def chart_cache_key(dataset, *params):
+    """Chart cache key and ETag for a registered dataset version"""
+    return chart_cache.make_key(dataset.content_hash, ChartGenerator.point_budget, *params)
+
+def build_chart(filepath, chart_format, chart_type, x_column, y_column, title):
+    """Render a chart as an HTML fragment or a figure spec, loading only the plotted columns"""
+    chart_columns = [col for col in dict.fromkeys([x_column, y_column]) if col]
+    df = DataProcessor().load_data(filepath, columns=chart_columns)
+    if df is None:
+        return None
+    
+    chart_gen = ChartGenerator()
+    if chart_format == 'html':
+        return chart_gen.create_chart(df, chart_type, x_column, y_column, title)
+    return chart_gen.create_chart_spec(df, chart_type, x_column, y_column, title)
+
+def with_chart_etag(response, etag):
+    """Let the browser revalidate a chart with If-None-Match instead of refetching it"""
+    response.set_etag(etag)
+    response.headers['Cache-Control'] = 'private, no-cache'
+    return response
+
+def chart_not_modified(etag):
+    return with_chart_etag(Response(status=304), etag)
+
+def job_accepted(job_id):
+    """202 response pointing a JSON client at the job status endpoint"""
+    return jsonify({'job_id': job_id, 'status_url': url_for('job_status', job_id=job_id)}), 202
+
+@app.before_request
+def apply_finished_clean_job():
+    """Switch the session to the cleaned dataset once its cleaning job has finished"""
+    job_id = session.get('clean_job')
+    if not job_id or request.endpoint == 'static':
+        return
+    
+    job = job_queue.get(job_id)
+    if job is None:
+        session.pop('clean_job', None)
+    elif job['status'] == 'done':
+        session.pop('clean_job', None)
+        rows, cols = job['result']['shape']
+        parent = current_dataset()
+        if parent is not None:
+            use_dataset(register_file(job['result']['file'], parent.original_filename, parent))
+        flash(f'Data cleaned successfully! New dataset: {rows} rows, {cols} columns.', 'success')
+    elif job['status'] == 'failed':
+        session.pop('clean_job', None)
+        flash(f"Error cleaning data: {job['error']}", 'error')
+
 @app.route('/')
 def index():
     """Landing page with overview of features"""
@@ -37,22 +211,21 @@ def upload_file():
         
         if file and allowed_file(file.filename):
             try:
-                # Generate unique filename
-                filename = str(uuid.uuid4()) + '_' + secure_filename(file.filename)
+                # Streamed to disk while hashed; identical content is stored once
+                filename, existing = upload_store.save(file)
                 filepath = os.path.join(app.config['UPLOAD_FOLDER'], filename)
-                file.save(filepath)
-                
-                # Store file info in session
-                session['current_file'] = filename
-                session['original_filename'] = file.filename
                 
-                # Load and validate data
+                # Stream the file into the columnar store and profile it in one pass;
+                # a re-upload reuses the profile stored with the existing file
                 processor = DataProcessor()
-                df = processor.load_data(filepath)
+                profile = processor.get_ingested_profile(filepath) if existing else None
+                if profile is None:
+                    profile = processor.ingest(filepath)
                 
-                if df is not None:
-                    session['data_shape'] = df.shape
-                    flash(f'File uploaded successfully! Dataset contains {df.shape[0]} rows and {df.shape[1]} columns.', 'success')
+                if profile is not None:
+                    use_dataset(dataset_registry.register(filename, file.filename, profile=profile))
+                    rows, cols = profile['shape']
+                    flash(f'File uploaded successfully! Dataset contains {rows} rows and {cols} columns.', 'success')
                     return redirect(url_for('preview_data'))
                 else:
                     flash('Error loading file. Please check the file format.', 'error')
@@ -63,21 +236,141 @@ def upload_file():
         else:
             flash('Invalid file type. Please upload CSV or Excel files only.', 'error')
     
-    return render_template('upload.html')
+    return render_template('upload.html',
+                           max_form_upload=app.config['MAX_CONTENT_LENGTH'],
+                           max_upload_size=app.config['MAX_UPLOAD_SIZE'])
+
+@app.route('/api/uploads', methods=['POST'])
+def create_upload():
+    """Start a resumable upload from JSON {filename, size}"""
+    data = request.get_json(silent=True) or {}
+    filename = str(data.get('filename', ''))
+    if not allowed_file(filename):
+        return jsonify({'error': 'Invalid file type. Please upload CSV or Excel files only.'}), 400
+    try:
+        record = resumable_uploads.create(filename, int(data.get('size', 0)))
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    return jsonify(upload_status_payload(record)), 201
+
+@app.route('/api/uploads/<upload_id>', methods=['GET'])
+def upload_status(upload_id):
+    """Report how many bytes of an upload have been received, so a client can resume"""
+    record = resumable_uploads.status(upload_id)
+    if record is None:
+        return jsonify({'error': 'Unknown upload'}), 404
+    return jsonify(upload_status_payload(record))
+
+@app.route('/api/uploads/<upload_id>', methods=['PUT'])
+def upload_chunk(upload_id):
+    """Receive one chunk at the offset given by the Upload-Offset header.
+
+    The body is streamed to disk; an X-Chunk-SHA256 header is checked before
+    the chunk is accepted.
+    """
+    record = resumable_uploads.status(upload_id)
+    if record is None:
+        return jsonify({'error': 'Unknown upload'}), 404
+    try:
+        offset = int(request.headers.get('Upload-Offset', request.args.get('offset', '')))
+    except ValueError:
+        return jsonify({'error': 'Upload-Offset header required', 'offset': record['offset']}), 400
+    if offset != record['offset']:
+        return jsonify({'error': f"Chunk must start at offset {record['offset']}", 'offset': record['offset']}), 409
+    
+    try:
+        record['offset'] = resumable_uploads.write_chunk(upload_id, offset, request.stream,
+                                                         request.headers.get('X-Chunk-SHA256'))
+    except ValueError as e:
+        current = resumable_uploads.status(upload_id)
+        return jsonify({'error': str(e), 'offset': current['offset'] if current else None}), 400
+    return jsonify(upload_status_payload(record))
+
+@app.route('/api/uploads/<upload_id>', methods=['DELETE'])
+def cancel_upload(upload_id):
+    """Discard a resumable upload"""
+    if resumable_uploads.status(upload_id) is None:
+        return jsonify({'error': 'Unknown upload'}), 404
+    resumable_uploads.abort(upload_id)
+    return '', 204
+
+@app.route('/api/uploads/<upload_id>/complete', methods=['POST'])
+def complete_upload(upload_id):
+    """Assemble a fully received upload and ingest it like a form upload.
+
+    Accepts an optional JSON {sha256} for the whole file. Returns the dataset
+    shape and the preview URL, or a 202 with a job id while a new file is
+    ingested in the background.
+    """
+    if resumable_uploads.status(upload_id) is None:
+        return jsonify({'error': 'Unknown upload'}), 404
+    data = request.get_json(silent=True) or {}
+    try:
+        filename, existing, original_filename = resumable_uploads.finish(upload_id, data.get('sha256'))
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    
+    filepath = os.path.join(app.config['UPLOAD_FOLDER'], filename)
+    profile = DataProcessor().get_ingested_profile(filepath) if existing else None
+    # Registered now; the schema and row count are filled in once ingestion has profiled it
+    use_dataset(dataset_registry.register(filename, original_filename, profile=profile))
+    if profile is None:
+        job_id = job_queue.submit('ingest', tasks.ingest_upload, filepath, key=dataset_key(filepath))
+        return job_accepted(job_id)
+    
+    return jsonify({'file': filename, 'shape': profile['shape'], 'next_url': url_for('preview_data')})
+
+def upload_status_payload(record):
+    """JSON body describing a resumable upload"""
+    return {
+        'upload_id': record['upload_id'],
+        'filename': record['filename'],
+        'size': record['size'],
+        'offset': record['offset'],
+        'chunk_size': app.config['UPLOAD_CHUNK_SIZE'],
+        'status_url': url_for('upload_status', upload_id=record['upload_id']),
+        'upload_url': url_for('upload_chunk', upload_id=record['upload_id']),
+        'complete_url': url_for('complete_upload', upload_id=record['upload_id'])
+    }
+
+@app.route('/api/datasets/<dataset_id>')
+def dataset_info(dataset_id):
+    """Registry entry of a dataset version with its lineage and the versions derived from it"""
+    dataset = dataset_registry.get(dataset_id)
+    if dataset is None:
+        return jsonify({'error': 'Unknown dataset'}), 404
+    return jsonify(dict(dataset.to_dict(),
+                        lineage=[{'id': d.id, 'version': d.version, 'operation': d.operation}
+                                 for d in dataset_registry.lineage(dataset)],
+                        children=[child.id for child in dataset.children]))
+
+@app.route('/datasets/<dataset_id>/open')
+def open_dataset(dataset_id):
+    """Make a registered dataset version the current one"""
+    dataset = dataset_registry.get(dataset_id)
+    if dataset is None or not os.path.exists(dataset_registry.path(dataset)):
+        flash('Dataset not found.', 'error')
+        return redirect(url_for('upload_file'))
+    use_dataset(dataset)
+    dataset_registry.touch(dataset, force=True)
+    return redirect(url_for('preview_data'))
 
 @app.route('/preview')
 def preview_data():
     """Preview uploaded data with pagination"""
-    if 'current_file' not in session:
+    dataset = current_dataset()
+    if dataset is None:
         flash('No file uploaded. Please upload a file first.', 'warning')
         return redirect(url_for('upload_file'))
     
     try:
-        filepath = os.path.join(app.config['UPLOAD_FOLDER'], session['current_file'])
+        filepath = dataset_registry.path(dataset)
         processor = DataProcessor()
-        df = processor.load_data(filepath)
         
-        if df is None:
+        # Get basic data info without loading the whole dataset
+        data_info = processor.get_profile(filepath)
+        
+        if not data_info:
             flash('Error loading data file.', 'error')
             return redirect(url_for('upload_file'))
         
@@ -85,23 +378,24 @@ def preview_data():
         page = request.args.get('page', 1, type=int)
         per_page = 50
         start_idx = (page - 1) * per_page
-        end_idx = start_idx + per_page
+        total_rows = data_info['shape'][0]
         
-        # Get data subset
-        data_subset = df.iloc[start_idx:end_idx]
+        # Read only the rows on this page
+        data_subset = processor.load_data(filepath, rows=(start_idx, per_page))
         
-        # Calculate pagination info
-        total_pages = (len(df) + per_page - 1) // per_page
+        if data_subset is None:
+            flash('Error loading data file.', 'error')
+            return redirect(url_for('upload_file'))
         
-        # Get basic data info
-        data_info = processor.get_data_info(df)
+        # Calculate pagination info
+        total_pages = (total_rows + per_page - 1) // per_page
         
         return render_template('preview.html', 
                              data=data_subset.to_dict('records'),
-                             columns=df.columns.tolist(),
+                             columns=data_info['columns'],
                              current_page=page,
                              total_pages=total_pages,
-                             total_rows=len(df),
+                             total_rows=total_rows,
                              data_info=data_info)
         
     except Exception as e:
@@ -112,25 +406,26 @@ def preview_data():
 @app.route('/cleaning')
 def data_cleaning():
     """Data cleaning interface"""
-    if 'current_file' not in session:
+    dataset = current_dataset()
+    if dataset is None:
         flash('No file uploaded. Please upload a file first.', 'warning')
         return redirect(url_for('upload_file'))
     
     try:
-        filepath = os.path.join(app.config['UPLOAD_FOLDER'], session['current_file'])
+        filepath = dataset_registry.path(dataset)
         processor = DataProcessor()
-        df = processor.load_data(filepath)
         
-        if df is None:
+        # Get cleaning analysis covering every row, computed at ingestion when possible
+        cleaning_info = processor.get_quality_profile(filepath)
+        
+        if not cleaning_info:
             flash('Error loading data file.', 'error')
             return redirect(url_for('upload_file'))
         
-        # Get cleaning analysis
-        cleaning_info = processor.analyze_data_quality(df)
-        
         return render_template('cleaning.html', 
                              cleaning_info=cleaning_info,
-                             columns=df.columns.tolist())
+                             columns=processor.get_profile(filepath).get('columns', []),
+                             cleaning_steps=cleaning_pipeline.log_for(filepath)[1])
         
     except Exception as e:
         app.logger.error(f"Cleaning error: {str(e)}")
@@ -140,47 +435,31 @@ def data_cleaning():
 @app.route('/clean_data', methods=['POST'])
 def clean_data():
     """Apply data cleaning operations"""
-    if 'current_file' not in session:
+    dataset = current_dataset()
+    if dataset is None:
         flash('No file uploaded. Please upload a file first.', 'warning')
         return redirect(url_for('upload_file'))
     
     try:
-        filepath = os.path.join(app.config['UPLOAD_FOLDER'], session['current_file'])
-        processor = DataProcessor()
-        df = processor.load_data(filepath)
-        
-        if df is None:
-            flash('Error loading data file.', 'error')
-            return redirect(url_for('upload_file'))
+        filepath = dataset_registry.path(dataset)
         
         # Get cleaning options from form
         operations = {
             'remove_duplicates': 'remove_duplicates' in request.form,
             'handle_missing': request.form.get('missing_strategy', 'drop'),
             'remove_outliers': 'remove_outliers' in request.form,
+            'outlier_method': request.form.get('outlier_method', 'isolation_forest'),
             'correct_dtypes': 'correct_dtypes' in request.form
         }
+        if operations['outlier_method'] not in OUTLIER_METHODS:
+            operations['outlier_method'] = 'isolation_forest'
         
-        # Apply cleaning operations
-        cleaned_df = processor.clean_data(df, operations)
-        
-        if cleaned_df is not None:
-            # Save cleaned data
-            cleaned_filename = 'cleaned_' + session['current_file']
-            cleaned_filepath = os.path.join(app.config['UPLOAD_FOLDER'], cleaned_filename)
-            
-            if cleaned_filename.endswith('.csv'):
-                cleaned_df.to_csv(cleaned_filepath, index=False)
-            else:
-                cleaned_df.to_excel(cleaned_filepath, index=False)
-            
-            # Update session with cleaned file
-            session['current_file'] = cleaned_filename
-            session['data_shape'] = cleaned_df.shape
-            
-            flash(f'Data cleaned successfully! New dataset: {cleaned_df.shape[0]} rows, {cleaned_df.shape[1]} columns.', 'success')
-        else:
-            flash('Error cleaning data.', 'error')
+        # Append the step to the dataset's cleaning log and materialize it in a worker
+        # process; the session switches to the result once the job is done
+        base_path, steps = cleaning_pipeline.log_for(filepath)
+        response = submit_cleaning(base_path, steps + [operations])
+        if response is not None:
+            return response
         
     except Exception as e:
         app.logger.error(f"Data cleaning error: {str(e)}")
@@ -188,39 +467,121 @@ def clean_data():
     
     return redirect(url_for('data_cleaning'))
 
+@app.route('/clean_data/undo', methods=['POST'])
+def undo_cleaning():
+    """Step back to the dataset as it was before the last cleaning step"""
+    dataset = current_dataset()
+    if dataset is None:
+        flash('No file uploaded. Please upload a file first.', 'warning')
+        return redirect(url_for('upload_file'))
+    
+    try:
+        filepath = dataset_registry.path(dataset)
+        base_path, steps = cleaning_pipeline.log_for(filepath)
+        if not steps:
+            flash('There are no cleaning steps to undo.', 'info')
+            return redirect(url_for('data_cleaning'))
+        
+        # The registry's parent is the version before the last step
+        previous = dataset.parent
+        if previous is None or not os.path.exists(dataset_registry.path(previous)):
+            previous_path = cleaning_pipeline.find_materialized(base_path, steps[:-1])
+            previous = register_file(os.path.basename(previous_path), dataset.original_filename) if previous_path else None
+        if previous is None:
+            # The earlier result is no longer on disk; rebuild it from the base
+            response = submit_cleaning(base_path, steps[:-1])
+            if response is not None:
+                return response
+        else:
+            use_dataset(previous)
+            rows, cols = previous.row_count, previous.column_count
+            flash(f'Undid the last cleaning step. Dataset: {rows} rows, {cols} columns.', 'success')
+        
+    except Exception as e:
+        app.logger.error(f"Undo cleaning error: {str(e)}")
+        flash(f'Error undoing cleaning step: {str(e)}', 'error')
+    
+    return redirect(url_for('data_cleaning'))
+
+def submit_cleaning(base_path, steps):
+    """Queue materializing a cleaning log; returns a response unless the job finished inline"""
+    job_id = job_queue.submit('clean', tasks.clean_dataset, base_path, steps,
+                              key=cleaning_pipeline.materialized_path(base_path, steps))
+    session['clean_job'] = job_id
+    
+    if wants_json():
+        return job_accepted(job_id)
+    
+    job = job_queue.wait(job_id, app.config['JOB_INLINE_WAIT'])
+    if job is not None and job['status'] not in TERMINAL_STATES:
+        return redirect(url_for('job_progress', job_id=job_id))
+    return None
+
 @app.route('/dashboard')
 def dashboard():
     """Main analytics dashboard"""
-    if 'current_file' not in session:
+    dataset = current_dataset()
+    if dataset is None:
         flash('No file uploaded. Please upload a file first.', 'warning')
         return redirect(url_for('upload_file'))
     
     try:
-        filepath = os.path.join(app.config['UPLOAD_FOLDER'], session['current_file'])
+        filepath = dataset_registry.path(dataset)
         processor = DataProcessor()
-        df = processor.load_data(filepath)
-        
-        if df is None:
-            flash('Error loading data file.', 'error')
-            return redirect(url_for('upload_file'))
-        
-        # Get analytics data
-        analytics = processor.get_analytics(df)
-        
-        # Get column information for chart generation
-        numeric_cols = df.select_dtypes(include=['number']).columns.tolist()
-        categorical_cols = df.select_dtypes(include=['object', 'category']).columns.tolist()
+        lazy_charts = app.config['LAZY_DASHBOARD_CHARTS']
+        
+        # Column types are partitioned once for the selectors and every automatic chart;
+        # in lazy mode they come from the stored profile and the data is not loaded here
+        if lazy_charts:
+            profile = processor.get_profile(filepath)
+            if not profile:
+                flash('Error loading data file.', 'error')
+                return redirect(url_for('upload_file'))
+            partition = {'numeric': profile['numeric_columns'], 'categorical': profile['categorical_columns']}
+            all_cols = profile['columns']
+        else:
+            df = processor.load_data(filepath)
+            if df is None:
+                flash('Error loading data file.', 'error')
+                return redirect(url_for('upload_file'))
+            partition = ChartGenerator.column_partition(df)
+            all_cols = df.columns.tolist()
+        
+        # Get analytics data, cached per dataset version and computed in a worker process
+        analytics = analytics_cache.get(filepath)
+        if analytics is None:
+            job_id = job_queue.submit('analytics', tasks.compute_analytics, filepath, key=dataset_key(filepath))
+            if wants_json():
+                return job_accepted(job_id)
+            
+            job = job_queue.wait(job_id, app.config['JOB_INLINE_WAIT'])
+            if job is not None and job['status'] not in TERMINAL_STATES:
+                return redirect(url_for('job_progress', job_id=job_id))
+            analytics = job['result'] if job is not None and job['status'] == 'done' else {}
         
         # Generate automatic charts
         chart_gen = ChartGenerator()
-        auto_charts = chart_gen.generate_automatic_charts(df)
+        if lazy_charts:
+            # The page renders at once and the browser fetches each chart from /api/chart
+            auto_charts = [{
+                'title': chart['title'],
+                'type': chart['type'],
+                'error': chart['error'],
+                'params': {'chart_type': chart['type'], 'x_column': chart['x'],
+                           'y_column': chart['y'] or '', 'title': chart['title']}
+            } for chart in chart_gen.automatic_chart_plan(partition)] or [chart_gen.no_charts_entry()]
+        else:
+            auto_charts = json.loads(chart_cache.get_or_create(
+                chart_cache_key(dataset, 'automatic'),
+                lambda: json.dumps(chart_gen.generate_automatic_charts(df, partition))))
         
         return render_template('dashboard.html',
                              analytics=analytics,
-                             numeric_cols=numeric_cols,
-                             categorical_cols=categorical_cols,
-                             all_cols=df.columns.tolist(),
-                             auto_charts=auto_charts)
+                             numeric_cols=partition['numeric'],
+                             categorical_cols=partition['categorical'],
+                             all_cols=all_cols,
+                             auto_charts=auto_charts,
+                             columnar_exports=ExportHandler.columnar_available())
         
     except Exception as e:
         app.logger.error(f"Dashboard error: {str(e)}")
@@ -230,29 +591,28 @@ def dashboard():
 @app.route('/generate_chart', methods=['POST'])
 def generate_chart():
     """Generate a chart based on user selections"""
-    if 'current_file' not in session:
+    dataset = current_dataset()
+    if dataset is None:
         return jsonify({'error': 'No file uploaded'}), 400
     
     try:
-        filepath = os.path.join(app.config['UPLOAD_FOLDER'], session['current_file'])
-        processor = DataProcessor()
-        df = processor.load_data(filepath)
-        
-        if df is None:
-            return jsonify({'error': 'Error loading data'}), 400
-        
         # Get chart parameters
         chart_type = request.form.get('chart_type')
         x_column = request.form.get('x_column')
         y_column = request.form.get('y_column')
         title = request.form.get('title', f'{chart_type.title()} Chart')
         
-        # Generate chart
-        chart_gen = ChartGenerator()
-        chart_html = chart_gen.create_chart(df, chart_type, x_column, y_column, title)
+        filepath = dataset_registry.path(dataset)
+        etag = chart_cache_key(dataset, 'html', chart_type, x_column, y_column, title)
+        if etag in request.if_none_match:
+            return chart_not_modified(etag)
+        
+        chart_html = chart_cache.get_or_create(
+            etag, lambda: build_chart(filepath, 'html', chart_type, x_column, y_column, title))
         
         if chart_html:
-            return jsonify({'chart_html': chart_html})
+            response = jsonify({'chart_html': chart_html})
+            return with_chart_etag(response, etag)
         else:
             return jsonify({'error': 'Error generating chart'}), 400
         
@@ -260,30 +620,71 @@ def generate_chart():
         app.logger.error(f"Chart generation error: {str(e)}")
         return jsonify({'error': str(e)}), 400
 
+@app.route('/api/chart', methods=['GET', 'POST'])
+def chart_spec():
+    """Plotly figure JSON for a chart, with numeric arrays as base64 typed arrays"""
+    dataset = current_dataset()
+    if dataset is None:
+        return jsonify({'error': 'No file uploaded'}), 400
+    
+    try:
+        chart_type = request.values.get('chart_type')
+        x_column = request.values.get('x_column')
+        y_column = request.values.get('y_column')
+        title = request.values.get('title') or f'{(chart_type or "").title()} Chart'
+        
+        filepath = dataset_registry.path(dataset)
+        etag = chart_cache_key(dataset, 'spec', chart_type, x_column, y_column, title)
+        if etag in request.if_none_match:
+            return chart_not_modified(etag)
+        
+        spec = chart_cache.get_or_create(
+            etag, lambda: build_chart(filepath, 'spec', chart_type, x_column, y_column, title))
+        if spec is None:
+            return jsonify({'error': 'Error generating chart'}), 400
+        return with_chart_etag(compressed_response(spec, 'application/json'), etag)
+        
+    except Exception as e:
+        app.logger.error(f"Chart spec error: {str(e)}")
+        return jsonify({'error': str(e)}), 400
+
 @app.route('/export/<format>')
 def export_data(format):
     """Export data in specified format"""
-    if 'current_file' not in session:
+    dataset = current_dataset()
+    if dataset is None:
         flash('No file uploaded. Please upload a file first.', 'warning')
         return redirect(url_for('upload_file'))
     
     try:
-        filepath = os.path.join(app.config['UPLOAD_FOLDER'], session['current_file'])
-        processor = DataProcessor()
-        df = processor.load_data(filepath)
-        
-        if df is None:
-            flash('Error loading data file.', 'error')
+        if format not in EXPORT_FORMATS:
+            flash(f'Unsupported export format: {format}', 'error')
             return redirect(url_for('dashboard'))
         
-        # Generate export
-        export_handler = ExportHandler()
-        export_path = export_handler.export_data(df, format, session.get('original_filename', 'data'))
+        filepath = dataset_registry.path(dataset)
+        if format in STREAMING_FORMATS and app.config['STREAMING_EXPORTS']:
+            return streaming_export(dataset, format, request.args.get('gzip') == '1')
         
-        if export_path and os.path.exists(export_path):
-            return send_file(export_path, as_attachment=True)
-        else:
-            flash(f'Error exporting data as {format.upper()}', 'error')
+        # Other formats are written to a file by a background job, then sent;
+        # a file already written for this version of the dataset is sent straight away
+        original_filename = dataset.original_filename
+        handler = ExportHandler()
+        if format in COLUMNAR_FORMATS and not handler.columnar_available():
+            flash(f'{format.capitalize()} export requires pyarrow, which is not installed.', 'error')
+            return redirect(url_for('dashboard'))
+        
+        compression = handler.parquet_codec(request.args.get('compression')) if format == 'parquet' else None
+        cached_path = handler.cached_artifact(dataset.content_hash, format, compression)
+        if cached_path is not None and not wants_json():
+            return send_file(cached_path, as_attachment=True, mimetype=COLUMNAR_FORMATS.get(format),
+                             download_name=handler.export_filename(format, original_filename))
+        
+        job_id = job_queue.submit('export', tasks.export_dataset, filepath, format, original_filename, compression,
+                                  key=f'{dataset_key(filepath)}:{format}:{compression}')
+        response = export_job_response(job_id)
+        if response is not None:
+            return response
+        flash(f"Error exporting data as {format.upper()}", 'error')
             
     except Exception as e:
         app.logger.error(f"Export error: {str(e)}")
@@ -291,9 +692,139 @@ def export_data(format):
     
     return redirect(url_for('dashboard'))
 
+@app.route('/export/report/<format>')
+def export_report(format):
+    """Export the summary report, built from the cached analytics, in specified format"""
+    dataset = current_dataset()
+    if dataset is None:
+        flash('No file uploaded. Please upload a file first.', 'warning')
+        return redirect(url_for('upload_file'))
+    
+    try:
+        if format not in REPORT_FORMATS:
+            flash(f'Unsupported report format: {format}', 'error')
+            return redirect(url_for('dashboard'))
+        
+        filepath = dataset_registry.path(dataset)
+        original_filename = dataset.original_filename
+        handler = ExportHandler()
+        if format in COLUMNAR_FORMATS and not handler.columnar_available():
+            flash(f'{format.capitalize()} export requires pyarrow, which is not installed.', 'error')
+            return redirect(url_for('dashboard'))
+        
+        cached_path = handler.cached_artifact(dataset.content_hash, format, REPORT_VARIANT)
+        if cached_path is not None and not wants_json():
+            return send_file(cached_path, as_attachment=True, mimetype=COLUMNAR_FORMATS.get(format),
+                             download_name=handler.report_filename(format, original_filename))
+        
+        job_id = job_queue.submit('export', tasks.export_report, filepath, format, original_filename,
+                                  key=f'{dataset_key(filepath)}:report:{format}')
+        response = export_job_response(job_id)
+        if response is not None:
+            return response
+        flash(f"Error exporting summary report as {format.upper()}", 'error')
+        
+    except Exception as e:
+        app.logger.error(f"Report export error: {str(e)}")
+        flash(f'Error exporting summary report: {str(e)}', 'error')
+    
+    return redirect(url_for('dashboard'))
+
+def export_job_response(job_id):
+    """Send an export job's file if it finishes in time, else its progress page; None if it failed"""
+    if wants_json():
+        return job_accepted(job_id)
+    
+    job = job_queue.wait(job_id, app.config['JOB_INLINE_WAIT'])
+    if job is None or job['status'] == 'failed':
+        return None
+    if job['status'] == 'done':
+        return send_file(job['result']['path'], as_attachment=True, mimetype=job['result'].get('mimetype'),
+                         download_name=job['result']['filename'])
+    return redirect(url_for('job_progress', job_id=job_id))
+
+def set_attachment(response, filename):
+    """Content-Disposition for a download, encoded as send_file does: an ASCII
+    filename plus an RFC 5987 filename* for names that are not ASCII"""
+    try:
+        filename.encode('ascii')
+        names = {'filename': filename}
+    except UnicodeEncodeError:
+        simple = unicodedata.normalize('NFKD', filename).encode('ascii', 'ignore').decode('ascii')
+        names = {'filename': simple, 'filename*': f"UTF-8''{quote(filename, safe='!#$&+-.^_`|~')}"}
+    # Headers.set quotes and escapes the values
+    response.headers.set('Content-Disposition', 'attachment', **names)
+
+def streaming_export(dataset, format_type, compress):
+    """Send an export as it is produced, one row chunk at a time"""
+    filepath = dataset_registry.path(dataset)
+    processor = DataProcessor()
+    if not processor.get_profile(filepath):
+        raise ValueError('Error loading data file.')
+    
+    handler = ExportHandler()
+    filename = handler.export_filename(format_type, dataset.original_filename, compress)
+    body = handler.stream_export(processor.iter_chunks(filepath), format_type, compress)
+    mimetype = 'application/gzip' if compress else STREAMING_FORMATS[format_type]
+    response = Response(body, mimetype=mimetype)
+    set_attachment(response, filename)
+    return response
+
+@app.route('/jobs/<job_id>')
+def job_status(job_id):
+    """Report a background job's status, progress and result"""
+    job = job_queue.get(job_id)
+    if job is None:
+        return jsonify({'error': 'Unknown job'}), 404
+    
+    if job['status'] == 'done':
+        job['next_url'] = job_next_url(job)
+    return jsonify(job)
+
+@app.route('/jobs/<job_id>/progress')
+def job_progress(job_id):
+    """Page that polls a background job and moves on when it finishes"""
+    job = job_queue.get(job_id)
+    if job is None:
+        flash('Job not found.', 'error')
+        return redirect(url_for('index'))
+    return render_template('job_progress.html', job=job, next_url=job_next_url(job))
+
+@app.route('/jobs/<job_id>/download')
+def job_download(job_id):
+    """Send the file produced by a finished export job"""
+    job = job_queue.get(job_id)
+    if job is None or job['kind'] != 'export' or job['status'] != 'done':
+        flash('Export is not ready.', 'error')
+        return redirect(url_for('dashboard'))
+    
+    export_path = job['result']['path']
+    if not os.path.exists(export_path):
+        flash('Export file is no longer available. Please export again.', 'error')
+        return redirect(url_for('dashboard'))
+    return send_file(export_path, as_attachment=True, mimetype=job['result'].get('mimetype'),
+                     download_name=job['result']['filename'])
+
+@app.route('/api/cache/stats')
+def cache_stats():
+    """Report hit/miss/eviction counters for the DataFrame, analytics and chart caches"""
+    return jsonify({
+        'dataframe_cache': dataframe_cache.stats(),
+        'analytics_cache': analytics_cache.stats(),
+        'chart_cache': chart_cache.stats()
+    })
+
+@app.route('/api/storage/stats')
+def storage_stats():
+    """Report disk usage of uploads, exports and caches against the storage quota"""
+    return jsonify(storage_janitor.stats())
+
 @app.errorhandler(413)
 def too_large(e):
-    flash('File too large. Maximum size is 16MB.', 'error')
+    limit = app.config['MAX_CONTENT_LENGTH'] // (1024 * 1024)
+    if request.path.startswith('/api/'):
+        return jsonify({'error': f'Request too large. Send chunks of at most {limit}MB.'}), 413
+    flash(f'File too large for a form upload (maximum {limit}MB). Larger files are uploaded in chunks.', 'error')
     return redirect(url_for('upload_file'))
 
 @app.errorhandler(404)
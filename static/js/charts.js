@@ -140,6 +140,37 @@ class ChartManager {
         }
     }
 
+    async fetchChartSpec(params) {
+        // Figure JSON from the server; numeric arrays arrive as base64 typed arrays
+        const url = (window.CHART_API_URL || '/api/chart') + '?' + new URLSearchParams(params);
+        const response = await fetch(url, { headers: { 'Accept': 'application/json' } });
+        const spec = await response.json();
+        if (!response.ok) {
+            throw new Error(spec.error || `Chart request failed (${response.status})`);
+        }
+        return spec;
+    }
+
+    renderSpec(container, spec) {
+        const element = typeof container === 'string' ? document.getElementById(container) : container;
+        if (!element) {
+            console.error('Chart container not found');
+            return Promise.resolve(null);
+        }
+
+        // Plotly.react reuses an existing plot in the container instead of rebuilding it
+        const layout = Object.assign({}, spec.layout, { autosize: true });
+        return Plotly.react(element, spec.data || [], layout, this.getPlotlyConfig()).then(() => {
+            this.charts.set(element.id, {
+                type: 'spec',
+                data: spec.data,
+                layout: layout,
+                options: {}
+            });
+            return element.id;
+        });
+    }
+
     createBarChart(data, options) {
         const { x, y, color } = options;
         
@@ -372,6 +403,35 @@ let chartManager;
 
 document.addEventListener('DOMContentLoaded', function() {
     chartManager = new ChartManager();
+    window.chartManager = chartManager;
+
+    // Render figure specs embedded in the page
+    document.querySelectorAll('[data-chart-spec]').forEach(function(element) {
+        chartManager.renderSpec(element, JSON.parse(element.dataset.chartSpec));
+    });
+
+    // Fetch charts the page only holds a placeholder for; the requests run concurrently
+    document.querySelectorAll('[data-chart-params]').forEach(function(element) {
+        chartManager.fetchChartSpec(JSON.parse(element.dataset.chartParams))
+            .then(spec => {
+                element.innerHTML = '';
+                return chartManager.renderSpec(element, spec);
+            })
+            .catch(error => {
+                console.error('Error loading chart:', error);
+                element.classList.remove('plotly-graph-div');
+                element.innerHTML = `
+                    <div class="alert alert-danger d-flex align-items-center" role="alert">
+                        <i class="fas fa-exclamation-triangle me-2"></i>
+                        <div>
+                            <strong>Chart Generation Failed:</strong> <span></span>
+                            <br><small>Please check your data or try a different visualization.</small>
+                        </div>
+                    </div>
+                `;
+                element.querySelector('span').textContent = element.dataset.chartError || error.message;
+            });
+    });
 
     // Handle window resize
     window.addEventListener('resize', function() {
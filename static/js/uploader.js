@@ -0,0 +1,122 @@
+// Resumable chunked uploads for files larger than a single form post allows
+
+class ResumableUploader {
+    constructor(options = {}) {
+        this.createUrl = options.createUrl || '/api/uploads';
+        this.maxRetries = options.maxRetries || 3;
+        this.onProgress = options.onProgress || (() => {});
+    }
+
+    // Uploads are remembered per file so a reload can continue where it stopped
+    storageKey(file) {
+        return `upload:${file.name}:${file.size}:${file.lastModified}`;
+    }
+
+    async upload(file) {
+        let status = await this.resumeOrCreate(file);
+        let retries = 0;
+
+        while (status.offset < status.size) {
+            const chunk = file.slice(status.offset, Math.min(status.offset + status.chunk_size, status.size));
+            try {
+                status = await this.sendChunk(status, chunk);
+                retries = 0;
+                this.onProgress(status.offset / status.size);
+            } catch (error) {
+                if (++retries > this.maxRetries) {
+                    throw error;
+                }
+                // Ask the server how much it has before sending again
+                await new Promise(resolve => setTimeout(resolve, 1000 * retries));
+                try {
+                    status = await this.getJson(await fetch(status.status_url, { cache: 'no-store' }));
+                } catch (statusError) {
+                    // Keep the last known offset and try the chunk again
+                }
+            }
+        }
+
+        const result = await this.complete(status);
+        localStorage.removeItem(this.storageKey(file));
+        return result;
+    }
+
+    async resumeOrCreate(file) {
+        const key = this.storageKey(file);
+        const uploadId = localStorage.getItem(key);
+        if (uploadId) {
+            const response = await fetch(`${this.createUrl}/${uploadId}`, { cache: 'no-store' });
+            if (response.ok) {
+                return response.json();
+            }
+            localStorage.removeItem(key);
+        }
+
+        const status = await this.getJson(await fetch(this.createUrl, {
+            method: 'POST',
+            headers: { 'Content-Type': 'application/json', 'Accept': 'application/json' },
+            body: JSON.stringify({ filename: file.name, size: file.size })
+        }));
+        localStorage.setItem(key, status.upload_id);
+        return status;
+    }
+
+    async sendChunk(status, chunk) {
+        const headers = {
+            'Content-Type': 'application/octet-stream',
+            'Upload-Offset': String(status.offset)
+        };
+        const checksum = await this.sha256(chunk);
+        if (checksum) {
+            headers['X-Chunk-SHA256'] = checksum;
+        }
+        const response = await fetch(status.upload_url, { method: 'PUT', headers: headers, body: chunk });
+        return this.getJson(response);
+    }
+
+    async complete(status) {
+        const response = await fetch(status.complete_url, {
+            method: 'POST',
+            headers: { 'Content-Type': 'application/json', 'Accept': 'application/json' },
+            body: JSON.stringify({})
+        });
+        const result = await this.getJson(response);
+        if (response.status !== 202) {
+            return result;
+        }
+        return this.waitForJob(result.status_url);
+    }
+
+    // Poll an ingestion job until it has finished
+    async waitForJob(statusUrl) {
+        while (true) {
+            const job = await this.getJson(await fetch(statusUrl, { cache: 'no-store' }));
+            if (job.status === 'done') {
+                return job;
+            }
+            if (job.status === 'failed') {
+                throw new Error(job.error || 'Processing the upload failed');
+            }
+            await new Promise(resolve => setTimeout(resolve, 1000));
+        }
+    }
+
+    async sha256(blob) {
+        // SubtleCrypto is only available in secure contexts; chunks are sent unchecked otherwise
+        if (!window.crypto || !window.crypto.subtle) {
+            return null;
+        }
+        const digest = await window.crypto.subtle.digest('SHA-256', await blob.arrayBuffer());
+        return Array.from(new Uint8Array(digest), b => b.toString(16).padStart(2, '0')).join('');
+    }
+
+    async getJson(response) {
+        const data = await response.json().catch(() => ({}));
+        if (!response.ok) {
+            throw new Error(data.error || `Upload request failed (${response.status})`);
+        }
+        return data;
+    }
+}
+
+window.ResumableUploader = ResumableUploader;
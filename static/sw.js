@@ -1,10 +1,11 @@
 // Service Worker for Data Analysis Platform PWA
-const CACHE_NAME = 'data-analyzer-v1';
+const CACHE_NAME = 'data-analyzer-v3';
 const urlsToCache = [
   '/',
   '/static/css/custom.css',
   '/static/js/app.js',
   '/static/js/charts.js',
+  '/static/js/uploader.js',
   '/static/manifest.json',
   '/static/icons/icon-192x192.png',
   '/static/icons/icon-192x192-maskable.png',
@@ -13,7 +14,7 @@ const urlsToCache = [
   'https://cdn.jsdelivr.net/npm/bootstrap@5.3.0/dist/css/bootstrap.min.css',
   'https://cdn.jsdelivr.net/npm/bootstrap@5.3.0/dist/js/bootstrap.bundle.min.js',
   'https://cdnjs.cloudflare.com/ajax/libs/font-awesome/6.4.0/css/all.min.css',
-  'https://cdn.plot.ly/plotly-2.24.1.min.js'
+  'https://cdn.plot.ly/plotly-2.35.2.min.js'
 ];
 
 // Install event - cache resources
@@ -34,6 +35,12 @@ self.addEventListener('fetch', function(event) {
     return;
   }
 
+  // Uploads, API calls and job polling always go to the server and are never cached
+  const path = new URL(event.request.url).pathname;
+  if (event.request.method !== 'GET' || path.startsWith('/api/') || path.startsWith('/jobs/')) {
+    return;
+  }
+
   event.respondWith(
     caches.match(event.request)
       .then(function(response) {
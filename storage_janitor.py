@@ -0,0 +1,251 @@
+import os
+import re
+import json
+import time
+import shutil
+import logging
+import threading
+from datetime import datetime, timezone, timedelta
+from dataset_registry import dataset_registry
+from cleaning_pipeline import cleaning_pipeline
+from resumable_upload import resumable_uploads
+
+# Files being written (atomic-rename temporaries, columnar writer spill files)
+TEMP_FILE_PATTERN = re.compile(r'\.tmp(\.[\w-]+)*$')
+
+class StorageJanitor:
+    """Keeps uploads, exports and on-disk caches within a byte quota.
+
+    Files are grouped into entries: a dataset file in the upload folder together
+    with its metadata and columnar copy, or a single export or cache file. Each
+    entry's last use is the latest of its registry access time and its files'
+    access and modification times. A sweep removes entries unused for longer
+    than ttl, then evicts the least recently used ones until the total is under
+    quota_bytes. Datasets a session used within active_window are pinned along
+    with the versions they were derived from, and nothing younger than
+    grace_period is touched, so a file a request or job is still working on is
+    never removed.
+    """
+
+    # Directory dataset files live in; set from UPLOAD_FOLDER by the app
+    upload_folder = 'uploads'
+
+    # Other managed directories by name: exports and on-disk caches; set by the app
+    cache_folders = {'exports': 'exports'}
+
+    # Limits, in bytes and seconds; set from the STORAGE_* settings by the app
+    quota_bytes = 5 * 1024 * 1024 * 1024
+    ttl = 7 * 24 * 3600
+    active_window = 24 * 3600
+    grace_period = 3600
+    partial_upload_ttl = 24 * 3600
+    interval = 600
+
+    # Last sweep and running totals, shared by every web worker process
+    state_path = os.path.join('cache', 'storage-janitor.json')
+
+    def __init__(self):
+        self.logger = logging.getLogger(__name__)
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+
+    def start(self, app):
+        """Sweep every interval seconds in a background thread"""
+        if self.interval <= 0 or self._thread is not None:
+            return
+        self._thread = threading.Thread(target=self._run, args=(app,), name='storage-janitor', daemon=True)
+        self._thread.start()
+
+    def _run(self, app):
+        while not self._stop.wait(self.interval):
+            try:
+                if self._claim_sweep():
+                    with app.app_context():
+                        self.sweep()
+            except Exception as e:
+                self.logger.error(f"Storage sweep failed: {str(e)}")
+
+    def _claim_sweep(self):
+        # With several web workers, only the first to wake up in an interval sweeps
+        try:
+            if time.time() - os.path.getmtime(self.state_path) < self.interval * 0.9:
+                return False
+        except OSError:
+            pass
+        os.makedirs(os.path.dirname(self.state_path) or '.', exist_ok=True)
+        with open(self.state_path, 'a'):
+            os.utime(self.state_path)
+        return True
+
+    @staticmethod
+    def entry_key(name):
+        """Name shared by a dataset file and its sidecars: X.csv, X.csv.meta.json and X.feather"""
+        if TEMP_FILE_PATTERN.search(name):
+            return name
+        if name.endswith('.meta.json'):
+            name = name[:-len('.meta.json')]
+        return os.path.splitext(name)[0]
+
+    def _entries(self):
+        # Scan the managed folders into {(area, key): entry}
+        entries = {}
+        folders = dict(self.cache_folders, uploads=self.upload_folder)
+        for area, folder in folders.items():
+            try:
+                scan = list(os.scandir(folder))
+            except FileNotFoundError:
+                continue
+            for item in scan:
+                if not item.is_file() or item.name.startswith('.git'):
+                    continue
+                try:
+                    stat = item.stat()
+                except OSError:
+                    continue
+                key = self.entry_key(item.name) if area == 'uploads' else item.name
+                entry = entries.setdefault((area, key), {
+                    'area': area, 'paths': [], 'bytes': 0, 'last_used': 0.0, 'modified': 0.0,
+                    'temporary': bool(TEMP_FILE_PATTERN.search(item.name))
+                })
+                entry['paths'].append(item.path)
+                entry['bytes'] += stat.st_size
+                entry['last_used'] = max(entry['last_used'], stat.st_atime, stat.st_mtime)
+                entry['modified'] = max(entry['modified'], stat.st_mtime)
+
+        for filename, used in dataset_registry.last_used().items():
+            entry = entries.get(('uploads', self.entry_key(filename)))
+            if entry is not None:
+                entry['last_used'] = max(entry['last_used'], used.timestamp())
+        return entries
+
+    def pinned_keys(self):
+        """Entry keys of datasets that active sessions still use, with the versions they came from"""
+        since = datetime.now(timezone.utc) - timedelta(seconds=self.active_window)
+        keys = set()
+        for dataset in dataset_registry.used_since(since):
+            for version in dataset_registry.lineage(dataset):
+                keys.add(self.entry_key(version.filename))
+            # Cleaning results are rebuilt from their base file
+            path = dataset_registry.path(dataset)
+            if os.path.exists(path):
+                keys.add(self.entry_key(os.path.basename(cleaning_pipeline.log_for(path)[0])))
+        return keys
+
+    def sweep(self):
+        """Expire and evict files; returns a summary of what was removed"""
+        with self._lock:
+            started = time.time()
+            expired_uploads, expired_upload_bytes = resumable_uploads.expire(started - self.partial_upload_ttl)
+
+            entries = self._entries()
+            pinned = self.pinned_keys()
+            used_bytes = sum(entry['bytes'] for entry in entries.values())
+            candidates = sorted(
+                (entry for (area, key), entry in entries.items()
+                 if not (area == 'uploads' and key in pinned) and started - entry['modified'] >= self.grace_period),
+                key=lambda entry: entry['last_used'])
+
+            removed = {'files': 0, 'bytes': 0, 'expired': 0, 'evicted': 0}
+            for entry in candidates:
+                expired = entry['temporary'] or started - entry['last_used'] >= self.ttl
+                if not expired and used_bytes <= self.quota_bytes:
+                    continue
+                freed = self._remove(entry)
+                used_bytes -= freed
+                removed['files'] += len(entry['paths'])
+                removed['bytes'] += freed
+                removed['expired' if expired else 'evicted'] += 1
+
+            pruned = dataset_registry.prune() if removed['files'] else 0
+            summary = {
+                'finished_at': datetime.now(timezone.utc).isoformat(),
+                'duration_seconds': round(time.time() - started, 3),
+                'removed_files': removed['files'],
+                'removed_bytes': removed['bytes'],
+                'expired_entries': removed['expired'],
+                'evicted_entries': removed['evicted'],
+                'expired_partial_uploads': expired_uploads,
+                'expired_partial_upload_bytes': expired_upload_bytes,
+                'pruned_datasets': pruned,
+                'used_bytes': used_bytes,
+                'over_quota': used_bytes > self.quota_bytes
+            }
+            self._record(summary)
+
+        if summary['over_quota']:
+            self.logger.warning(f"Storage still over quota after sweep: {used_bytes} of {self.quota_bytes} bytes in use")
+        self.logger.info(f"Storage sweep removed {removed['files']} files ({removed['bytes']} bytes)")
+        return summary
+
+    def _remove(self, entry):
+        freed = 0
+        for path in entry['paths']:
+            try:
+                size = os.path.getsize(path)
+                os.remove(path)
+                freed += size
+            except FileNotFoundError:
+                continue
+            except OSError as e:
+                self.logger.error(f"Could not remove {path}: {str(e)}")
+        return freed
+
+    def _load_state(self):
+        try:
+            with open(self.state_path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def _record(self, summary):
+        state = self._load_state()
+        totals = state.get('totals', {})
+        for name in ('removed_files', 'removed_bytes', 'expired_partial_uploads'):
+            totals[name] = totals.get(name, 0) + summary[name]
+        totals['sweeps'] = totals.get('sweeps', 0) + 1
+        try:
+            os.makedirs(os.path.dirname(self.state_path) or '.', exist_ok=True)
+            tmp_path = self.state_path + '.tmp'
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump({'last_sweep': summary, 'totals': totals}, f)
+            os.replace(tmp_path, self.state_path)
+        except Exception as e:
+            self.logger.error(f"Error saving storage sweep state: {str(e)}")
+
+    def stats(self):
+        """Bytes and files per managed folder, quota, pinned bytes and sweep history"""
+        entries = self._entries()
+        pinned = self.pinned_keys()
+        areas = {}
+        for entry in entries.values():
+            area = areas.setdefault(entry['area'], {'files': 0, 'bytes': 0})
+            area['files'] += len(entry['paths'])
+            area['bytes'] += entry['bytes']
+
+        partial_files, partial_bytes = 0, 0
+        try:
+            for item in os.scandir(resumable_uploads.folder):
+                if item.is_file():
+                    partial_files += 1
+                    partial_bytes += item.stat().st_size
+        except FileNotFoundError:
+            pass
+
+        used_bytes = sum(area['bytes'] for area in areas.values())
+        disk = shutil.disk_usage(self.upload_folder)
+        state = self._load_state()
+        return {
+            'quota_bytes': self.quota_bytes,
+            'used_bytes': used_bytes,
+            'quota_used': round(used_bytes / self.quota_bytes, 4) if self.quota_bytes else None,
+            'pinned_bytes': sum(entry['bytes'] for (area, key), entry in entries.items()
+                                if area == 'uploads' and key in pinned),
+            'areas': areas,
+            'partial_uploads': {'files': partial_files, 'bytes': partial_bytes},
+            'disk': {'total_bytes': disk.total, 'free_bytes': disk.free},
+            'last_sweep': state.get('last_sweep'),
+            'totals': state.get('totals', {})
+        }
+
+storage_janitor = StorageJanitor()
@@ -0,0 +1,393 @@
+import math
+import numpy as np
+import pandas as pd
+
+SKETCH_K = 1024
+HEAVY_HITTERS_CAPACITY = 1000
+FRAME_CHUNK_ROWS = 100000
+
+class MomentAccumulator:
+    """Count, mean, second/third central moments, min and max for many columns at once.
+
+    Chunks are folded in with the pairwise (Chan et al.) update, so two accumulators
+    built on different parts of a dataset can be merged exactly.
+    """
+
+    def __init__(self, width):
+        self.count = np.zeros(width)
+        self.mean = np.zeros(width)
+        self.m2 = np.zeros(width)
+        self.m3 = np.zeros(width)
+        self.min = np.full(width, np.inf)
+        self.max = np.full(width, -np.inf)
+
+    def update(self, values):
+        """Fold in a 2-D float array (rows x columns) with NaN for missing values"""
+        mask = ~np.isnan(values)
+        count = mask.sum(axis=0).astype(float)
+        safe_count = np.where(count > 0, count, 1)
+        filled = np.where(mask, values, 0.0)
+        mean = filled.sum(axis=0) / safe_count
+        deviation = np.where(mask, values - mean, 0.0)
+        m2 = (deviation ** 2).sum(axis=0)
+        m3 = (deviation ** 3).sum(axis=0)
+        low = np.where(mask, values, np.inf).min(axis=0, initial=np.inf)
+        high = np.where(mask, values, -np.inf).max(axis=0, initial=-np.inf)
+        self._combine(count, mean, m2, m3, low, high)
+
+    def merge(self, other):
+        """Fold in another accumulator over the same columns"""
+        self._combine(other.count, other.mean, other.m2, other.m3, other.min, other.max)
+
+    def _combine(self, count_b, mean_b, m2_b, m3_b, min_b, max_b):
+        count_a, mean_a, m2_a, m3_a = self.count, self.mean, self.m2, self.m3
+        count = count_a + count_b
+        safe_count = np.where(count > 0, count, 1)
+        delta = mean_b - mean_a
+
+        self.mean = mean_a + delta * count_b / safe_count
+        self.m2 = m2_a + m2_b + delta ** 2 * count_a * count_b / safe_count
+        self.m3 = (m3_a + m3_b
+                   + delta ** 3 * count_a * count_b * (count_a - count_b) / safe_count ** 2
+                   + 3 * delta * (count_a * m2_b - count_b * m2_a) / safe_count)
+        self.count = count
+        self.min = np.minimum(self.min, min_b)
+        self.max = np.maximum(self.max, max_b)
+
+    def std(self):
+        """Sample standard deviation (ddof=1), NaN with fewer than two values"""
+        with np.errstate(invalid='ignore', divide='ignore'):
+            return np.where(self.count > 1, np.sqrt(self.m2 / (self.count - 1)), np.nan)
+
+    def skewness(self):
+        """Bias-corrected sample skewness, matching pandas Series.skew"""
+        n = self.count
+        with np.errstate(invalid='ignore', divide='ignore'):
+            skew = (n * np.sqrt(n - 1) / (n - 2)) * (self.m3 / self.m2 ** 1.5)
+        skew = np.where(self.m2 == 0, 0.0, skew)
+        return np.where(n < 3, np.nan, skew)
+
+class QuantileSketch:
+    """KLL quantile sketch over one column.
+
+    Values are kept exactly until the sketch exceeds k items; after that sorted
+    levels are compacted by keeping every other item with doubled weight. Rank
+    error is roughly proportional to 1/k of the number of values seen.
+    """
+
+    def __init__(self, k=SKETCH_K, seed=0):
+        self.k = k
+        self.count = 0
+        self.levels = [np.empty(0)]
+        self._rng = np.random.default_rng(seed)
+
+    def update(self, values):
+        """Add an array of values, ignoring NaN"""
+        values = values[~np.isnan(values)]
+        if len(values) == 0:
+            return
+        self.count += len(values)
+        self.levels[0] = np.concatenate([self.levels[0], values])
+        self._compress()
+
+    def merge(self, other):
+        """Fold in another sketch"""
+        for level, values in enumerate(other.levels):
+            if level == len(self.levels):
+                self.levels.append(np.empty(0))
+            self.levels[level] = np.concatenate([self.levels[level], values])
+        self.count += other.count
+        self._compress()
+
+    def _capacity(self, level):
+        depth = len(self.levels) - level - 1
+        return max(2, int(math.ceil(self.k * (2 / 3) ** depth)))
+
+    def _compress(self):
+        compacted = True
+        while compacted:
+            compacted = False
+            for level in range(len(self.levels)):
+                if len(self.levels[level]) <= self._capacity(level):
+                    continue
+                if level + 1 == len(self.levels):
+                    self.levels.append(np.empty(0))
+                items = np.sort(self.levels[level])
+                leftover = items[-1:] if len(items) % 2 else items[:0]
+                items = items[:len(items) - len(leftover)]
+                promoted = items[self._rng.integers(2)::2]
+                self.levels[level] = leftover
+                self.levels[level + 1] = np.concatenate([self.levels[level + 1], promoted])
+                compacted = True
+
+    def _weighted(self):
+        values = np.concatenate(self.levels)
+        weights = np.concatenate([np.full(len(items), 2.0 ** level) for level, items in enumerate(self.levels)])
+        order = np.argsort(values, kind='stable')
+        return values[order], weights[order]
+
+    def is_exact(self):
+        """Whether no compaction has happened, so every value is still held"""
+        return all(len(items) == 0 for items in self.levels[1:])
+
+    def quantile(self, qs):
+        """Estimated quantiles, using linear interpolation like pandas when exact"""
+        qs = np.atleast_1d(np.asarray(qs, dtype=float))
+        if self.count == 0:
+            return np.full(len(qs), np.nan)
+        if self.is_exact():
+            return np.quantile(self.levels[0], qs)
+        values, weights = self._weighted()
+        positions = (np.cumsum(weights) - weights / 2) / weights.sum()
+        return np.interp(qs, positions, values)
+
+    def count_outside(self, low, high):
+        """Estimated number of values below low or above high"""
+        if self.count == 0:
+            return 0
+        values, weights = self._weighted()
+        outside = (values < low) | (values > high)
+        return int(round(weights[outside].sum()))
+
+class CovarianceAccumulator:
+    """Pairwise-complete co-moment sums for a Pearson correlation matrix.
+
+    Like DataFrame.corr, each pair of columns only uses rows where both values are
+    present. Sums are taken around a fixed shift per column (the first chunk's
+    means) to avoid cancellation when values are large relative to their spread.
+    """
+
+    def __init__(self, width):
+        self.shift = None
+        self.n = np.zeros((width, width))
+        self.sx = np.zeros((width, width))   # sum of x_i where x_j present
+        self.sxx = np.zeros((width, width))  # sum of x_i^2 where x_j present
+        self.sxy = np.zeros((width, width))  # sum of x_i * x_j
+
+    def update(self, values):
+        """Fold in a 2-D float array (rows x columns) with NaN for missing values"""
+        mask = ~np.isnan(values)
+        if self.shift is None:
+            present_count = mask.sum(axis=0)
+            self.shift = np.where(mask, values, 0.0).sum(axis=0) / np.maximum(present_count, 1)
+        centered = np.where(mask, values - self.shift, 0.0)
+        present = mask.astype(float)
+        self.n += present.T @ present
+        self.sx += centered.T @ present
+        self.sxx += (centered ** 2).T @ present
+        self.sxy += centered.T @ centered
+
+    def merge(self, other):
+        """Fold in another accumulator over the same columns"""
+        if other.shift is None:
+            return
+        if self.shift is None:
+            self.shift = other.shift.copy()
+        # Re-center the other sums on this accumulator's shift
+        d = (other.shift - self.shift)[:, None]
+        d_t = d.T
+        sx_t = other.sx.T
+        self.sxy += other.sxy + d * sx_t + d_t * other.sx + d * d_t * other.n
+        self.sxx += other.sxx + 2 * d * other.sx + d ** 2 * other.n
+        self.sx += other.sx + d * other.n
+        self.n += other.n
+
+    def correlation(self):
+        """Pearson correlation matrix; NaN where a pair has fewer than two rows or no variance"""
+        if self.shift is None:
+            return np.full(self.n.shape, np.nan)
+        sy = self.sx.T
+        syy = self.sxx.T
+        with np.errstate(invalid='ignore', divide='ignore'):
+            cov = self.n * self.sxy - self.sx * sy
+            var_x = self.n * self.sxx - self.sx ** 2
+            var_y = self.n * syy - sy ** 2
+            corr = cov / np.sqrt(var_x * var_y)
+        corr = np.where(self.n > 1, corr, np.nan)
+        return np.clip(corr, -1.0, 1.0)
+
+class HeavyHitters:
+    """Space-Saving summary of the most frequent values in one column.
+
+    Counts are exact while the column has at most capacity distinct values; beyond
+    that each kept count overestimates the true count by at most n / capacity.
+    """
+
+    def __init__(self, capacity=HEAVY_HITTERS_CAPACITY):
+        self.capacity = capacity
+        self.counts = {}
+
+    def update(self, series):
+        """Add the values of a Series, ignoring missing values"""
+        self._combine(series.value_counts(dropna=True).to_dict(), exact=True)
+
+    def merge(self, other):
+        """Fold in another summary"""
+        self._combine(other.counts, exact=len(other.counts) < other.capacity)
+
+    def _floor(self):
+        return min(self.counts.values()) if len(self.counts) >= self.capacity else 0
+
+    def _combine(self, incoming, exact):
+        own_floor = self._floor()
+        incoming_floor = 0 if exact or not incoming else min(incoming.values())
+        merged = {value: count + incoming.get(value, incoming_floor) for value, count in self.counts.items()}
+        for value, count in incoming.items():
+            if value not in merged:
+                merged[value] = count + own_floor
+        if len(merged) > self.capacity:
+            merged = dict(sorted(merged.items(), key=lambda item: item[1], reverse=True)[:self.capacity])
+        self.counts = merged
+
+    def top(self, n=10):
+        """The n most frequent values with their counts, most frequent first"""
+        return dict(sorted(self.counts.items(), key=lambda item: item[1], reverse=True)[:n])
+
+class DatasetStatistics:
+    """One-pass, mergeable statistics for a dataset fed chunk by chunk.
+
+    Replaces separate describe(), quantile(), corr(), skew() and value_counts()
+    passes over a fully loaded DataFrame. Accumulators built by different workers
+    on different chunks can be combined with merge().
+    """
+
+    def __init__(self):
+        self.rows = 0
+        self.missing_total = 0
+        self.numeric_columns = None
+        self.categorical_columns = None
+        self.moments = None
+        self.covariance = None
+        self.sketches = {}
+        self.heavy_hitters = {}
+
+    @classmethod
+    def from_frame(cls, df, chunk_rows=FRAME_CHUNK_ROWS):
+        """Build statistics for an in-memory DataFrame"""
+        stats = cls()
+        for start in range(0, len(df), chunk_rows):
+            stats.update(df.iloc[start:start + chunk_rows])
+        if stats.numeric_columns is None:
+            stats._init_columns(df.select_dtypes(include=[np.number]).columns,
+                                df.select_dtypes(include=['object']).columns)
+        return stats
+
+    def _init_columns(self, numeric_columns, categorical_columns):
+        self.numeric_columns = list(numeric_columns)
+        self.categorical_columns = list(categorical_columns)
+        self.moments = MomentAccumulator(len(self.numeric_columns))
+        self.covariance = CovarianceAccumulator(len(self.numeric_columns))
+        self.sketches = {col: QuantileSketch() for col in self.numeric_columns}
+        self.heavy_hitters = {col: HeavyHitters() for col in self.categorical_columns}
+
+    def update(self, chunk):
+        """Fold in one chunk of rows"""
+        if self.numeric_columns is None:
+            self._init_columns(chunk.select_dtypes(include=[np.number]).columns,
+                               chunk.select_dtypes(include=['object']).columns)
+
+        self.rows += len(chunk)
+        self.missing_total += int(chunk.isna().sum().sum())
+
+        if self.numeric_columns:
+            # A later chunk may hold text in a column that started out numeric
+            values = np.column_stack([
+                pd.to_numeric(chunk[col], errors='coerce').to_numpy(dtype=float, na_value=np.nan)
+                for col in self.numeric_columns
+            ])
+            self.moments.update(values)
+            self.covariance.update(values)
+            for i, col in enumerate(self.numeric_columns):
+                self.sketches[col].update(values[:, i])
+
+        for col in self.categorical_columns:
+            self.heavy_hitters[col].update(chunk[col])
+
+    def merge(self, other):
+        """Fold in statistics built on other rows of the same dataset"""
+        if other.numeric_columns is None:
+            return
+        if self.numeric_columns is None:
+            self._init_columns(other.numeric_columns, other.categorical_columns)
+        self.rows += other.rows
+        self.missing_total += other.missing_total
+        self.moments.merge(other.moments)
+        self.covariance.merge(other.covariance)
+        for col in self.numeric_columns:
+            self.sketches[col].merge(other.sketches[col])
+        for col in self.categorical_columns:
+            self.heavy_hitters[col].merge(other.heavy_hitters[col])
+
+    def summary(self, numeric_columns=None, top=10):
+        """JSON-safe results: describe-style stats, correlations, value counts and IQR outliers.
+
+        numeric_columns restricts numeric results to columns that are still numeric
+        for the whole dataset (a column can turn into text part way through a file).
+        """
+        if self.numeric_columns is None:
+            return {'rows': 0, 'missing_total': 0, 'numeric': {}, 'correlation': {},
+                    'value_counts': {}, 'outliers': {}, 'outlier_bounds': {}}
+
+        keep = [col for col in self.numeric_columns
+                if numeric_columns is None or str(col) in {str(c) for c in numeric_columns}]
+        positions = [self.numeric_columns.index(col) for col in keep]
+
+        std = self.moments.std()
+        skew = self.moments.skewness()
+        numeric = {}
+        outliers = {}
+        outlier_bounds = {}
+        for col, i in zip(keep, positions):
+            count = int(self.moments.count[i])
+            q1, median, q3 = self.sketches[col].quantile([0.25, 0.5, 0.75]) if count else (np.nan,) * 3
+            numeric[str(col)] = {
+                'count': count,
+                'mean': _to_float(self.moments.mean[i]) if count else None,
+                'std': _to_float(std[i]),
+                'min': _to_float(self.moments.min[i]) if count else None,
+                '25%': _to_float(q1),
+                '50%': _to_float(median),
+                '75%': _to_float(q3),
+                'max': _to_float(self.moments.max[i]) if count else None,
+                'skewness': _to_float(skew[i])
+            }
+            if count > 10:  # Need at least 10 non-null values
+                iqr = q3 - q1
+                lower, upper = q1 - 1.5 * iqr, q3 + 1.5 * iqr
+                outlier_count = self.sketches[col].count_outside(lower, upper)
+                if outlier_count > 0:
+                    outliers[str(col)] = outlier_count
+                outlier_bounds[str(col)] = [_to_float(lower), _to_float(upper)]
+
+        correlation = {}
+        if len(keep) > 1:
+            corr = self.covariance.correlation()[np.ix_(positions, positions)]
+            correlation = {
+                str(col_j): {str(col_i): _to_float(corr[a, b]) for a, col_i in enumerate(keep)}
+                for b, col_j in enumerate(keep)
+            }
+
+        value_counts = {
+            str(col): {_to_json_key(value): int(count) for value, count in hitters.top(top).items()}
+            for col, hitters in self.heavy_hitters.items() if hitters.counts
+        }
+
+        return {
+            'rows': self.rows,
+            'missing_total': self.missing_total,
+            'numeric': numeric,
+            'correlation': correlation,
+            'value_counts': value_counts,
+            'outliers': outliers,
+            'outlier_bounds': outlier_bounds
+        }
+
+def _to_float(value):
+    """Plain float for JSON, with NaN mapped to None"""
+    value = float(value)
+    return None if math.isnan(value) or math.isinf(value) else value
+
+def _to_json_key(value):
+    if isinstance(value, (str, int, float, bool)) or value is None:
+        return value
+    return str(value)
@@ -0,0 +1,96 @@
+import os
+from data_cache import dataframe_cache
+from analytics_cache import analytics_cache, json_safe
+from data_processor import DataProcessor
+from export_handler import ExportHandler, COLUMNAR_FORMATS, STREAMING_FORMATS, REPORT_VARIANT
+from outlier_engine import outlier_engine
+from cleaning_pipeline import cleaning_pipeline
+
+def configure_worker(settings):
+    """Process-pool initializer: apply the web app's cache and memory settings"""
+    dataframe_cache.max_bytes = settings['dataframe_cache_max_bytes']
+    analytics_cache.cache_dir = settings['analytics_cache_folder']
+    outlier_engine.cache_dir = settings['model_cache_folder']
+    DataProcessor.max_in_memory_rows = settings['max_in_memory_rows']
+    ExportHandler.export_folder = settings['export_folder']
+    ExportHandler.parquet_compression = settings['parquet_compression']
+
+def clean_dataset(report, base_path, steps):
+    """Materialize a cleaning log over its base dataset; returns the file name and shape"""
+    path, shape = cleaning_pipeline.materialize(base_path, steps, report)
+    return {
+        'file': os.path.basename(path),
+        'shape': shape
+    }
+
+def ingest_upload(report, filepath):
+    """Stream an uploaded file into the columnar store and profile it; returns its name and shape"""
+    report(0.1, 'Reading uploaded file')
+    profile = DataProcessor().ingest(filepath)
+    if profile is None:
+        raise ValueError('Error loading file. Please check the file format.')
+    return {
+        'file': os.path.basename(filepath),
+        'shape': profile['shape']
+    }
+
+def compute_analytics(report, filepath):
+    """Compute dashboard analytics into the analytics cache and return them"""
+    processor = DataProcessor()
+    report(0.1, 'Loading data')
+    df = processor.load_data(filepath)
+    if df is None:
+        raise ValueError('Error loading data file.')
+
+    report(0.4, 'Computing analytics')
+    analytics = processor.get_analytics(df, filepath=filepath)
+    if not analytics:
+        raise ValueError('Error generating analytics.')
+    return json_safe(analytics)
+
+def export_report(report, filepath, format_type, original_filename):
+    """Write the summary report from cached analytics, or reuse the one for this dataset version"""
+    handler = ExportHandler()
+    export_path = handler.artifact_path(analytics_cache.content_hash(filepath), format_type, REPORT_VARIANT)
+    if not os.path.exists(export_path):
+        # Only computing missing analytics reads the data, and the frame is dropped before writing
+        analytics = analytics_cache.get(filepath) or compute_analytics(report, filepath)
+        statistics = DataProcessor().get_statistics(filepath)
+        if statistics is None:
+            raise ValueError('Error loading data file.')
+
+        report(0.8, f'Writing {format_type.upper()} report')
+        export_path = handler.export_summary_report(analytics, statistics, format_type, original_filename, export_path)
+        if not export_path:
+            raise ValueError(f'Error exporting summary report as {format_type.upper()}')
+    return {
+        'path': export_path,
+        'filename': handler.report_filename(format_type, original_filename),
+        'mimetype': COLUMNAR_FORMATS.get(format_type)
+    }
+
+def export_dataset(report, filepath, format_type, original_filename, compression=None):
+    """Write an export file, or reuse the one for this dataset version; returns its path and download name"""
+    handler = ExportHandler()
+    export_path = handler.artifact_path(analytics_cache.content_hash(filepath), format_type, compression)
+    if not os.path.exists(export_path):
+        processor = DataProcessor()
+        if format_type == 'xlsx' or format_type in COLUMNAR_FORMATS:
+            # Streamed from row windows into a write-only workbook or one row group/batch per window
+            report(0.1, f'Writing {format_type.upper()} file')
+            export_path = handler.export_chunks(processor.iter_chunks(filepath), format_type, export_path, compression)
+        else:
+            report(0.1, 'Loading data')
+            df = processor.load_all(filepath)
+            if df is None:
+                raise ValueError('Error loading data file.')
+
+            report(0.5, f'Writing {format_type.upper()} file')
+            export_path = handler.export_data(df, format_type, original_filename, export_path)
+        if not export_path or not os.path.exists(export_path):
+            raise ValueError(f'Error exporting data as {format_type.upper()}')
+    return {
+        'path': export_path,
+        'filename': handler.export_filename(format_type, original_filename),
+        'mimetype': COLUMNAR_FORMATS.get(format_type) or STREAMING_FORMATS.get(format_type)
+    }
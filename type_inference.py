@@ -0,0 +1,143 @@
+import os
+import logging
+import numpy as np
+import pandas as pd
+from concurrent.futures import ThreadPoolExecutor
+from pandas.tseries.api import guess_datetime_format
+
+SAMPLE_ROWS = 1000
+MIN_PARSED_RATIO = 0.8  # Share of values that must convert for a column to switch type
+
+_UNKNOWN = object()
+
+class TypeInferenceEngine:
+    """Decide column types on a sample, then convert only with the winning parser.
+
+    The result is a schema of {column: entry} where entry is
+    {'kind': 'numeric'}, {'kind': 'datetime', 'format': ...} or None for
+    columns that stay as text. Passing a stored schema back in skips inference.
+    """
+
+    def __init__(self, sample_rows=SAMPLE_ROWS, max_workers=None):
+        self.logger = logging.getLogger(__name__)
+        self.sample_rows = sample_rows
+        self.max_workers = max_workers or min(8, os.cpu_count() or 1)
+
+    @staticmethod
+    def is_candidate(series):
+        """Text columns are the only ones whose type is inferred"""
+        return series.dtype == object or isinstance(series.dtype, pd.StringDtype)
+
+    def correct(self, df, schema=None):
+        """Return (converted copy of df, schema) converting text columns in parallel"""
+        schema = schema or {}
+        candidates = [col for col in df.columns if self.is_candidate(df[col])]
+
+        def convert(col):
+            return self._convert_column(df[col], schema.get(str(col), _UNKNOWN))
+
+        if len(candidates) > 1 and self.max_workers > 1:
+            with ThreadPoolExecutor(max_workers=min(self.max_workers, len(candidates))) as pool:
+                results = list(pool.map(convert, candidates))
+        else:
+            results = [convert(col) for col in candidates]
+
+        # Converted columns are swapped in; the others are shared with df
+        corrected_df = df.copy(deep=False)
+        new_schema = {}
+        for col, (entry, converted) in zip(candidates, results):
+            new_schema[str(col)] = entry
+            if entry is not None:
+                corrected_df[col] = converted
+        return corrected_df, new_schema
+
+    def _convert_column(self, series, entry):
+        """Return (entry, converted series), or (None, None) to leave the column as is"""
+        try:
+            if entry is _UNKNOWN:
+                entry, converted = self._infer_entry(series)
+                if entry is None or converted is not None:
+                    return entry, converted
+            elif entry is None:
+                return None, None
+
+            converted = self._apply_entry(series, entry)
+            if self._parsed_ratio(converted, len(series)) > MIN_PARSED_RATIO:
+                return entry, converted
+            # The sample was unrepresentative; try the other parsers on the whole column,
+            # as the row-by-row check did (numbers first, then dates)
+            return self._infer_entry(series, whole=True, skip=entry['kind'])
+        except Exception as e:
+            self.logger.warning(f"Could not infer type of column {series.name}: {str(e)}")
+            return None, None
+
+    def _infer_entry(self, series, whole=False, skip=None):
+        """Pick a conversion from a sample, or the whole column when whole is set;
+        returns (entry, converted) where converted is only set when the whole column
+        was checked. A kind named by skip is not tried."""
+        if len(series) == 0:
+            return None, None
+
+        whole = whole or len(series) <= self.sample_rows
+        # A fixed-seed random sample; a stride could line up with periodic values
+        sample = series if whole else series.sample(n=self.sample_rows, random_state=0)
+
+        if skip != 'numeric':
+            numeric = pd.to_numeric(sample, errors='coerce')
+            if self._parsed_ratio(numeric, len(sample)) > MIN_PARSED_RATIO:
+                return {'kind': 'numeric'}, numeric if whole else None
+        if skip == 'datetime':
+            return None, None
+
+        # Same format pandas would infer: from the first non-null value. Without one,
+        # 'mixed' parses element by element as pandas' own fallback does
+        present = series.notna().to_numpy()
+        if not present.any():
+            return None, None
+        date_format = guess_datetime_format(str(series.iloc[int(np.argmax(present))])) or 'mixed'
+        dates = pd.to_datetime(sample, format=date_format, errors='coerce')
+        if self._parsed_ratio(dates, len(sample)) > MIN_PARSED_RATIO:
+            return {'kind': 'datetime', 'format': date_format}, dates if whole else None
+
+        return None, None
+
+    @staticmethod
+    def _apply_entry(series, entry):
+        if entry['kind'] == 'numeric':
+            return pd.to_numeric(series, errors='coerce')
+        return pd.to_datetime(series, format=entry.get('format'), errors='coerce')
+
+    @staticmethod
+    def _parsed_ratio(converted, total):
+        return converted.notna().sum() / total if total > 0 else 0
+
+    @staticmethod
+    def schema_from_frame(df):
+        """Schema describing the typed numeric and datetime columns of a frame"""
+        schema = {}
+        for col, dtype in df.dtypes.items():
+            if pd.api.types.is_datetime64_any_dtype(dtype):
+                schema[str(col)] = {'kind': 'datetime', 'format': 'ISO8601'}
+            elif pd.api.types.is_numeric_dtype(dtype) and not pd.api.types.is_bool_dtype(dtype):
+                schema[str(col)] = {'kind': 'numeric', 'dtype': str(dtype)}
+        return schema
+
+    @staticmethod
+    def csv_read_options(schema, columns=None):
+        """read_csv keyword arguments that apply a schema while parsing"""
+        selected = {col: entry for col, entry in schema.items()
+                    if entry is not None and (columns is None or col in {str(c) for c in columns})}
+        dtype = {col: entry['dtype'] for col, entry in selected.items()
+                 if entry['kind'] == 'numeric' and 'dtype' in entry}
+        date_format = {col: entry['format'] for col, entry in selected.items()
+                       if entry['kind'] == 'datetime'}
+
+        options = {}
+        if dtype:
+            options['dtype'] = dtype
+        if date_format:
+            options['parse_dates'] = list(date_format)
+            options['date_format'] = date_format
+        return options
+
+type_inference = TypeInferenceEngine()
@@ -0,0 +1,66 @@
+import os
+import uuid
+import hashlib
+import logging
+from werkzeug.utils import secure_filename
+from file_metadata import file_metadata
+
+# Bytes copied from the request stream per read
+UPLOAD_BLOCK_SIZE = 1024 * 1024
+
+class UploadStore:
+    """Content-addressed storage for uploaded files.
+
+    Each upload is streamed to disk block by block while its SHA-256 is
+    computed, then stored as <sha256>.<extension>. Uploading the same content
+    again finds the stored file and keeps it, together with everything cached
+    next to it (metadata, columnar copy, profile), instead of writing a copy.
+    """
+
+    # Directory uploads are stored in; set from UPLOAD_FOLDER by the app
+    upload_folder = 'uploads'
+
+    def __init__(self):
+        self.logger = logging.getLogger(__name__)
+
+    @staticmethod
+    def stored_filename(content_hash, original_filename):
+        """Name of the stored file for some content, keeping the original extension"""
+        extension = os.path.splitext(secure_filename(original_filename))[1].lower()
+        return f"{content_hash}{extension}"
+
+    def save(self, file):
+        """Store an uploaded werkzeug FileStorage; returns (stored filename, whether it already existed)"""
+        os.makedirs(self.upload_folder, exist_ok=True)
+        tmp_path = os.path.join(self.upload_folder, f".upload-{uuid.uuid4().hex}.tmp")
+        digest = hashlib.sha256()
+        try:
+            with open(tmp_path, 'wb') as f:
+                for block in iter(lambda: file.stream.read(UPLOAD_BLOCK_SIZE), b''):
+                    digest.update(block)
+                    f.write(block)
+
+            return self.store_file(tmp_path, file.filename, digest.hexdigest())
+        finally:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+
+    def store_file(self, path, original_filename, content_hash):
+        """Move a file already on disk into the store; returns (stored filename, whether it already existed).
+
+        When the content is already stored, path is left for the caller to remove.
+        """
+        filename = self.stored_filename(content_hash, original_filename)
+        stored_path = os.path.join(self.upload_folder, filename)
+        if os.path.exists(stored_path):
+            # Leave the stored file untouched so its metadata and columnar copy stay valid
+            self.logger.info(f"Upload {original_filename} matches stored file {filename}")
+            return filename, True
+
+        os.makedirs(self.upload_folder, exist_ok=True)
+        os.replace(path, stored_path)
+        file_metadata.update(stored_path, content_hash=content_hash)
+        self.logger.info(f"Stored upload {original_filename} as {filename}")
+        return filename, False
+
+upload_store = UploadStore()
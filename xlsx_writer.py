@@ -0,0 +1,52 @@
+import os
+import pandas as pd
+from openpyxl import Workbook
+
+# Rows per worksheet including the header row
+EXCEL_MAX_ROWS = 1048576
+
+def _cell_values(chunk):
+    """Rows of a chunk as tuples of plain Python values openpyxl can write"""
+    chunk = chunk.copy(deep=False)
+    for col in chunk.columns:
+        dtype = chunk[col].dtype
+        # Excel has no time zones; write the local wall-clock time
+        if isinstance(dtype, pd.DatetimeTZDtype):
+            chunk[col] = chunk[col].dt.tz_localize(None)
+    values = chunk.astype(object)
+    # Missing values become empty cells rather than NaN or NaT
+    values = values.where(chunk.notna(), None)
+    return values.itertuples(index=False, name=None)
+
+def write_xlsx(chunks, path, columns=None, sheet_name='Sheet1'):
+    """Write DataFrame chunks to an XLSX file with openpyxl's write-only mode.
+
+    Rows are streamed to the worksheet as they are appended, so memory stays
+    bounded by one chunk instead of one cell object per value. The file is
+    written under a temporary name and moved into place when complete.
+    """
+    workbook = Workbook(write_only=True)
+    sheet = workbook.create_sheet(sheet_name)
+    tmp_path = path + '.tmp'
+    written = 0
+    header = columns
+    try:
+        for chunk in chunks:
+            if header is None:
+                header = list(chunk.columns)
+            if written == 0:
+                sheet.append([str(col) for col in header])
+                written = 1
+            if written + len(chunk) > EXCEL_MAX_ROWS:
+                raise ValueError(f"Excel sheets hold at most {EXCEL_MAX_ROWS - 1:,} data rows")
+            for row in _cell_values(chunk):
+                sheet.append(row)
+            written += len(chunk)
+        if written == 0 and header is not None:
+            sheet.append([str(col) for col in header])
+        workbook.save(tmp_path)
+        os.replace(tmp_path, path)
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+    return path